@@ -1,9 +1,71 @@
-from flask import Flask, request, jsonify, render_template
-from optimizer import optimize_logic
 import time
 
+# Waktu bangun diukur sejak modul ini mulai di-import
+_boot_start = time.perf_counter()
+
+from flask import Flask, request, jsonify, render_template, Response, stream_with_context, url_for
+from optimizer import (
+    optimize_logic_cached,
+    optimize_logic_live,
+    optimize_minterms_cached,
+    optimize_logic_budgeted,
+    optimize_minterms_budgeted,
+    optimize_multi_budgeted,
+    empty_optimize_result,
+    prepare_batch_job,
+    run_optimize_task,
+    restore_variable_names,
+    result_cache,
+    truth_table_for,
+    truth_table_page,
+    dnf_trace_budgeted,
+    parse_for_table,
+    stream_truth_table,
+    check_equivalence_budgeted,
+    parse_expression,
+    warm_up
+)
+from jobs import JobStore, JobRunner, QueueFull, FINISHED_STATES
+from metrics import registry, observe_optimize, cache_metric_lines, startup_metric_lines
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import json
+import os
+import threading
+
 app = Flask(__name__)
 
+# ===============================
+# CACHE HEADER ASET STATIS
+# ===============================
+# Aset tanpa versi di-cache sebentar lalu direvalidasi lewat ETag. URL dari
+# static_url() membawa ?v=<mtime>, jadi isinya tidak pernah berubah dan
+# aman di-cache setahun; deploy baru otomatis menghasilkan URL baru.
+STATIC_MAX_AGE = int(os.environ.get("SYMBOOL_STATIC_MAX_AGE", "3600"))
+STATIC_VERSIONED_MAX_AGE = 365 * 24 * 3600
+app.config["SEND_FILE_MAX_AGE_DEFAULT"] = STATIC_MAX_AGE
+
+
+@app.context_processor
+def static_helpers():
+    def static_url(filename):
+        try:
+            version = int(os.path.getmtime(os.path.join(app.static_folder, filename)))
+        except OSError:
+            return url_for("static", filename=filename)
+        return url_for("static", filename=filename, v=version)
+    return {"static_url": static_url}
+
+
+@app.after_request
+def static_cache_headers(response):
+    if request.endpoint == "static" and request.args.get("v") and response.status_code == 200:
+        response.cache_control.public = True
+        response.cache_control.max_age = STATIC_VERSIONED_MAX_AGE
+        response.cache_control.immutable = True
+    return response
+
+
 @app.route("/")
 def index():
     return render_template("index.html")
@@ -11,6 +73,11 @@ def index():
 @app.route("/optimize", methods=["POST"])
 def optimize():
     data = request.get_json() or {}
+
+    # Mode minterm langsung: {"minterms": [...], "dont_cares": [...], "variables": N}
+    if data.get("minterms") is not None:
+        return optimize_minterms_request(data)
+
     expression = data.get("expression", "").strip()
     method = data.get("method", "simplify")
 
@@ -21,6 +88,7 @@ def optimize():
             "explanation": "–",
             "variables": [],
             "table": [],
+            "truth_table": None,
             "kmap": {},
             "minterm": [],
             "minterm_values": [],
@@ -34,16 +102,45 @@ def optimize():
         }), 200
 
     start_time = time.time()
+    # {"timings": true} menyertakan durasi per tahap (ms) di response
+    include_timings = bool(data.get("timings"))
+    # {"trace": false} melewati trace thread/grouping (trace_deferred=true);
+    # ambil belakangan lewat /optimize/trace
+    trace = data.get("trace", True) is not False
+    # {"forms": true} menambah bentuk POS minimal & faktor (ikut budget)
+    forms = bool(data.get("forms"))
 
     try:
-        result = optimize_logic(expression, method=method)
-        result["duration"] = round((time.time() - start_time) * 1000, 2)
+        session_id = data.get("session")
+        if isinstance(session_id, str) and 0 < len(session_id) <= 64:
+            # Mode live/inkremental: parse tree dan kolom tabel kebenaran
+            # per subekspresi disimpan per sesi, jadi edit kecil murah
+            result = optimize_logic_live(expression, method=method, session_id=session_id, trace=trace, forms=forms)
+        else:
+            # Budget per metode: batas variabel/baris dicek dulu, lalu proses
+            # berjalan di worker yang dibunuh kalau melewati deadline.
+            result = optimize_logic_cached(
+                expression, method=method, runner=optimize_logic_budgeted, trace=trace, forms=forms
+            )
+        elapsed = time.time() - start_time
+        result["duration"] = round(elapsed * 1000, 2)
+
+        timings = result.pop("timings", None)
+
+        observe_optimize(
+            method, len(result.get("variables") or []), elapsed,
+            "budget_exceeded" if result.get("budget_exceeded") else "ok", timings
+        )
+        if include_timings:
+            # Kosong kalau hasil diambil dari cache
+            result["timings"] = timings or {}
 
         # Pastikan semua field ada meski kosong
         result.setdefault("simplified", "–")
         result.setdefault("explanation", "–")
         result.setdefault("variables", [])
         result.setdefault("table", [])
+        result.setdefault("truth_table", None)
         result.setdefault("kmap", {})
         result.setdefault("minterm", [])
         result.setdefault("minterm_values", [])
@@ -56,13 +153,22 @@ def optimize():
 
         return jsonify(result), 200
 
+    except ValueError as e:
+        # Kesalahan sintaks dari parser: pesan berisi posisi yang salah
+        observe_optimize(method, "unknown", time.time() - start_time, "invalid")
+        result = empty_optimize_result(str(e))
+        result["duration"] = 0
+        return jsonify(result), 400
+
     except Exception as e:
         print(f"Error during optimization: {e}")
+        observe_optimize(method, "unknown", time.time() - start_time, "error")
         return jsonify({
             "simplified": "–",
             "explanation": "Terjadi error saat memproses.",
             "variables": [],
             "table": [],
+            "truth_table": None,
             "kmap": {},
             "minterm": [],
             "minterm_values": [],
@@ -76,5 +182,411 @@ def optimize():
         }), 500
 
 
+def optimize_minterms_request(data):
+    method = data.get("method", "qm")
+    start_time = time.time()
+
+    try:
+        result = optimize_minterms_cached(
+            data.get("minterms"),
+            data.get("dont_cares", []),
+            data.get("variables"),
+            method=method,
+            runner=optimize_minterms_budgeted,
+            trace=data.get("trace", True) is not False,
+            forms=bool(data.get("forms"))
+        )
+    except ValueError as e:
+        result = empty_optimize_result(str(e))
+        result["duration"] = 0
+        observe_optimize(method, "unknown", time.time() - start_time, "invalid")
+        return jsonify(result), 400
+    except Exception as e:
+        print(f"Error during optimization: {e}")
+        result = empty_optimize_result("Terjadi error saat memproses.")
+        result["duration"] = 0
+        observe_optimize(method, "unknown", time.time() - start_time, "error")
+        return jsonify(result), 500
+
+    elapsed = time.time() - start_time
+    result["duration"] = round(elapsed * 1000, 2)
+    observe_optimize(
+        method, len(result.get("variables") or []), elapsed,
+        "budget_exceeded" if result.get("budget_exceeded") else "ok"
+    )
+    return jsonify(result), 200
+
+
+# ===============================
+# TRACE DNF: /optimize/trace
+# ===============================
+TRACE_MAX_CHARS = 20000
+
+
+@app.route("/optimize/trace", methods=["POST"])
+def optimize_trace():
+    # Trace untuk hasil /optimize yang diminta dengan "trace": false:
+    # {"expression": "...", "simplified": "...", "method": "..."}
+    # atau {"minterms": [...], "variables": N, "simplified": "..."}
+    data = request.get_json(silent=True) or {}
+    simplified = str(data.get("simplified", "")).strip()
+    if not simplified:
+        return jsonify({"error": "Field \"simplified\" kosong."}), 400
+    if len(simplified) > TRACE_MAX_CHARS:
+        return jsonify({"error": f"Ekspresi hasil maksimal {TRACE_MAX_CHARS} karakter."}), 400
+    if simplified in ("⊤", "⊥", "–"):
+        return jsonify({"threads": [], "groupings": [], "mainJoin": ""}), 200
+
+    # Budget & deadline sama dengan /optimize untuk metode yang sama
+    try:
+        result = dnf_trace_budgeted(
+            simplified, data.get("expression"), data.get("minterms"), data.get("variables"),
+            method=data.get("method", "simplify")
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        print(f"Error during trace: {e}")
+        return jsonify({"error": "Terjadi error saat memproses."}), 500
+    return jsonify(result), 200
+
+
+# ===============================
+# MULTI-OUTPUT: /optimize/multi
+# ===============================
+@app.route("/optimize/multi", methods=["POST"])
+def optimize_multi_request():
+    # {"outputs": [{"name": "S", "expression": "A ⊕ B ⊕ C"}, ...]}
+    # atau {"expressions": ["...", "..."]} (nama F1, F2, ...)
+    data = request.get_json(silent=True) or {}
+    outputs = data.get("outputs")
+    if outputs is None:
+        outputs = [{"expression": e} for e in data.get("expressions") or []]
+    if not isinstance(outputs, list) or not outputs:
+        return jsonify({"error": "Field \"outputs\" berisi minimal satu ekspresi."}), 400
+
+    expressions = []
+    names = []
+    for i, output in enumerate(outputs):
+        output = output if isinstance(output, dict) else {"expression": output}
+        expression = str(output.get("expression", "")).strip()
+        if not expression:
+            return jsonify({"error": f"Ekspresi output ke-{i + 1} kosong."}), 400
+        expressions.append(expression)
+        names.append(str(output.get("name") or f"F{i + 1}")[:32])
+    if len(set(names)) != len(names):
+        return jsonify({"error": "Nama output harus unik."}), 400
+
+    start_time = time.time()
+    include_timings = bool(data.get("timings"))
+    try:
+        result = optimize_multi_budgeted(expressions, names)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    elapsed = time.time() - start_time
+    timings = result.pop("timings", None)
+    observe_optimize(
+        "multi", len(result.get("variables") or []), elapsed,
+        "budget_exceeded" if result.get("budget_exceeded") else "ok", timings
+    )
+    if include_timings:
+        result["timings"] = timings or {}
+    result["duration"] = round(elapsed * 1000, 2)
+    return jsonify(result), 200
+
+
+# ===============================
+# BATCH: /optimize/batch
+# ===============================
+BATCH_MAX_JOBS = int(os.environ.get("SYMBOOL_BATCH_MAX_JOBS", "1000"))
+BATCH_WORKERS = int(os.environ.get("SYMBOOL_BATCH_WORKERS", "0")) or os.cpu_count() or 1
+
+_batch_pool = None
+_batch_pool_lock = threading.Lock()
+
+
+def get_batch_pool(reset=False):
+    global _batch_pool
+    with _batch_pool_lock:
+        if reset and _batch_pool is not None:
+            _batch_pool.shutdown(wait=False, cancel_futures=True)
+            _batch_pool = None
+        if _batch_pool is None:
+            _batch_pool = ProcessPoolExecutor(max_workers=BATCH_WORKERS)
+        return _batch_pool
+
+
+@app.route("/optimize/batch", methods=["POST"])
+def optimize_batch():
+    data = request.get_json(silent=True)
+    jobs = data.get("jobs") if isinstance(data, dict) else data
+    if not isinstance(jobs, list):
+        return jsonify({"error": "Body harus berupa list job atau {\"jobs\": [...]}."}), 400
+    if len(jobs) > BATCH_MAX_JOBS:
+        return jsonify({"error": f"Maksimal {BATCH_MAX_JOBS} job per batch."}), 400
+
+    # Siapkan job: validasi, de-duplikasi, dan ambil dari cache bila ada
+    prepared = []
+    pending = {}
+    pool = get_batch_pool()
+    for job in jobs:
+        try:
+            key, task, inverse = prepare_batch_job(job)
+        except ValueError as e:
+            prepared.append((None, None, str(e)))
+            continue
+        prepared.append((key, inverse, None))
+        if key in pending:
+            continue
+        cached = result_cache.get(key)
+        if cached is not None:
+            pending[key] = (cached, None, 0.0)
+        else:
+            # isolate=True: job yang melewati deadline metodenya dihentikan
+            # dan dilaporkan budget_exceeded, jadi stream tidak tertahan
+            pending[key] = pool.submit(run_optimize_task, task, None, True)
+
+    def outcome(key):
+        item = pending[key]
+        if isinstance(item, tuple):
+            return item
+        try:
+            result, error, duration = item.result()
+        except BrokenProcessPool:
+            get_batch_pool(reset=True)
+            result, error, duration = None, "Worker berhenti tidak terduga.", 0.0
+        if result is not None and not result.get("budget_exceeded"):
+            result_cache.put(key, result)
+        pending[key] = (result, error, duration)
+        return pending[key]
+
+    def generate():
+        # Hasil dialirkan berurutan sesuai indeks job (NDJSON)
+        for index, (key, inverse, error) in enumerate(prepared):
+            line = {"index": index, "result": None, "error": error, "duration": 0}
+            if key is not None:
+                result, error, duration = outcome(key)
+                line["error"] = error
+                line["duration"] = duration
+                if result is not None:
+                    line["result"] = restore_variable_names(result, inverse)
+            yield json.dumps(line, ensure_ascii=False) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+
+# ===============================
+# JOB ASYNC: /jobs
+# ===============================
+# Untuk optimasi yang lama (Q-M/Espresso banyak variabel): POST /jobs
+# membalas id, lalu progres diikuti lewat GET /jobs/<id> (polling) atau
+# GET /jobs/<id>/events (Server-Sent Events). Body sama dengan job batch.
+# Stream SSE menahan satu thread gthread selama terbuka, jadi durasinya
+# dibatasi SSE_MAX_DURATION; setelah itu klien diminta beralih ke polling.
+SSE_POLL_INTERVAL = 0.25
+SSE_HEARTBEAT = 15.0
+SSE_MAX_DURATION = float(os.environ.get("SYMBOOL_SSE_MAX_DURATION", "30"))
+
+
+def run_job_task(task, progress=None):
+    result, error, _ = run_optimize_task(task, progress)
+    return result, error
+
+
+def cache_job_result(job):
+    result = job["result"]
+    if result is not None and not result.get("budget_exceeded"):
+        key, _, _ = prepare_batch_job(job["request"])
+        result_cache.put(key, result)
+
+
+job_store = JobStore()
+job_runner = JobRunner(job_store, run_job_task, on_finish=cache_job_result)
+
+
+def job_response(job, include_result=True):
+    view = {k: job[k] for k in ("id", "status", "created", "updated", "progress", "error")}
+    if include_result and job["status"] == "done" and job["result"] is not None:
+        # Hasil disimpan dalam nama variabel kanonik (sama dengan cache)
+        _, _, inverse = prepare_batch_job(job["request"])
+        view["result"] = restore_variable_names(job["result"], inverse)
+    return view
+
+
+@app.route("/jobs", methods=["POST"])
+def submit_job():
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Body harus berupa objek job."}), 400
+    try:
+        key, task, _ = prepare_batch_job(data)
+        if task[0] == "expression":
+            # Error sintaks dilaporkan langsung, bukan sebagai job gagal
+            parse_expression(task[1])
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    cached = result_cache.get(key)
+    if cached is not None:
+        job = job_store.create(data)
+        job = job_store.update(job["id"], status="done", result=cached)
+        return jsonify(job_response(job)), 200
+    try:
+        job = job_runner.submit(data, (task,))
+    except QueueFull as e:
+        return jsonify({"error": str(e)}), 503
+    return jsonify(job_response(job)), 202
+
+
+@app.route("/jobs/<job_id>")
+def get_job(job_id):
+    job = job_store.read(job_id)
+    if job is None:
+        return jsonify({"error": "Job tidak ditemukan atau sudah kedaluwarsa."}), 404
+    return jsonify(job_response(job)), 200
+
+
+@app.route("/jobs/<job_id>/events")
+def job_events(job_id):
+    if job_store.read(job_id) is None:
+        return jsonify({"error": "Job tidak ditemukan atau sudah kedaluwarsa."}), 404
+
+    def generate():
+        # Kirim event "progress" setiap kali file job berubah, lalu satu
+        # event "done" (berisi hasil) dan stream ditutup. Lewat
+        # SSE_MAX_DURATION dikirim event "poll" dan stream ditutup.
+        last_update = None
+        last_sent = time.monotonic()
+        stop_at = last_sent + SSE_MAX_DURATION
+        while True:
+            job = job_store.read(job_id)
+            if job is None:
+                yield "event: error\ndata: {\"error\": \"Job kedaluwarsa.\"}\n\n"
+                return
+            if job["status"] in FINISHED_STATES:
+                payload = json.dumps(job_response(job), ensure_ascii=False)
+                yield f"event: done\ndata: {payload}\n\n"
+                return
+            if job["updated"] != last_update:
+                last_update = job["updated"]
+                last_sent = time.monotonic()
+                payload = json.dumps(job_response(job, include_result=False), ensure_ascii=False)
+                yield f"event: progress\ndata: {payload}\n\n"
+            elif time.monotonic() - last_sent > SSE_HEARTBEAT:
+                last_sent = time.monotonic()
+                yield ": keep-alive\n\n"
+            if time.monotonic() >= stop_at:
+                payload = json.dumps({"poll": f"/jobs/{job_id}"})
+                yield f"event: poll\ndata: {payload}\n\n"
+                return
+            time.sleep(SSE_POLL_INTERVAL)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+# ===============================
+# TABEL KEBENARAN PER HALAMAN: /truth-table
+# ===============================
+@app.route("/truth-table", methods=["GET", "POST"])
+def truth_table_rows():
+    # Body JSON (POST) atau query string (GET):
+    # {"expression": "...", "offset": 0, "limit": 256}
+    # atau {"minterms": [...], "variables": N, "offset": 0, "limit": 256}
+    data = request.get_json(silent=True) or request.args.to_dict()
+    if not isinstance(data, dict):
+        return jsonify({"error": "Body harus berupa objek JSON."}), 400
+    minterms = data.get("minterms")
+    if isinstance(minterms, str):
+        minterms = [m for m in minterms.split(",") if m.strip()]
+
+    try:
+        table = truth_table_for(data.get("expression"), minterms, data.get("variables"))
+        page = truth_table_page(table, data.get("offset", 0), data.get("limit", 256))
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(page), 200
+
+
+@app.route("/truth-table/export")
+def truth_table_export():
+    # GET /truth-table/export?expression=...&format=csv|ndjson
+    # Dialirkan per blok (chunked), tidak ada sisi yang memegang seluruh tabel.
+    fmt = request.args.get("format", "csv").lower()
+    if fmt not in ("csv", "ndjson"):
+        return jsonify({"error": "Format harus csv atau ndjson."}), 400
+
+    minterms = request.args.get("minterms")
+    try:
+        if minterms is not None:
+            source = truth_table_for(
+                minterms=[m for m in minterms.split(",") if m.strip()],
+                num_vars=request.args.get("variables")
+            )
+        else:
+            source = parse_for_table(request.args.get("expression"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    mimetype = "text/csv" if fmt == "csv" else "application/x-ndjson"
+    return Response(
+        stream_with_context(stream_truth_table(source, fmt)),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename=tabel_kebenaran.{fmt}"}
+    )
+
+# ===============================
+# EKUIVALENSI: /equivalent
+# ===============================
+@app.route("/equivalent", methods=["POST"])
+def equivalent():
+    # {"a": "A'B + AB'", "b": "A ⊕ B"} → {"equivalent": true, ...}
+    data = request.get_json(silent=True) or {}
+    left = str(data.get("a", "")).strip()
+    right = str(data.get("b", "")).strip()
+    if not left or not right:
+        return jsonify({"error": "Field \"a\" dan \"b\" wajib diisi."}), 400
+
+    start_time = time.time()
+    try:
+        result = check_equivalence_budgeted(left, right)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    result["duration"] = round((time.time() - start_time) * 1000, 2)
+    return jsonify(result), 200
+
+
+# ===============================
+# WARM-UP & WAKTU START
+# ===============================
+# SYMBOOL_WARMUP: "0" = mati, "1" (default) = parse/K-Map/Q-M,
+# "full" = ikut import sympy (bangun lebih lambat, simplify pertama cepat)
+WARMUP_MODE = os.environ.get("SYMBOOL_WARMUP", "1").strip().lower()
+
+startup = {"import": time.perf_counter() - _boot_start, "warmup": 0.0, "warmup_stages": {}}
+if WARMUP_MODE not in ("0", "false", "off"):
+    _warmup_start = time.perf_counter()
+    startup["warmup_stages"] = warm_up(include_sympy=WARMUP_MODE == "full")
+    startup["warmup"] = time.perf_counter() - _warmup_start
+startup["total"] = time.perf_counter() - _boot_start
+print(
+    f"Symbool siap dalam {startup['total'] * 1000:.1f} ms "
+    f"(import {startup['import'] * 1000:.1f} ms, warm-up {startup['warmup'] * 1000:.1f} ms)"
+)
+
+
+# ===============================
+# METRIK: /metrics (format teks Prometheus)
+# ===============================
+@app.route("/metrics")
+def metrics():
+    body = registry.render(cache_metric_lines(result_cache.stats()) + startup_metric_lines(startup))
+    return Response(body, mimetype="text/plain; version=0.0.4")
+
+
 if __name__ == "__main__":
-    app.run(host='0.0.0.0', port=10000)
+    # Server development Flask; produksi: gunicorn -c gunicorn.conf.py app:app
+    app.run(host='0.0.0.0', port=int(os.environ.get("PORT", "10000")))
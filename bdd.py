@@ -0,0 +1,212 @@
+from boolexpr import topological_nodes
+
+# ===============================
+# ROBDD (REDUCED ORDERED BDD)
+# ===============================
+# Node disimpan sebagai indeks ke array level/low/high; 0 = FALSE,
+# 1 = TRUE. Unique table menjamin tidak ada dua node (level, low, high)
+# yang sama, jadi dua fungsi ekuivalen ⇔ indeks root sama. Computed table
+# menyimpan hasil ITE supaya tiap triple hanya dihitung sekali.
+# ITE rekursif turun satu level per panggilan, jadi kedalamannya dibatasi
+# jumlah variabel (maksimal 26, A–Z).
+FALSE = 0
+TRUE = 1
+
+
+class BDDNodeLimit(Exception):
+    # Manager melewati max_nodes; penanganan (budget_exceeded) di pemanggil
+    def __init__(self, limit):
+        super().__init__(f"ROBDD melebihi {limit} node.")
+        self.limit = limit
+
+
+def order_variables(*trees):
+    # Heuristik urutan: kemunculan pertama secara depth-first (kiri ke
+    # kanan). Variabel yang muncul berdekatan dalam ekspresi ikut
+    # berdekatan di BDD, biasanya menjaga ukuran tetap kecil.
+    order = []
+    seen = set()
+    for tree in trees:
+        stack = [tree]
+        visited = set()
+        while stack:
+            node = stack.pop()
+            if id(node) in visited:
+                continue
+            visited.add(id(node))
+            if node.op == "var":
+                if node.name not in seen:
+                    seen.add(node.name)
+                    order.append(node.name)
+            else:
+                stack.extend(reversed(node.args))
+    return order
+
+
+class BDD:
+    def __init__(self, variables, max_nodes=None):
+        self.variables = list(variables)
+        self.max_nodes = max_nodes
+        self.level_of = {v: i for i, v in enumerate(self.variables)}
+        terminal_level = len(self.variables)
+        self._level = [terminal_level, terminal_level]
+        self._low = [FALSE, TRUE]
+        self._high = [FALSE, TRUE]
+        self._unique = {}
+        self._computed = {}
+
+    def __len__(self):
+        return len(self._level)
+
+    def node(self, level, low, high):
+        if low == high:
+            return low
+        key = (level, low, high)
+        u = self._unique.get(key)
+        if u is None:
+            u = len(self._level)
+            if self.max_nodes is not None and u >= self.max_nodes:
+                raise BDDNodeLimit(self.max_nodes)
+            self._level.append(level)
+            self._low.append(low)
+            self._high.append(high)
+            self._unique[key] = u
+        return u
+
+    def var(self, name):
+        return self.node(self.level_of[name], FALSE, TRUE)
+
+    def _cofactors(self, u, level):
+        if self._level[u] == level:
+            return self._low[u], self._high[u]
+        return u, u
+
+    def ite(self, f, g, h):
+        if f == TRUE:
+            return g
+        if f == FALSE:
+            return h
+        if g == h:
+            return g
+        if g == TRUE and h == FALSE:
+            return f
+        key = (f, g, h)
+        result = self._computed.get(key)
+        if result is not None:
+            return result
+
+        level = min(self._level[f], self._level[g], self._level[h])
+        f0, f1 = self._cofactors(f, level)
+        g0, g1 = self._cofactors(g, level)
+        h0, h1 = self._cofactors(h, level)
+        result = self.node(level, self.ite(f0, g0, h0), self.ite(f1, g1, h1))
+        if self.max_nodes is not None and len(self._computed) >= 4 * self.max_nodes:
+            # Computed table hanya cache: dikosongkan supaya memori ikut
+            # terbatas oleh max_nodes
+            self._computed.clear()
+        self._computed[key] = result
+        return result
+
+    def neg(self, f):
+        return self.ite(f, FALSE, TRUE)
+
+    def conj(self, f, g):
+        return self.ite(f, g, FALSE)
+
+    def disj(self, f, g):
+        return self.ite(f, TRUE, g)
+
+    def xor(self, f, g):
+        return self.ite(f, self.neg(g), g)
+
+    def build(self, tree):
+        # IR boolexpr → node BDD; node DAG bersama dibangun sekali
+        built = {}
+        for node in topological_nodes(tree):
+            op = node.op
+            args = [built[id(a)] for a in node.args]
+            if op == "var":
+                u = self.var(node.name)
+            elif op == "true":
+                u = TRUE
+            elif op == "false":
+                u = FALSE
+            elif op == "not":
+                u = self.neg(args[0])
+            elif op in ("and", "nand"):
+                u = TRUE
+                for a in args:
+                    u = self.conj(u, a)
+                u = self.neg(u) if op == "nand" else u
+            elif op in ("or", "nor"):
+                u = FALSE
+                for a in args:
+                    u = self.disj(u, a)
+                u = self.neg(u) if op == "nor" else u
+            elif op == "xor":
+                u = FALSE
+                for a in args:
+                    u = self.xor(u, a)
+            elif op == "implies":
+                u = self.ite(args[0], args[1], TRUE)
+            elif op == "iff":
+                u = self.ite(args[0], args[1], self.neg(args[1]))
+            else:
+                raise ValueError(f"Operator tidak dikenal: {op}")
+            built[id(node)] = u
+        return built[id(tree)]
+
+    def sat_count(self, u):
+        # Jumlah assignment (atas semua variabel manager) yang membuat u benar
+        counts = {FALSE: 0, TRUE: 1}
+        stack = [u]
+        while stack:
+            v = stack[-1]
+            if v in counts:
+                stack.pop()
+                continue
+            low, high = self._low[v], self._high[v]
+            pending = [w for w in (low, high) if w not in counts]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            level = self._level[v]
+            counts[v] = (
+                counts[low] << (self._level[low] - level - 1)
+            ) + (
+                counts[high] << (self._level[high] - level - 1)
+            )
+        return counts[u] << self._level[u]
+
+    def any_sat(self, u):
+        # Satu assignment yang membuat u benar (variabel bebas = 0), atau None
+        if u == FALSE:
+            return None
+        assignment = {v: False for v in self.variables}
+        while u != TRUE:
+            name = self.variables[self._level[u]]
+            if self._high[u] != FALSE:
+                assignment[name] = True
+                u = self._high[u]
+            else:
+                u = self._low[u]
+        return assignment
+
+
+def compare_expressions(left_tree, right_tree, max_nodes=None):
+    # Ekuivalensi dua ekspresi dalam satu manager (urutan variabel gabungan):
+    # sama ⇔ root sama. Kalau beda, XOR keduanya memberi contoh penyangkal.
+    # BDDNodeLimit bila manager melewati max_nodes.
+    manager = BDD(order_variables(left_tree, right_tree), max_nodes)
+    left = manager.build(left_tree)
+    right = manager.build(right_tree)
+    counterexample = None if left == right else manager.any_sat(manager.xor(left, right))
+    return {
+        "equivalent": left == right,
+        "variables": sorted(manager.variables),
+        "counterexample": counterexample,
+        "left_minterms": manager.sat_count(left),
+        "right_minterms": manager.sat_count(right),
+        "bdd_nodes": len(manager)
+    }
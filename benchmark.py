@@ -0,0 +1,335 @@
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+from optimizer import (
+    ParsedExpression,
+    simplify_boolean,
+    generate_truth_table,
+    generate_kmap,
+    extract_minterms,
+    quine_mccluskey_process,
+    combine_implicants,
+    espresso_process,
+    truth_table_from_minterms,
+    run_with_deadline,
+    KMAP_MAX_VARS,
+    QM_MAX_VARS,
+    QM_STEPS_MAX_VARS
+)
+
+# ===============================
+# BENCHMARK OPTIMIZER
+# ===============================
+# Contoh:
+#   python benchmark.py --vars 2-12 --out bench.json
+#   python benchmark.py --vars 2-12 --compare bench.json
+# Setiap tahap dijalankan di proses terpisah (deadline per tahap), latensi
+# diambil median dari --repeat kali, memori puncak dari satu run tracemalloc.
+STAGES = ("parse", "truth_table", "simplify", "kmap", "qm", "espresso")
+FAMILIES = ("sop", "pos", "xor", "tautology", "textbook", "qm_worst")
+
+TEXTBOOK = [
+    ("majority", "(A∧B)∨(A∧C)∨(B∧C)"),
+    ("full_adder_sum", "A⊕B⊕C"),
+    ("full_adder_carry", "(A∧B)∨(C∧(A⊕B))"),
+    ("mux2", "(¬C∧A)∨(C∧B)"),
+    ("consensus", "(A∧B)∨(¬A∧C)∨(B∧C)"),
+    ("absorption", "A∨(A∧B)∨(A∧B∧C∧D)"),
+    ("prime_4bit", "(¬A∧¬B∧C)∨(¬A∧B∧D)∨(B∧¬C∧D)∨(A∧¬B∧C∧D)"),
+    ("seven_seg_a", "A∨C∨(B∧D)∨(¬B∧¬D)"),
+    ("comparator_eq", "(A↔C)∧(B↔D)"),
+    ("parity_6", "A⊕B⊕C⊕D⊕E⊕F"),
+]
+
+
+def letters(n):
+    return [chr(ord("A") + i) for i in range(n)]
+
+
+def random_literal(rng, var):
+    return var if rng.random() < 0.5 else f"¬{var}"
+
+
+def random_terms(rng, n):
+    names = letters(n)
+    terms = []
+    for _ in range(max(2, n)):
+        size = rng.randint(min(2, n), max(2, min(n, (n + 1) // 2 + 1)))
+        terms.append([random_literal(rng, v) for v in sorted(rng.sample(names, size))])
+    # Pastikan semua variabel muncul supaya jumlah variabel sesuai
+    used = {lit.lstrip("¬") for term in terms for lit in term}
+    for v in names:
+        if v not in used:
+            rng.choice(terms).append(random_literal(rng, v))
+    return terms
+
+
+def build_corpus(var_counts, families, seed):
+    rng = random.Random(seed)
+    corpus = []
+    for n in var_counts:
+        if "sop" in families:
+            terms = random_terms(rng, n)
+            corpus.append({
+                "name": f"sop_{n}", "family": "sop", "vars": n,
+                "expression": " ∨ ".join("(" + "∧".join(t) + ")" for t in terms)
+            })
+        if "pos" in families:
+            terms = random_terms(rng, n)
+            corpus.append({
+                "name": f"pos_{n}", "family": "pos", "vars": n,
+                "expression": " ∧ ".join("(" + "∨".join(t) + ")" for t in terms)
+            })
+        if "xor" in families:
+            corpus.append({
+                "name": f"xor_{n}", "family": "xor", "vars": n,
+                "expression": " ⊕ ".join(letters(n))
+            })
+        if "tautology" in families:
+            terms = random_terms(rng, n)
+            sop = " ∨ ".join("(" + "∧".join(t) + ")" for t in terms)
+            corpus.append({
+                "name": f"tautology_{n}", "family": "tautology", "vars": n,
+                "expression": f"({sop}) ∨ ¬({sop})"
+            })
+        if "qm_worst" in families:
+            # Fungsi simetris bobot [n/3, 2n/3]: jumlah prime implicant
+            # tumbuh mendekati 3^n/n, kasus terburuk penggabungan Q-M.
+            low, high = n // 3, (2 * n + 2) // 3
+            corpus.append({
+                "name": f"qm_worst_{n}", "family": "qm_worst", "vars": n,
+                "minterms": [m for m in range(1 << n) if low <= bin(m).count("1") <= high]
+            })
+    if "textbook" in families:
+        for name, expression in TEXTBOOK:
+            n = len(ParsedExpression(expression).variables)
+            if n in var_counts:
+                corpus.append({"name": name, "family": "textbook", "vars": n, "expression": expression})
+    return corpus
+
+
+# ===============================
+# PENGUKURAN PER TAHAP
+# ===============================
+def stage_applicable(stage, case):
+    n = case["vars"]
+    if stage == "kmap":
+        return n <= KMAP_MAX_VARS
+    if "expression" not in case:
+        return stage in ("qm", "espresso")
+    if stage in ("truth_table", "simplify", "qm") and n > QM_MAX_VARS:
+        return False
+    return True
+
+
+def prepare_stage(stage, case):
+    # Return (fungsi yang diukur, fungsi info hasil); setup di luar timer
+    n = case["vars"]
+    variables = letters(n)
+
+    if "expression" in case:
+        expression = case["expression"]
+        if stage == "parse":
+            return lambda: ParsedExpression(expression), lambda r: {}
+        if stage == "truth_table":
+            def run():
+                return generate_truth_table(ParsedExpression(expression))
+            return run, lambda r: {"minterms": r[1].count()}
+        parsed = ParsedExpression(expression)
+        variables = parsed.variables
+        if stage == "simplify":
+            parsed.truth_table
+            return lambda: simplify_boolean(parsed, "simplify"), lambda r: {"result_length": len(r[0])}
+        if stage == "espresso":
+            return lambda: espresso_process(variables, parsed=parsed), lambda r: {
+                "terms": r["term_count"], "literals": r["literal_count"]
+            }
+        table = parsed.truth_table
+        minterms = [int(m) for m in extract_minterms(variables, table)[0]]
+    else:
+        minterms = case["minterms"]
+        table = truth_table_from_minterms(variables, minterms)
+
+    if stage == "kmap":
+        return lambda: generate_kmap(variables, table), lambda r: {}
+    if stage == "qm":
+        def info(r):
+            _, _, primes = combine_implicants(minterms, n)
+            return {
+                "prime_implicants": len(primes),
+                "essential": len(r["essential_prime_implicants"]),
+                "cover_terms": len(r["essential_prime_implicants"]) + len(r["selected_prime_implicants"]),
+                "cover_optimal": r["cover_optimal"]
+            }
+        return lambda: quine_mccluskey_process(
+            variables, minterms, include_steps=n <= QM_STEPS_MAX_VARS
+        ), info
+    if stage == "espresso":
+        return lambda: espresso_process(variables, minterms=minterms), lambda r: {
+            "terms": r["term_count"], "literals": r["literal_count"]
+        }
+    raise ValueError(f"Tahap tidak dikenal: {stage}")
+
+
+def measure_stage(stage, case, repeat):
+    run, info = prepare_stage(stage, case)
+    samples = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "ms": round(statistics.median(samples), 3),
+        "min_ms": round(min(samples), 3),
+        "peak_kb": round(peak / 1024, 1),
+        **info(result)
+    }
+
+
+def run_benchmark(corpus, stages, repeat, timeout, log=print):
+    results = []
+    # Setelah timeout, ukuran lebih besar dari family/tahap yang sama dilewati
+    timed_out = {}
+    for case in corpus:
+        for stage in stages:
+            entry = {"case": case["name"], "family": case["family"], "vars": case["vars"], "stage": stage}
+            if not stage_applicable(stage, case):
+                continue
+            limit = timed_out.get((case["family"], stage))
+            if limit is not None and case["vars"] >= limit:
+                entry["status"] = "skipped"
+            else:
+                try:
+                    finished, measured = run_with_deadline(measure_stage, (stage, case, repeat), timeout)
+                except RuntimeError as e:
+                    entry.update(status="error", error=str(e))
+                else:
+                    if finished:
+                        entry.update(status="ok", **measured)
+                    else:
+                        entry["status"] = "timeout"
+                        timed_out[(case["family"], stage)] = case["vars"]
+            results.append(entry)
+            log(format_entry(entry))
+    return results
+
+
+def format_entry(entry):
+    head = f"{entry['case']:<20} {entry['stage']:<12}"
+    if entry["status"] != "ok":
+        return f"{head} {entry['status']}"
+    extra = " ".join(
+        f"{k}={v}" for k, v in entry.items()
+        if k not in ("case", "family", "vars", "stage", "status", "ms", "min_ms", "peak_kb")
+    )
+    return f"{head} {entry['ms']:>10.3f} ms {entry['peak_kb']:>10.1f} KiB  {extra}"
+
+
+# ===============================
+# MODE PERBANDINGAN BASELINE
+# ===============================
+QUALITY_FIELDS = ("prime_implicants", "cover_terms", "terms", "literals", "minterms")
+
+
+def compare_results(baseline, current, threshold=1.25, min_delta_ms=2.0):
+    base_index = {(r["case"], r["stage"]): r for r in baseline}
+    regressions = []
+    lines = []
+    for entry in current:
+        base = base_index.get((entry["case"], entry["stage"]))
+        if base is None:
+            continue
+        label = f"{entry['case']:<20} {entry['stage']:<12}"
+        if base.get("status") == "ok" and entry.get("status") != "ok":
+            regressions.append(entry)
+            lines.append(f"{label} REGRESI: {entry['status']} (baseline {base['ms']:.3f} ms)")
+            continue
+        if entry.get("status") != "ok" or base.get("status") != "ok":
+            continue
+        ratio = entry["ms"] / base["ms"] if base["ms"] else 1.0
+        flag = ratio > threshold and entry["ms"] - base["ms"] > min_delta_ms
+        changed = [f for f in QUALITY_FIELDS if f in base and base.get(f) != entry.get(f)]
+        status = "LAMBAT" if flag else "ok"
+        if changed:
+            status += " (berubah: " + ", ".join(f"{f} {base[f]}→{entry.get(f)}" for f in changed) + ")"
+        if flag or changed:
+            regressions.append(entry)
+        lines.append(f"{label} {base['ms']:>10.3f} → {entry['ms']:>10.3f} ms  x{ratio:.2f}  {status}")
+    return regressions, lines
+
+
+def parse_var_range(text):
+    counts = []
+    for part in text.split(","):
+        if "-" in part:
+            low, high = part.split("-")
+            counts.extend(range(int(low), int(high) + 1))
+        else:
+            counts.append(int(part))
+    return sorted(set(counts))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark tahap-tahap optimizer Symbool.")
+    parser.add_argument("--vars", default="2-16", help="jumlah variabel, mis. 2-16 atau 4,8,12")
+    parser.add_argument("--families", default=",".join(FAMILIES))
+    parser.add_argument("--stages", default=",".join(STAGES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=20.0, help="deadline per tahap (detik)")
+    parser.add_argument("--seed", type=int, default=2025)
+    parser.add_argument("--out", help="simpan hasil ke file JSON")
+    parser.add_argument("--compare", help="bandingkan dengan baseline JSON")
+    parser.add_argument("--threshold", type=float, default=1.25, help="rasio lambat yang ditandai")
+    parser.add_argument("--min-delta", type=float, default=2.0,
+                        help="selisih minimum (ms) agar dianggap lambat, menyaring noise")
+    args = parser.parse_args(argv)
+
+    var_counts = parse_var_range(args.vars)
+    corpus = build_corpus(var_counts, args.families.split(","), args.seed)
+    results = run_benchmark(corpus, args.stages.split(","), args.repeat, args.timeout)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "vars": var_counts,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S")
+        },
+        "results": results
+    }
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=1)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions, lines = compare_results(
+            baseline["results"], results, args.threshold, args.min_delta
+        )
+        print()
+        print("\n".join(lines))
+        print(f"\n{len(regressions)} regresi ditemukan (ambang x{args.threshold}).")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,396 @@
+# ===============================
+# PARSER BAHASA SIMBOL UI
+# ===============================
+# Tokenizer + precedence climbing satu lintasan, menghasilkan IR ringan
+# (DAG Node hash-consed). SymPy hanya dibangun dari IR ini ketika jalur
+# simplify butuh; tabel kebenaran, K-Map, Q-M dan Espresso cukup IR.
+#
+# Prioritas (rendah → tinggi):
+#   ↔            (kiri)
+#   →            (kanan)
+#   ∨  +  ↓      (kiri)
+#   ⊕            (kiri)
+#   ∧  ↑  AB     (kiri, penjajaran = AND implisit)
+#   ¬X  X'       (prefix / postfix NOT)
+
+
+class ExpressionError(ValueError):
+    pass
+
+
+# ===============================
+# IR: NODE HASH-CONSED
+# ===============================
+# Node hanya dibuat lewat NodeTable.make: subekspresi yang strukturnya
+# sama menjadi satu objek (mis. A∧B pada (A∧B) ∨ ¬(A∧B)), sehingga IR
+# berupa DAG dan setiap node cukup dievaluasi sekali. Karena anak sudah
+# unik, kunci tabel cukup memakai id() anak.
+class Node:
+    __slots__ = ("op", "args", "name")
+
+    def __init__(self, op, args=(), name=None):
+        self.op = op
+        self.args = args
+        self.name = name
+
+    def __repr__(self):
+        if self.op == "var":
+            return self.name
+        if not self.args:
+            return self.op
+        return f"{self.op}({', '.join(map(repr, self.args))})"
+
+
+class NodeTable:
+    __slots__ = ("_nodes",)
+
+    def __init__(self):
+        self._nodes = {}
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def make(self, op, args=(), name=None):
+        args = tuple(args)
+        key = (op, tuple(map(id, args)), name)
+        node = self._nodes.get(key)
+        if node is None:
+            node = self._nodes[key] = Node(op, args, name)
+        return node
+
+    def var(self, name):
+        return self.make("var", name=name)
+
+# Alias ASCII (& | ~ ! ^ * +) mengikuti contoh di README
+SYMBOL_TOKENS = {
+    "¬": "NOT",
+    "~": "NOT",
+    "!": "NOT",
+    "'": "PRIME",
+    "∧": "AND",
+    "&": "AND",
+    "*": "AND",
+    "·": "AND",
+    "∨": "OR",
+    "|": "OR",
+    "+": "OR",
+    "⊕": "XOR",
+    "^": "XOR",
+    "→": "IMPLIES",
+    "↔": "IFF",
+    "↑": "NAND",
+    "↓": "NOR",
+    "⊤": "TRUE",
+    "⊥": "FALSE",
+    "(": "LPAREN",
+    ")": "RPAREN",
+}
+
+# token → (prioritas, asosiatif kanan, operator AST)
+BINARY_OPS = {
+    "IFF": (1, False, "iff"),
+    "IMPLIES": (2, True, "implies"),
+    "OR": (3, False, "or"),
+    "NOR": (3, False, "nor"),
+    "XOR": (4, False, "xor"),
+    "AND": (5, False, "and"),
+    "NAND": (5, False, "nand"),
+}
+IMPLICIT_AND_PREC = 5
+# Parser rekursif: batas kedalaman kurung / ¬ / rantai → bersarang,
+# supaya input patologis dibalas ExpressionError, bukan RecursionError
+MAX_PARSE_DEPTH = 200
+ATOM_START = {"VAR", "TRUE", "FALSE", "LPAREN", "NOT"}
+# Operator asosiatif digabung menjadi node n-ary
+FLATTEN_OPS = {"and", "or", "xor"}
+
+
+# Tabel karakter → (jenis, nilai) dihitung sekali saat import, jadi
+# tokenizer cukup satu lookup dict per karakter.
+CHAR_TOKENS = {char: (kind, char) for char, kind in SYMBOL_TOKENS.items()}
+for _code in range(26):
+    CHAR_TOKENS[chr(ord("A") + _code)] = ("VAR", chr(ord("A") + _code))
+    CHAR_TOKENS[chr(ord("a") + _code)] = ("VAR", chr(ord("A") + _code))
+
+
+def tokenize(text):
+    tokens = []
+    for pos, char in enumerate(text):
+        token = CHAR_TOKENS.get(char)
+        if token is None:
+            if char.isspace():
+                continue
+            raise ExpressionError(f"Karakter tidak valid '{char}' pada posisi {pos + 1}.")
+        tokens.append((token[0], token[1], pos))
+    tokens.append(("END", "", len(text)))
+    return tokens
+
+
+class _Parser:
+    def __init__(self, tokens, table):
+        self.tokens = tokens
+        self.table = table
+        self.pos = 0
+        self.depth = 0
+
+    def peek(self):
+        return self.tokens[self.pos][0]
+
+    def advance(self):
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def error(self, message):
+        _, value, pos = self.tokens[self.pos]
+        found = f"'{value}'" if value else "akhir ekspresi"
+        raise ExpressionError(f"{message} (menemukan {found} pada posisi {pos + 1}).")
+
+    def enter(self):
+        self.depth += 1
+        if self.depth > MAX_PARSE_DEPTH:
+            raise ExpressionError(f"Ekspresi terlalu dalam (maksimal {MAX_PARSE_DEPTH} tingkat bersarang).")
+
+    def parse(self):
+        if self.peek() == "END":
+            raise ExpressionError("Ekspresi kosong.")
+        node = self.parse_binary(1)
+        if self.peek() == "RPAREN":
+            self.error("Kurung tutup tanpa pasangan")
+        if self.peek() != "END":
+            self.error("Operator tidak dikenali di posisi ini")
+        return node
+
+    def parse_binary(self, min_prec):
+        self.enter()
+        left = self.parse_unary()
+        while True:
+            kind = self.peek()
+            if kind in BINARY_OPS:
+                prec, right_assoc, op = BINARY_OPS[kind]
+                implicit = False
+            elif kind in ATOM_START:
+                prec, right_assoc, op = IMPLICIT_AND_PREC, False, "and"
+                implicit = True
+            else:
+                break
+            if prec < min_prec:
+                break
+            if not implicit:
+                self.advance()
+            right = self.parse_binary(prec if right_assoc else prec + 1)
+            left = make_binary(self.table, op, left, right)
+        self.depth -= 1
+        return left
+
+    def parse_unary(self):
+        if self.peek() == "NOT":
+            self.advance()
+            self.enter()
+            node = self.table.make("not", (self.parse_unary(),))
+            self.depth -= 1
+            return node
+        node = self.parse_primary()
+        while self.peek() == "PRIME":
+            self.advance()
+            node = self.table.make("not", (node,))
+        return node
+
+    def parse_primary(self):
+        kind, value, _ = self.tokens[self.pos]
+        if kind == "VAR":
+            self.advance()
+            return self.table.var(value)
+        if kind == "TRUE":
+            self.advance()
+            return self.table.make("true")
+        if kind == "FALSE":
+            self.advance()
+            return self.table.make("false")
+        if kind == "LPAREN":
+            self.advance()
+            if self.peek() == "RPAREN":
+                self.error("Kurung kosong")
+            node = self.parse_binary(1)
+            if self.peek() != "RPAREN":
+                self.error("Kurung buka belum ditutup")
+            self.advance()
+            return node
+        self.error("Operand diharapkan")
+
+
+def make_binary(table, op, left, right):
+    if op in FLATTEN_OPS:
+        args = []
+        for side in (left, right):
+            args.extend(side.args if side.op == op else (side,))
+        if op != "xor":
+            # Idempoten: argumen kembar (node yang sama) cukup sekali
+            args = list({id(a): a for a in args}.values())
+        return table.make(op, args)
+    return table.make(op, (left, right))
+
+
+def parse_boolean(text, table=None):
+    try:
+        return _Parser(tokenize(text), NodeTable() if table is None else table).parse()
+    except RecursionError:
+        raise ExpressionError("Ekspresi terlalu dalam untuk diproses.")
+
+
+def topological_nodes(*roots):
+    # Node unik dalam urutan anak-sebelum-induk (iteratif, tanpa rekursi);
+    # beberapa root berbagi node yang sama cukup sekali
+    order = []
+    seen = set()
+    stack = [(root, False) for root in reversed(roots)]
+    while stack:
+        current, expanded = stack.pop()
+        if expanded:
+            order.append(current)
+            continue
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        stack.append((current, True))
+        stack.extend((a, False) for a in reversed(current.args) if id(a) not in seen)
+    return order
+
+
+def expression_variables(node):
+    return sorted({n.name for n in topological_nodes(node) if n.op == "var"})
+
+
+# ===============================
+# KONVERSI & EVALUASI
+# ===============================
+def to_sympy(node, symbol_table):
+    from sympy import true, false, Symbol
+    from sympy.logic.boolalg import And, Or, Not, Xor, Nand, Nor, Implies, Equivalent
+
+    builders = {
+        "not": Not,
+        "and": And,
+        "or": Or,
+        "xor": Xor,
+        "nand": Nand,
+        "nor": Nor,
+        "implies": Implies,
+        "iff": Equivalent,
+    }
+    converted = {}
+    for current in topological_nodes(node):
+        if current.op == "var":
+            value = symbol_table.get(current.name) or Symbol(current.name)
+        elif current.op == "true":
+            value = true
+        elif current.op == "false":
+            value = false
+        else:
+            value = builders[current.op](*(converted[id(a)] for a in current.args))
+        converted[id(current)] = value
+    return converted[id(node)]
+
+
+# Template satu baris per node; {0}, {1}, ... = register anak
+_BITWISE_TEMPLATES = {
+    "not": "full ^ {0}",
+    "implies": "(full ^ {0}) | {1}",
+    "iff": "full ^ {0} ^ {1}",
+}
+_NARY_OPERATORS = {"and": " & ", "or": " | ", "xor": " ^ "}
+
+
+def compile_columns(node, variables):
+    # Kompilasi DAG menjadi fungsi Python garis lurus: satu register per
+    # node unik, jadi subekspresi bersama dihitung sekali per evaluasi.
+    # Register bekerja atas kolom tabel kebenaran ter-pack (integer).
+    # node boleh berupa list root (multi-output): hasilnya tuple kolom.
+    roots = tuple(node) if isinstance(node, (list, tuple)) else (node,)
+    index = {str(v): i for i, v in enumerate(variables)}
+    register = {}
+    lines = ["def evaluate(cols, full):"]
+    for current in topological_nodes(*roots):
+        name = f"r{len(register)}"
+        op = current.op
+        if op == "var":
+            code = f"cols[{index[current.name]}]"
+        elif op == "true":
+            code = "full"
+        elif op == "false":
+            code = "0"
+        else:
+            args = [register[id(a)] for a in current.args]
+            if op in _BITWISE_TEMPLATES:
+                code = _BITWISE_TEMPLATES[op].format(*args)
+            elif op in _NARY_OPERATORS:
+                code = _NARY_OPERATORS[op].join(args)
+            elif op in ("nand", "nor"):
+                joined = (" & " if op == "nand" else " | ").join(args)
+                code = f"full ^ ({joined})"
+            else:
+                raise ValueError(f"Operator tidak dikenal: {op}")
+        register[id(current)] = name
+        lines.append(f"    {name} = {code}")
+    if isinstance(node, (list, tuple)):
+        lines.append(f"    return ({''.join(register[id(r)] + ', ' for r in roots)})")
+    else:
+        lines.append(f"    return {register[id(node)]}")
+
+    namespace = {}
+    exec(compile("\n".join(lines), "<boolexpr>", "exec"), namespace)
+    return namespace["evaluate"]
+
+
+def evaluate_columns(node, variables, columns, full, cache):
+    # Evaluasi node demi node dengan cache id(node) → kolom. Dipakai sesi
+    # inkremental: node yang sama (hash-consing dalam satu NodeTable)
+    # tidak dihitung ulang antar request, hanya node baru yang dievaluasi.
+    # Return (kolom output, jumlah node yang dihitung).
+    index = {str(v): i for i, v in enumerate(variables)}
+    computed = 0
+    # DFS yang berhenti di node ter-cache: subpohon yang tidak berubah
+    # bahkan tidak dikunjungi
+    stack = [(node, False)]
+    while stack:
+        current, expanded = stack.pop()
+        key = id(current)
+        if key in cache:
+            continue
+        if not expanded:
+            stack.append((current, True))
+            stack.extend((a, False) for a in current.args if id(a) not in cache)
+            continue
+        op = current.op
+        args = [cache[id(a)] for a in current.args]
+        if op == "var":
+            value = columns[index[current.name]]
+        elif op == "true":
+            value = full
+        elif op == "false":
+            value = 0
+        elif op == "not":
+            value = full ^ args[0]
+        elif op in ("and", "nand"):
+            value = full
+            for a in args:
+                value &= a
+            value = full ^ value if op == "nand" else value
+        elif op in ("or", "nor"):
+            value = 0
+            for a in args:
+                value |= a
+            value = full ^ value if op == "nor" else value
+        elif op == "xor":
+            value = 0
+            for a in args:
+                value ^= a
+        elif op == "implies":
+            value = (full ^ args[0]) | args[1]
+        elif op == "iff":
+            value = full ^ args[0] ^ args[1]
+        else:
+            raise ValueError(f"Operator tidak dikenal: {op}")
+        cache[key] = value
+        computed += 1
+    return cache[id(node)], computed
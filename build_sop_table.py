@@ -0,0 +1,116 @@
+import argparse
+import random
+import sys
+import time
+
+from sympy import symbols, simplify_logic
+from sympy.logic.boolalg import SOPform, And, Or, Not
+
+from optimizer import (
+    combine_implicants,
+    quine_mccluskey_process,
+    format_ui_symbols,
+    parse_implicant_binary,
+    render_qm_cover,
+    render_dnf_terms
+)
+from sop_table import (
+    SOP_TABLE_MAX_VARS,
+    SOP_TABLE_PATH,
+    SopTable,
+    encode_record,
+    write_table
+)
+
+# ===============================
+# GENERATOR TABEL SOP MINIMAL (OFFLINE)
+# ===============================
+# Contoh:
+#   python build_sop_table.py                 # tulis sop_table.bin
+#   python build_sop_table.py --verify 2000   # cek ulang sampel acak
+# Setiap record diverifikasi saat dibangun: rendering dari record harus
+# sama persis dengan final_expression Q-M dan string simplify_logic.
+VARIABLES = "ABCD"
+
+
+def encode_dnf(expr, variables):
+    # Objek SymPy DNF → list term (literal dalam urutan cetak str())
+    index = {v: i for i, v in enumerate(variables)}
+    text = format_ui_symbols(str(expr))
+    terms = []
+    for part in text.split(" ∨ "):
+        literals = []
+        for literal in part.strip("()").split(" ∧ "):
+            negated = literal.startswith("¬")
+            literals.append(index[literal.lstrip("¬")] | (4 if negated else 0))
+        terms.append(literals)
+    return terms, text
+
+
+def build_record(num_vars, output):
+    variables = list(VARIABLES[:num_vars])
+    size = 1 << num_vars
+    minterms = [r for r in range(size) if (output >> r) & 1]
+    if not minterms or len(minterms) == size:
+        # Konstan: dijawab ROBDD/cek tabel sebelum lookup
+        return encode_record([], [], [])
+
+    _, _, primes = combine_implicants(minterms, num_vars)
+    qm_data = quine_mccluskey_process(variables, minterms, include_steps=False)
+    index_of = {p: i for i, p in enumerate(primes)}
+    cover = [
+        index_of[parse_implicant_binary(b)]
+        for b in qm_data["essential_prime_implicants"] + qm_data["selected_prime_implicants"]
+    ]
+    expr = SOPform(symbols(variables), minterms)
+    terms, text = encode_dnf(expr, variables)
+
+    if render_qm_cover([primes[i] for i in cover], variables) != qm_data["final_expression"]:
+        raise AssertionError(f"Cover Q-M tidak cocok untuk n={num_vars}, output={output}")
+    if render_dnf_terms(terms, variables) != text:
+        raise AssertionError(f"Bentuk simplify tidak cocok untuk n={num_vars}, output={output}")
+    return encode_record(primes, cover, terms)
+
+
+def verify(path, samples, seed=0):
+    # Bandingkan isi file dengan simplify_logic pada ekspresi SOP kanonik
+    rng = random.Random(seed)
+    table = SopTable(path)
+    for _ in range(samples):
+        num_vars = rng.randint(1, SOP_TABLE_MAX_VARS)
+        output = rng.randrange(1, (1 << (1 << num_vars)) - 1)
+        variables = list(VARIABLES[:num_vars])
+        syms = symbols(variables)
+        expr = Or(*[
+            And(*[s if (m >> (num_vars - 1 - i)) & 1 else Not(s) for i, s in enumerate(syms)])
+            for m in range(1 << num_vars) if (output >> m) & 1
+        ])
+        expected = format_ui_symbols(str(simplify_logic(expr, form="dnf")))
+        _, _, terms = table.record(num_vars, output)
+        if render_dnf_terms(terms, variables) != expected:
+            raise AssertionError(f"Tidak cocok: n={num_vars}, output={output}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bangkitkan tabel SOP minimal untuk fungsi ≤ 4 variabel.")
+    parser.add_argument("--out", default=SOP_TABLE_PATH)
+    parser.add_argument("--verify", type=int, default=500, help="jumlah sampel acak yang dicek ulang")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    records = []
+    for num_vars in range(1, SOP_TABLE_MAX_VARS + 1):
+        for output in range(1 << (1 << num_vars)):
+            records.append(build_record(num_vars, output))
+        print(f"{num_vars} variabel: {1 << (1 << num_vars)} fungsi ({time.perf_counter() - start:.1f} s)")
+    write_table(args.out, records)
+    print(f"Ditulis ke {args.out}")
+
+    if args.verify:
+        verify(args.out, args.verify)
+        print(f"Verifikasi {args.verify} sampel OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,543 @@
+from itertools import combinations
+
+from boolexpr import topological_nodes
+
+# ===============================
+# REPRESENTASI CUBE
+# ===============================
+# Cube = (value, mask) seperti implicant Q-M: bit di mask adalah posisi
+# "-", value bernilai 0 pada posisi tersebut. Variabel pertama = bit
+# paling signifikan. Cover = list cube (OR dari semua cube).
+def _popcount(x):
+    return bin(x).count("1")
+
+
+def cube_and(a, b, full):
+    va, ma = a
+    vb, mb = b
+    if (va ^ vb) & ~ma & ~mb & full:
+        return None
+    return va | vb, ma & mb
+
+
+def cube_contains(a, b, full):
+    # True jika cube a mencakup seluruh cube b
+    va, ma = a
+    vb, mb = b
+    fixed_a = full & ~ma
+    return (mb & fixed_a) == 0 and ((va ^ vb) & fixed_a) == 0
+
+
+def cube_size(cube):
+    return 1 << _popcount(cube[1])
+
+
+def cover_cost(cubes, full):
+    # Biaya = (jumlah term, jumlah literal)
+    return len(cubes), sum(_popcount(full & ~m) for _, m in cubes)
+
+
+class _ContainmentIndex:
+    # Cube dikelompokkan per mask: cube b tercakup salah satu cube a jika
+    # mask a memuat mask b dan nilai b pada bit tetap a sama dengan nilai a.
+    # Satu lookup set per mask berbeda, bukan cube_contains per cube.
+    def __init__(self, full):
+        self.full = full
+        self.values = {}
+
+    def add(self, cube):
+        self.values.setdefault(cube[1], set()).add(cube[0] & ~cube[1] & self.full)
+
+    def covers(self, cube):
+        v, m = cube
+        for mask, values in self.values.items():
+            if not m & ~mask and (v & ~mask & self.full) in values:
+                return True
+        return False
+
+
+def single_cube_containment(cubes, full):
+    result = []
+    index = _ContainmentIndex(full)
+    for cube in sorted(set(cubes), key=lambda c: -_popcount(c[1])):
+        if not index.covers(cube):
+            result.append(cube)
+            index.add(cube)
+    return result
+
+
+def cofactor(cubes, c, full):
+    # Kofaktor cover terhadap cube c: hanya cube yang beririsan dengan c,
+    # posisi yang tetap di c dibebaskan.
+    fixed = full & ~c[1]
+    result = []
+    for cube in cubes:
+        if cube_and(cube, c, full) is not None:
+            result.append((cube[0] & ~fixed, cube[1] | fixed))
+    return result
+
+
+def _cofactor_var(cubes, bit, value):
+    result = []
+    for v, m in cubes:
+        if m & bit:
+            result.append((v, m))
+        elif bool(v & bit) == value:
+            result.append((v & ~bit, m | bit))
+    return result
+
+
+def _split_variable(cubes, full):
+    # Pilih variabel binate yang paling sering muncul; kalau cover unate,
+    # pilih variabel yang paling sering muncul. Hitungan per literal
+    # diambil dari bit tetap tiap cube (biasanya hanya sedikit).
+    ones = zeros = 0
+    counts = {}
+    for v, m in cubes:
+        fixed = full & ~m
+        ones |= v & fixed
+        zeros |= ~v & fixed
+        while fixed:
+            bit = fixed & -fixed
+            fixed ^= bit
+            counts[bit] = counts.get(bit, 0) + 1
+    binate = ones & zeros
+    candidates = binate or (ones | zeros)
+    best_bit = max(
+        (bit for bit in counts if bit & candidates),
+        key=lambda bit: (counts[bit], bit),
+        default=0
+    )
+    return bool(binate), best_bit
+
+
+# ===============================
+# TAUTOLOGI & KOMPLEMEN (UNATE RECURSIVE PARADIGM)
+# ===============================
+def tautology(cubes, full):
+    if not cubes:
+        return False
+    if any(m == full for _, m in cubes):
+        return True
+    if sum(cube_size(c) for c in cubes) < full + 1:
+        return False
+    is_binate, bit = _split_variable(cubes, full)
+    if not is_binate:
+        # Cover unate hanya tautologi jika memuat cube universal
+        return False
+    return (tautology(_cofactor_var(cubes, bit, True), full)
+            and tautology(_cofactor_var(cubes, bit, False), full))
+
+
+def complement(cubes, full):
+    if not cubes:
+        return [(0, full)]
+    if any(m == full for _, m in cubes):
+        return []
+    if len(cubes) == 1:
+        # De Morgan untuk satu cube
+        v, m = cubes[0]
+        result = []
+        fixed = full & ~m
+        while fixed:
+            bit = fixed & -fixed
+            fixed ^= bit
+            result.append((0 if v & bit else bit, full & ~bit))
+        return result
+
+    _, bit = _split_variable(cubes, full)
+    high = complement(_cofactor_var(cubes, bit, True), full)
+    low = complement(_cofactor_var(cubes, bit, False), full)
+    # Tiap cabang sudah bebas containment; cube berliteral x hanya bisa
+    # tercakup cube yang muncul di kedua cabang (tanpa literal x).
+    shared = set(high) & set(low)
+    result = list(shared)
+    for half, value in ((high, bit), (low, 0)):
+        for cube in half:
+            if cube in shared or any(cube_contains(s, cube, full) for s in shared):
+                continue
+            result.append((cube[0] | value, cube[1] & ~bit))
+    return result
+
+
+def complement_supercube(cubes, full):
+    # Supercube dari komplemen cover tanpa membangun komplemennya.
+    # None = komplemen kosong (cover tautologi).
+    if not cubes:
+        return 0, full
+    if any(m == full for _, m in cubes):
+        return None
+    if len(cubes) == 1:
+        v, m = cubes[0]
+        fixed = full & ~m
+        if fixed & (fixed - 1):
+            return 0, full
+        return (0 if v & fixed else fixed), full & ~fixed
+
+    _, bit = _split_variable(cubes, full)
+    high_cubes = _cofactor_var(cubes, bit, True)
+    low_cubes = _cofactor_var(cubes, bit, False)
+    parts = []
+    high = complement_supercube(high_cubes, full)
+    if high is not None:
+        if high == (0, full):
+            # Cabang x sudah universal: cukup cek apakah cabang x' kosong
+            return (bit, full & ~bit) if tautology(low_cubes, full) else (0, full)
+        parts.append((high[0] | bit, high[1] & ~bit))
+    low = complement_supercube(low_cubes, full)
+    if low is not None:
+        parts.append((low[0], low[1] & ~bit))
+    if not parts:
+        return None
+    return supercube(parts, full)
+
+
+def supercube(cubes, full):
+    ones = zeros = free = 0
+    for v, m in cubes:
+        fixed = full & ~m
+        ones |= v & fixed
+        zeros |= ~v & fixed
+        free |= m
+    mask = free | (ones & zeros)
+    return ones & ~mask, mask
+
+
+# ===============================
+# COVER AWAL TANPA ENUMERASI
+# ===============================
+def expression_cover(tree, variables):
+    # Turunkan IR boolexpr langsung ke cover cube (tanpa tabel kebenaran).
+    # Node DAG yang dipakai bersama cukup diturunkan sekali.
+    num_vars = len(variables)
+    full = (1 << num_vars) - 1
+    index = {str(v): i for i, v in enumerate(variables)}
+
+    def product(a, b):
+        result = []
+        for x in a:
+            for y in b:
+                cube = cube_and(x, y, full)
+                if cube is not None:
+                    result.append(cube)
+        return single_cube_containment(result, full)
+
+    def lower(node, args):
+        op = node.op
+        if op == "true":
+            return [(0, full)]
+        if op == "false":
+            return []
+        if op == "var":
+            bit = 1 << (num_vars - 1 - index[node.name])
+            return [(bit, full & ~bit)]
+        if op in ("and", "nand"):
+            acc = [(0, full)]
+            for a in args:
+                acc = product(acc, a)
+            return complement(acc, full) if op == "nand" else acc
+        if op == "or":
+            return single_cube_containment([c for a in args for c in a], full)
+        if op == "nor":
+            return complement([c for a in args for c in a], full)
+        if op == "not":
+            return complement(args[0], full)
+        if op == "xor":
+            acc = args[0]
+            for a in args[1:]:
+                acc = single_cube_containment(
+                    product(acc, complement(a, full)) + product(complement(acc, full), a), full
+                )
+            return acc
+        if op == "implies":
+            a, b = args
+            return single_cube_containment(complement(a, full) + b, full)
+        if op == "iff":
+            a, b = args
+            return single_cube_containment(
+                product(a, b) + product(complement(a, full), complement(b, full)), full
+            )
+        raise NotImplementedError(op)
+
+    covers = {}
+    for node in topological_nodes(tree):
+        covers[id(node)] = lower(node, [covers[id(a)] for a in node.args])
+    return covers[id(tree)]
+
+
+def minterm_cover(minterms, num_vars):
+    full = (1 << num_vars) - 1
+    return [(int(m) & full, 0) for m in minterms]
+
+
+# ===============================
+# LANGKAH ESPRESSO
+# ===============================
+EXPAND_MAX_DISTANCE = 2
+# Sampai batas ini cek "cube ⊆ on-set + don't care" memakai bitset baris
+# tabel kebenaran (satu AND integer), bukan tautologi kofaktor
+EXPAND_BITSET_MAX_VARS = 16
+
+
+def _row_columns(num_vars):
+    # Kolom baris per bit variabel: bit r dari kolom = 1 jika baris r
+    # (= nilai minterm) memuat bit tersebut
+    size = 1 << num_vars
+    all_rows = (1 << size) - 1
+    columns = {}
+    for i in range(num_vars):
+        width = 1 << i
+        block = ((1 << width) - 1) << width
+        columns[1 << i] = block * (all_rows // ((1 << (2 * width)) - 1))
+    return columns, all_rows
+
+
+def _cube_rows(cube, columns, all_rows, full):
+    v, m = cube
+    rows = all_rows
+    fixed = full & ~m
+    while fixed:
+        bit = fixed & -fixed
+        fixed ^= bit
+        rows &= columns[bit] if v & bit else ~columns[bit]
+    return rows
+
+
+class _NeighbourIndex:
+    # Selama expand, cube yang diperbesar (current) selalu memuat cube
+    # awalnya, sehingga untuk cube lain o:
+    #   jarak(current, o) ≥ beda nilai pada bit tetap di keduanya
+    #                       + bit bebas di cube tapi tetap di o.
+    # Cube dengan batas bawah > EXPAND_MAX_DISTANCE tidak pernah lolos dan
+    # tidak perlu dilihat. Cube dikelompokkan per mask; per pasangan mask
+    # nilai diindeks pada bit tetap bersama, lalu hanya nilai yang berbeda
+    # ≤ sisa jarak bit yang dicari.
+    def __init__(self, cubes, full):
+        self.full = full
+        self.by_mask = {}
+        for index, cube in enumerate(cubes):
+            self.by_mask.setdefault(cube[1], []).append((index, cube))
+        self._tables = {}
+
+    def _table(self, cube_mask, other_mask):
+        key = (cube_mask, other_mask)
+        table = self._tables.get(key)
+        if table is None:
+            shared = self.full & ~cube_mask & ~other_mask
+            table = {}
+            for entry in self.by_mask[other_mask]:
+                table.setdefault(entry[1][0] & shared, []).append(entry)
+            self._tables[key] = (shared, table)
+            return shared, table
+        return table
+
+    def candidates(self, cube, distance):
+        v, m = cube
+        found = []
+        for other_mask in self.by_mask:
+            budget = EXPAND_MAX_DISTANCE - _popcount(m & ~other_mask & self.full)
+            if budget < 0:
+                continue
+            shared, table = self._table(m, other_mask)
+            base = v & shared
+            bits = []
+            rest = shared
+            while rest:
+                bit = rest & -rest
+                rest ^= bit
+                bits.append(bit)
+            for flips in range(min(budget, len(bits)) + 1):
+                for chosen in combinations(bits, flips):
+                    found.extend(table.get(base ^ sum(chosen), ()))
+        found.sort(key=lambda entry: (distance(cube, entry[1]), entry[0]))
+        return [other for _, other in found]
+
+
+def expand(cubes, care_set, full):
+    # Perbesar tiap cube selama masih di dalam on-set + don't care (dicek
+    # dengan bitset baris, atau tautologi kofaktor untuk fungsi lebar,
+    # tanpa menghitung off-set): pertama ke arah cube lain di cover
+    # (supaya cube itu ikut tercakup), lalu buang literal sisa sampai cube
+    # menjadi prime.
+    num_vars = full.bit_length()
+    if num_vars <= EXPAND_BITSET_MAX_VARS:
+        columns, all_rows = _row_columns(num_vars)
+        outside = all_rows
+        for cube in care_set:
+            outside &= ~_cube_rows(cube, columns, all_rows, full)
+
+        def feasible(cube):
+            return not _cube_rows(cube, columns, all_rows, full) & outside
+    else:
+        def feasible(cube):
+            return tautology(cofactor(care_set, cube, full), full)
+
+    def distance(a, b):
+        return _popcount(((a[0] ^ b[0]) | a[1] | b[1]) & full & ~(a[1] & b[1]))
+
+    free_count = {}
+    for _, m in cubes:
+        bits = m
+        while bits:
+            bit = bits & -bits
+            bits ^= bit
+            free_count[bit] = free_count.get(bit, 0) + 1
+
+    pending = sorted(cubes, key=lambda c: (_popcount(c[1]), c[0]))
+    neighbours = _NeighbourIndex(pending, full)
+    result = []
+    expanded = _ContainmentIndex(full)
+    for cube in pending:
+        if expanded.covers(cube):
+            continue
+        # Hanya cube yang bisa berjarak ≤ EXPAND_MAX_DISTANCE dari cube yang
+        # sedang diperbesar (lihat _NeighbourIndex), urut jarak lalu urutan
+        # pending, tanpa sort ulang seluruh cover per cube
+        current = cube
+        for other in neighbours.candidates(cube, distance):
+            if distance(current, other) > EXPAND_MAX_DISTANCE:
+                continue
+            if cube_contains(current, other, full):
+                continue
+            candidate = supercube([current, other], full)
+            if feasible(candidate):
+                current = candidate
+
+        v, m = current
+        fixed = full & ~m
+        order = []
+        while fixed:
+            bit = fixed & -fixed
+            fixed ^= bit
+            order.append(bit)
+        order.sort(key=lambda b: -free_count.get(b, 0))
+        for bit in order:
+            candidate = (v & ~bit, m | bit)
+            if feasible(candidate):
+                v, m = candidate
+        result.append((v, m))
+        expanded.add((v, m))
+    return single_cube_containment(result, full)
+
+
+IRREDUNDANT_ENUM_LIMIT = 4096
+
+
+def _cube_minterms(cube):
+    v, m = cube
+    result = []
+    sub = m
+    while True:
+        result.append(v | sub)
+        if sub == 0:
+            break
+        sub = (sub - 1) & m
+    return result
+
+
+def irredundant(cubes, dc_set, full):
+    # Cube relatif essential selalu dipakai; cube yang sudah dicakup
+    # essential + don't care dibuang; sisanya (partially redundant) dipilih
+    # dengan set cover greedy atas minterm yang belum tercakup.
+    dc_set = list(dc_set)
+    essential, partial = [], []
+    for idx, cube in enumerate(cubes):
+        others = cubes[:idx] + cubes[idx + 1:] + dc_set
+        if tautology(cofactor(others, cube, full), full):
+            partial.append(cube)
+        else:
+            essential.append(cube)
+
+    base = essential + dc_set
+    partial = [c for c in partial if not tautology(cofactor(base, c, full), full)]
+    if not partial:
+        return essential
+
+    if sum(cube_size(c) for c in partial) <= IRREDUNDANT_ENUM_LIMIT:
+        need = {}
+        for cube in partial:
+            need[cube] = {
+                m for m in _cube_minterms(cube)
+                if not any(cube_contains(b, (m, 0), full) for b in base)
+            }
+        uncovered = set().union(*need.values())
+        chosen = []
+        while uncovered:
+            best = max(partial, key=lambda c: (len(need[c] & uncovered), _popcount(c[1])))
+            chosen.append(best)
+            uncovered -= need[best]
+        # Buang pilihan greedy yang ternyata tidak lagi diperlukan
+        for cube in sorted(chosen, key=lambda c: _popcount(c[1])):
+            rest = [c for c in chosen if c != cube]
+            if tautology(cofactor(rest + base, cube, full), full):
+                chosen = rest
+        return essential + chosen
+
+    result = essential + partial
+    for cube in sorted(partial, key=lambda c: _popcount(c[1])):
+        others = [c for c in result if c != cube] + dc_set
+        if tautology(cofactor(others, cube, full), full):
+            result.remove(cube)
+    return result
+
+
+def reduce(cubes, dc_set, full):
+    # Perkecil tiap cube ke supercube bagian yang hanya ia cover sendiri,
+    # supaya EXPAND berikutnya bisa memilih arah lain.
+    result = list(cubes)
+    for idx in sorted(range(len(result)), key=lambda i: -_popcount(result[i][1])):
+        cube = result[idx]
+        others = [c for i, c in enumerate(result) if i != idx and c is not None] + list(dc_set)
+        uncovered = complement_supercube(cofactor(others, cube, full), full)
+        if uncovered is None:
+            result[idx] = None
+            continue
+        result[idx] = cube_and(cube, uncovered, full)
+    return [c for c in result if c is not None]
+
+
+def last_gasp(cubes, dc_set, care_set, full):
+    # Reduksi maksimal tiap cube secara independen, lalu cari cube prime
+    # baru yang mencakup dua atau lebih cube hasil reduksi.
+    reduced = []
+    for idx, cube in enumerate(cubes):
+        others = cubes[:idx] + cubes[idx + 1:] + list(dc_set)
+        uncovered = complement_supercube(cofactor(others, cube, full), full)
+        if uncovered is not None:
+            reduced.append(cube_and(cube, uncovered, full))
+    candidates = []
+    for cube in expand(reduced, care_set, full):
+        if sum(1 for r in reduced if cube_contains(cube, r, full)) >= 2:
+            candidates.append(cube)
+    if not candidates:
+        return cubes
+    return irredundant(single_cube_containment(candidates + cubes, full), dc_set, full)
+
+
+def espresso(on_set, num_vars, dc_set=(), max_iterations=20):
+    full = (1 << num_vars) - 1
+    dc_set = list(dc_set)
+    cover = single_cube_containment(on_set, full)
+    if not cover:
+        return []
+
+    care_set = cover + dc_set
+    if tautology(care_set, full):
+        return [(0, full)]
+
+    cover = irredundant(expand(cover, care_set, full), dc_set, full)
+    best = cover
+    best_cost = cover_cost(cover, full)
+
+    for _ in range(max_iterations):
+        cover = reduce(cover, dc_set, full)
+        cover = irredundant(expand(cover, care_set, full), dc_set, full)
+        cost = cover_cost(cover, full)
+        if cost >= best_cost:
+            cover = last_gasp(best, dc_set, care_set, full)
+            cost = cover_cost(cover, full)
+            if cost >= best_cost:
+                break
+        best, best_cost = cover, cost
+
+    return sorted(best, key=lambda c: (-_popcount(c[1]), -c[0]))
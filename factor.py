@@ -0,0 +1,198 @@
+# ===============================
+# FAKTORISASI MULTI-LEVEL (DIVISI ALJABAR)
+# ===============================
+# Cover SOP diperlakukan sebagai polinom aljabar: cube = frozenset literal,
+# literal = 2 * indeks variabel + 1 jika negasi. Divisi aljabar F / D
+# menghasilkan Q dan R dengan F = Q·D + R; divisor dipilih dari kernel
+# (hasil bagi F oleh sebuah cube yang tidak punya faktor cube bersama)
+# yang paling menghemat literal, lalu Q, D dan R difaktorkan rekursif.
+# Hasilnya pohon ("lit", kode) / ("and", anak) / ("or", anak) / ("true",).
+
+# Batas supaya enumerasi kernel tetap murah untuk cover yang lebar
+FACTOR_MAX_CUBES = 64
+FACTOR_MAX_KERNELS = 256
+
+TRUE_NODE = ("true",)
+
+
+def cover_to_cubes(cover, num_vars):
+    # Cube (value, mask) ala Q-M/Espresso → frozenset literal
+    cubes = []
+    for value, mask in cover:
+        literals = []
+        for i in range(num_vars):
+            bit = 1 << (num_vars - 1 - i)
+            if not mask & bit:
+                literals.append(2 * i + (0 if value & bit else 1))
+        cubes.append(frozenset(literals))
+    return cubes
+
+
+def literal_total(cubes):
+    return sum(len(c) for c in cubes)
+
+
+def common_cube(cubes):
+    return frozenset.intersection(*cubes) if cubes else frozenset()
+
+
+def make_cube_free(cubes):
+    common = common_cube(cubes)
+    return [c - common for c in cubes] if common else list(cubes)
+
+
+def literal_counts(cubes):
+    counts = {}
+    for cube in cubes:
+        for lit in cube:
+            counts[lit] = counts.get(lit, 0) + 1
+    return counts
+
+
+def divide(cubes, divisor):
+    # Divisi aljabar (weak division): Q = irisan {c - d | d ⊆ c} atas
+    # semua cube d di divisor, R = cube F yang tidak muncul di Q·D.
+    quotient = None
+    for d in divisor:
+        partial = {c - d for c in cubes if d <= c}
+        quotient = partial if quotient is None else quotient & partial
+        if not quotient:
+            return [], list(cubes)
+    product = {q | d for q in quotient for d in divisor}
+    remainder = [c for c in cubes if c not in product]
+    return sorted(quotient, key=sorted), remainder
+
+
+def kernels(cubes, start=0, limit=FACTOR_MAX_KERNELS):
+    # Kernel rekursif (Brayton–McMullen); literal < start sudah dijelajahi
+    # cabang lain, jadi co-kernel yang memuatnya dilewati.
+    result = []
+    counts = literal_counts(cubes)
+    for lit in sorted(counts):
+        if lit < start or counts[lit] < 2:
+            continue
+        with_lit = [c for c in cubes if lit in c]
+        common = common_cube(with_lit)
+        if any(other < lit for other in common):
+            continue
+        result.extend(kernels([c - common for c in with_lit], lit + 1, limit - len(result)))
+        if len(result) >= limit:
+            return result[:limit]
+    if len(cubes) > 1 and not common_cube(cubes):
+        result.append(list(cubes))
+    return result
+
+
+def _best_kernel(cubes):
+    # Kernel (selain F sendiri) dengan penghematan literal terbesar
+    # bila F ditulis sebagai Q·K + R
+    total = literal_total(cubes)
+    own = set(cubes)
+    best, best_gain = None, 0
+    for kernel in kernels(cubes):
+        if set(kernel) == own:
+            continue
+        quotient, remainder = divide(cubes, kernel)
+        if not quotient:
+            continue
+        gain = total - (literal_total(quotient) + literal_total(kernel) + literal_total(remainder))
+        if gain > best_gain:
+            best, best_gain = kernel, gain
+    return best
+
+
+def _or(children):
+    flat = []
+    for child in children:
+        if child == TRUE_NODE:
+            return TRUE_NODE
+        flat.extend(child[1] if child[0] == "or" else [child])
+    return flat[0] if len(flat) == 1 else ("or", flat)
+
+
+def _and(children):
+    flat = []
+    for child in children:
+        if child == TRUE_NODE:
+            continue
+        flat.extend(child[1] if child[0] == "and" else [child])
+    if not flat:
+        return TRUE_NODE
+    return flat[0] if len(flat) == 1 else ("and", flat)
+
+
+def _cube_node(cube):
+    return _and([("lit", lit) for lit in sorted(cube)])
+
+
+def _sop_node(cubes):
+    return _or([_cube_node(c) for c in cubes])
+
+
+def _literal_factor(cubes, cube):
+    # Faktorkan keluar literal paling sering dari cube, ditambah cube
+    # bersama hasil baginya: L·C·(Q') + R
+    counts = literal_counts(cubes)
+    lit = max(cube, key=lambda l: (counts.get(l, 0), -l))
+    quotient, remainder = divide(cubes, [frozenset([lit])])
+    common = common_cube(quotient)
+    inner = factor_cubes([q - common for q in quotient])
+    term = _and([("lit", l) for l in sorted(common | {lit})] + [inner])
+    return _or([term] + ([factor_cubes(remainder)] if remainder else []))
+
+
+def factor_cubes(cubes):
+    cubes = list(dict.fromkeys(cubes))
+    if frozenset() in cubes:
+        return TRUE_NODE
+    if len(cubes) <= 1:
+        return _sop_node(cubes)
+    counts = literal_counts(cubes)
+    if max(counts.values()) < 2 or len(cubes) > FACTOR_MAX_CUBES:
+        return _sop_node(cubes)
+
+    divisor = _best_kernel(cubes)
+    if divisor is None:
+        return _literal_factor(cubes, frozenset(counts))
+    quotient, _ = divide(cubes, divisor)
+    if len(quotient) == 1:
+        return _literal_factor(cubes, quotient[0])
+    quotient = make_cube_free(quotient)
+    divisor, remainder = divide(cubes, quotient)
+    if common_cube(divisor):
+        return _literal_factor(cubes, common_cube(divisor))
+    term = _and([factor_cubes(quotient), factor_cubes(divisor)])
+    return _or([term] + ([factor_cubes(remainder)] if remainder else []))
+
+
+def node_literals(node):
+    if node[0] == "lit":
+        return 1
+    if node[0] == "true":
+        return 0
+    return sum(node_literals(child) for child in node[1])
+
+
+def render_node(node, variables, top=True):
+    # Gaya final_expression Q-M: A∧¬B ∨ C; OR di dalam AND diberi kurung
+    kind = node[0]
+    if kind == "true":
+        return "⊤"
+    if kind == "lit":
+        lit = node[1]
+        return ("¬" if lit & 1 else "") + variables[lit >> 1]
+    if kind == "and":
+        return "∧".join(render_node(child, variables, False) for child in node[1])
+    text = " ∨ ".join(render_node(child, variables, False) for child in node[1])
+    return text if top else f"({text})"
+
+
+def render_pos(off_cover, variables):
+    # Cube off-set → klausa OR (De Morgan): bit 1 → ¬X, bit 0 → X
+    num_vars = len(variables)
+    clauses = []
+    for cube in cover_to_cubes(off_cover, num_vars):
+        literals = [("" if lit & 1 else "¬") + variables[lit >> 1] for lit in sorted(cube)]
+        text = " ∨ ".join(literals)
+        clauses.append(f"({text})" if len(literals) > 1 and len(off_cover) > 1 else text)
+    return " ∧ ".join(clauses)
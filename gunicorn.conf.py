@@ -0,0 +1,34 @@
+import multiprocessing
+import os
+
+# ===============================
+# KONFIGURASI GUNICORN (PRODUKSI)
+# ===============================
+# Jalankan: gunicorn -c gunicorn.conf.py app:app
+# Semua nilai bisa ditimpa lewat env tanpa mengubah file ini.
+bind = f"0.0.0.0:{os.environ.get('PORT', '10000')}"
+
+# Worker proses: satu simplify_logic yang lambat hanya menahan satu worker
+# (dan satu thread-nya), bukan seluruh situs. Default 2 × core + 1.
+workers = int(os.environ.get("WEB_CONCURRENCY", "0")) or multiprocessing.cpu_count() * 2 + 1
+threads = int(os.environ.get("SYMBOOL_THREADS", "4"))
+worker_class = "gthread" if threads > 1 else "sync"
+
+# Timeout harus di atas deadline budget terbesar (20 detik untuk Q-M/Espresso)
+# supaya worker tidak dibunuh sebelum budget sempat membalas budget_exceeded.
+timeout = int(os.environ.get("SYMBOOL_TIMEOUT", "60"))
+graceful_timeout = int(os.environ.get("SYMBOOL_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.environ.get("SYMBOOL_KEEPALIVE", "5"))
+
+# Worker didaur ulang berkala (dengan jitter) agar cache dan memori SymPy
+# tidak tumbuh tanpa batas.
+max_requests = int(os.environ.get("SYMBOOL_MAX_REQUESTS", "2000"))
+max_requests_jitter = int(os.environ.get("SYMBOOL_MAX_REQUESTS_JITTER", "200"))
+
+# app (termasuk optimizer dan warm-up) di-import sekali di master sebelum
+# fork, jadi setiap worker lahir dengan modul sudah termuat dan berbagi
+# memori copy-on-write.
+preload_app = os.environ.get("SYMBOOL_PRELOAD", "1") not in ("0", "false", "off")
+
+accesslog = os.environ.get("SYMBOOL_ACCESS_LOG", "-")
+errorlog = "-"
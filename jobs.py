@@ -0,0 +1,255 @@
+import json
+import multiprocessing
+import os
+import re
+import socket
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+# ===============================
+# ANTRIAN JOB OPTIMASI (ASYNC)
+# ===============================
+# State job disimpan sebagai satu file JSON per job di JOBS_DIR, bukan di
+# memori, karena gunicorn menjalankan beberapa proses worker: job yang
+# di-submit ke worker A harus bisa di-polling (atau di-stream lewat SSE)
+# dari worker B. Pekerjaan berjalan di proses anak (fork) yang menulis
+# progresnya sendiri ke file tersebut; thread pengawas di proses yang
+# menerima submit membatasi jumlah job paralel dan membunuh job yang
+# melewati deadline.
+JOBS_DIR = os.environ.get("SYMBOOL_JOBS_DIR") or os.path.join(tempfile.gettempdir(), "symbool-jobs")
+# Hasil job selesai disimpan selama JOB_TTL detik, maksimal JOB_MAX_STORED job
+JOB_TTL = int(os.environ.get("SYMBOOL_JOB_TTL", "900"))
+JOB_MAX_STORED = int(os.environ.get("SYMBOOL_JOB_MAX_STORED", "200"))
+JOB_WORKERS = int(os.environ.get("SYMBOOL_JOB_WORKERS", "2"))
+JOB_QUEUE_MAX = int(os.environ.get("SYMBOOL_JOB_QUEUE_MAX", "20"))
+JOB_DEADLINE = float(os.environ.get("SYMBOOL_JOB_DEADLINE", "300"))
+# Jarak minimum antar tulis progres (detik); awal/akhir tahap selalu ditulis
+PROGRESS_INTERVAL = 0.2
+# Job running yang melewati deadline + JOB_STALE_GRACE detik dianggap mati
+# (pengawasnya hilang, mis. worker gunicorn didaur ulang atau di host lain)
+JOB_STALE_GRACE = 30
+HOST = socket.gethostname()
+
+FINISHED_STATES = ("done", "failed")
+_job_id_re = re.compile(r"^[0-9a-f]{32}$")
+
+
+class QueueFull(Exception):
+    pass
+
+
+def pid_alive(pid):
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # Ada, tapi milik user lain
+        return True
+    return True
+
+
+class JobStore:
+    def __init__(self, directory=JOBS_DIR, ttl=JOB_TTL, max_stored=JOB_MAX_STORED):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_stored = max_stored
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, job_id):
+        return os.path.join(self.directory, f"{job_id}.json")
+
+    def create(self, request_data, deadline=None):
+        now = time.time()
+        job = {
+            "id": uuid.uuid4().hex,
+            "status": "queued",
+            "created": now,
+            "updated": now,
+            # Proses pengawas (worker yang menerima submit) dan proses
+            # pekerja; dipakai untuk mengenali job yang pengawasnya mati
+            "owner": {"host": HOST, "pid": os.getpid()},
+            "runner_pid": None,
+            "deadline": deadline,
+            "request": request_data,
+            "progress": {"stage": None, "detail": {}, "stages": {}},
+            "result": None,
+            "error": None
+        }
+        self.write(job)
+        return job
+
+    def write(self, job):
+        # Tulis ke file sementara lalu os.replace: pembaca di proses lain
+        # selalu melihat versi lama atau baru yang utuh, tidak pernah setengah.
+        job["updated"] = time.time()
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(job, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path(job["id"]))
+
+    def read(self, job_id):
+        if not _job_id_re.match(job_id or ""):
+            return None
+        try:
+            with open(self.path(job_id), encoding="utf-8") as f:
+                job = json.load(f)
+        except (OSError, ValueError):
+            return None
+        error = self.stale_error(job)
+        if error is not None:
+            job["status"] = "failed"
+            job["error"] = error
+            self.write(job)
+        return job
+
+    def stale_error(self, job):
+        # Pesan error kalau job belum selesai tapi tidak ada lagi yang
+        # mengerjakan/mengawasinya; None kalau job masih sah.
+        status = job["status"]
+        if status in FINISHED_STATES:
+            return None
+        deadline = job.get("deadline")
+        started = job.get("started")
+        if status == "running" and deadline and started and time.time() - started > deadline + JOB_STALE_GRACE:
+            return f"Job melewati batas waktu {deadline:g} detik."
+        owner = job.get("owner") or {}
+        if owner.get("host") != HOST or pid_alive(owner.get("pid")):
+            return None
+        # Pengawas mati: job antre tidak akan pernah dijalankan; job running
+        # hanya bisa selesai kalau proses pekerjanya masih hidup
+        if status == "running" and pid_alive(job.get("runner_pid")):
+            return None
+        return "Worker yang menjalankan job berhenti sebelum job selesai."
+
+    def update(self, job_id, **fields):
+        job = self.read(job_id)
+        if job is None:
+            return None
+        job.update(fields)
+        self.write(job)
+        return job
+
+    def purge(self):
+        # Buang job selesai yang kedaluwarsa, lalu yang tertua bila
+        # jumlah file melewati max_stored. Job aktif tidak pernah dibuang.
+        now = time.time()
+        finished = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            # read juga menandai job running/antre yang pengawasnya mati
+            job = self.read(name[:-5])
+            if job is None or job["status"] not in FINISHED_STATES:
+                continue
+            if now - job["updated"] > self.ttl:
+                self._remove(job["id"])
+            else:
+                finished.append((job["updated"], job["id"]))
+        finished.sort()
+        for _, job_id in finished[:max(0, len(finished) - self.max_stored)]:
+            self._remove(job_id)
+
+    def _remove(self, job_id):
+        try:
+            os.remove(self.path(job_id))
+        except OSError:
+            pass
+
+
+class ProgressWriter:
+    # Listener StageTimer di proses anak: merangkum progres ke field
+    # "progress" job dan menulisnya paling sering tiap PROGRESS_INTERVAL.
+    def __init__(self, store, job):
+        self.store = store
+        self.job = job
+        self.last_write = 0.0
+
+    def __call__(self, stage, info):
+        progress = self.job["progress"]
+        state = info.get("state")
+        if state == "start":
+            progress["stage"] = stage
+            progress["detail"] = {}
+        elif state == "done":
+            progress["stages"][stage] = info.get("ms", 0.0)
+        else:
+            progress["stage"] = stage
+            progress["detail"].update(info)
+        now = time.monotonic()
+        if state is not None or now - self.last_write >= PROGRESS_INTERVAL:
+            self.last_write = now
+            self.store.write(self.job)
+
+
+def _job_process(store, job_id, func, args):
+    job = store.read(job_id)
+    job["status"] = "running"
+    job["started"] = time.time()
+    job["runner_pid"] = os.getpid()
+    store.write(job)
+    try:
+        result, error = func(*args, progress=ProgressWriter(store, job))
+    except Exception as e:
+        result, error = None, f"{type(e).__name__}: {e}"
+    job["status"] = "failed" if error else "done"
+    job["result"] = result
+    job["error"] = error
+    store.write(job)
+
+
+class JobRunner:
+    # func(*args, progress=listener) -> (hasil, pesan error atau None);
+    # on_finish(job) dipanggil di proses induk setelah job selesai
+    # (mis. untuk mengisi cache hasil).
+    def __init__(self, store, func, workers=JOB_WORKERS, queue_max=JOB_QUEUE_MAX,
+                 deadline=JOB_DEADLINE, on_finish=None):
+        self.store = store
+        self.func = func
+        self.queue_max = queue_max
+        self.deadline = deadline
+        self.on_finish = on_finish
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="symbool-job")
+        self._active = 0
+        self._lock = threading.Lock()
+
+    def submit(self, request_data, args):
+        with self._lock:
+            if self._active >= self.queue_max:
+                raise QueueFull(f"Antrian job penuh (maksimal {self.queue_max}).")
+            self._active += 1
+        self.store.purge()
+        job = self.store.create(request_data, deadline=self.deadline)
+        self._executor.submit(self._supervise, job["id"], args)
+        return job
+
+    def _supervise(self, job_id, args):
+        try:
+            ctx = multiprocessing.get_context(
+                "fork" if "fork" in multiprocessing.get_all_start_methods() else None
+            )
+            proc = ctx.Process(target=_job_process, args=(self.store, job_id, self.func, args), daemon=True)
+            proc.start()
+            proc.join(self.deadline)
+            if proc.is_alive():
+                proc.terminate()
+                proc.join()
+                job = self.store.update(
+                    job_id, status="failed",
+                    error=f"Job melewati batas waktu {self.deadline:g} detik."
+                )
+            else:
+                job = self.store.read(job_id)
+                if job is not None and job["status"] not in FINISHED_STATES:
+                    job = self.store.update(job_id, status="failed", error="Worker job berhenti tanpa hasil.")
+            if job is not None and job["status"] == "done" and self.on_finish is not None:
+                self.on_finish(job)
+        finally:
+            with self._lock:
+                self._active -= 1
+
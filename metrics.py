@@ -0,0 +1,302 @@
+import fcntl
+import json
+import os
+import tempfile
+import threading
+import uuid
+
+
+# ===============================
+# METRIK FORMAT TEKS PROMETHEUS
+# ===============================
+# Cukup counter dan histogram berlabel; tanpa dependensi prometheus_client.
+# Setiap proses worker gunicorn menyimpan snapshot registry-nya di
+# METRICS_DIR (satu file per proses, seperti JobStore) dan /metrics
+# menjumlahkan semuanya, jadi counter tidak melompat mundur tergantung
+# worker mana yang menjawab. Snapshot worker yang sudah mati dilipat ke
+# retired.json sehingga jumlahnya tetap naik setelah worker didaur ulang.
+METRICS_DIR = os.environ.get("SYMBOOL_METRICS_DIR") or os.path.join(tempfile.gettempdir(), "symbool-metrics")
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (
+        (k, str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'))
+        for k, v in pairs
+    )
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def snapshot(self):
+        with self._lock:
+            return [[list(labels), value] for labels, value in self._values.items()]
+
+    @staticmethod
+    def merge(total, items):
+        for labels, value in items:
+            labels = tuple(labels)
+            total[labels] = total.get(labels, 0) + value
+
+    def render(self, values=None):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        if values is None:
+            with self._lock:
+                values = dict(self._values)
+        for labels, value in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [hitungan per bucket (non-kumulatif), jumlah, total]
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [[0] * len(self.buckets), 0, 0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += 1
+            state[2] += value
+
+    def snapshot(self):
+        with self._lock:
+            return [[list(labels), [list(s[0]), s[1], s[2]]] for labels, s in self._values.items()]
+
+    @staticmethod
+    def merge(total, items):
+        for labels, (counts, count, value_sum) in items:
+            labels = tuple(labels)
+            state = total.get(labels)
+            if state is None:
+                total[labels] = [list(counts), count, value_sum]
+                continue
+            state[0] = [a + b for a, b in zip(state[0], counts)]
+            state[1] += count
+            state[2] += value_sum
+
+    def render(self, values=None):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        if values is None:
+            with self._lock:
+                values = {labels: [list(s[0]), s[1], s[2]] for labels, s in self._values.items()}
+        for labels, (counts, count, total) in sorted(values.items()):
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                le = _format_labels(self.labelnames, labels, [("le", _format_value(float(bound)))])
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            le = _format_labels(self.labelnames, labels, [("le", "+Inf")])
+            lines.append(f"{self.name}_bucket{le} {count}")
+            label_str = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_str} {_format_value(total)}")
+            lines.append(f"{self.name}_count{label_str} {count}")
+        return lines
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+class Registry:
+    def __init__(self, directory=METRICS_DIR):
+        self.metrics = []
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._pid = None
+        self._token = None
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def counter(self, *args, **kwargs):
+        metric = Counter(*args, **kwargs)
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(self, *args, **kwargs):
+        metric = Histogram(*args, **kwargs)
+        self.metrics.append(metric)
+        return metric
+
+    def _path(self):
+        # Nama file memuat PID (untuk cek worker hidup) dan token unik per
+        # proses, supaya PID yang dipakai ulang tidak menimpa snapshot lama
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._token = uuid.uuid4().hex[:8]
+        return os.path.join(self.directory, f"{self._pid}-{self._token}.json")
+
+    def flush(self):
+        # Tulis snapshot proses ini (tmp + os.replace, seperti JobStore.write)
+        if not self.directory:
+            return
+        with self._lock:
+            snapshot = {metric.name: metric.snapshot() for metric in self.metrics}
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, self._path())
+
+    def _read(self, path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def collect(self):
+        # Jumlahkan snapshot semua proses; file milik proses yang sudah mati
+        # dilipat ke retired.json di bawah flock agar tidak terhitung dua kali
+        totals = {metric.name: {} for metric in self.metrics}
+        kinds = {metric.name: type(metric) for metric in self.metrics}
+        retired_path = os.path.join(self.directory, "retired.json")
+        with open(os.path.join(self.directory, ".lock"), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                retired = self._read(retired_path)
+                dead = []
+                snapshots = []
+                for name in os.listdir(self.directory):
+                    if not name.endswith(".json") or name == "retired.json":
+                        continue
+                    path = os.path.join(self.directory, name)
+                    try:
+                        pid = int(name.split("-", 1)[0])
+                    except ValueError:
+                        continue
+                    if _pid_alive(pid):
+                        snapshots.append(self._read(path))
+                    else:
+                        dead.append((path, self._read(path)))
+                if dead:
+                    merged = {}
+                    for snapshot in [retired] + [snap for _, snap in dead]:
+                        for name, items in snapshot.items():
+                            if name in kinds:
+                                kinds[name].merge(merged.setdefault(name, {}), items)
+                    retired = {name: [[list(k), v] for k, v in values.items()] for name, values in merged.items()}
+                    fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+                    with os.fdopen(fd, "w", encoding="utf-8") as f:
+                        json.dump(retired, f)
+                    os.replace(tmp_path, retired_path)
+                    for path, _ in dead:
+                        os.remove(path)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+        for snapshot in [retired] + snapshots:
+            for name, items in snapshot.items():
+                if name in kinds:
+                    kinds[name].merge(totals[name], items)
+        return totals
+
+    def render(self, extra_lines=()):
+        lines = []
+        if self.directory:
+            self.flush()
+            totals = self.collect()
+            for metric in self.metrics:
+                lines.extend(metric.render(totals[metric.name]))
+        else:
+            for metric in self.metrics:
+                lines.extend(metric.render())
+        lines.extend(extra_lines)
+        return "\n".join(lines) + "\n"
+
+
+# ===============================
+# METRIK OPTIMASI
+# ===============================
+registry = Registry()
+
+optimize_requests = registry.counter(
+    "symbool_optimize_requests_total",
+    "Jumlah permintaan optimasi per metode, jumlah variabel dan hasil.",
+    ("method", "variables", "outcome")
+)
+optimize_latency = registry.histogram(
+    "symbool_optimize_duration_seconds",
+    "Latensi total optimasi per metode dan jumlah variabel.",
+    ("method", "variables")
+)
+stage_latency = registry.histogram(
+    "symbool_stage_duration_seconds",
+    "Latensi per tahap optimize_logic (parse, simplify, truth_table, kmap, qm_*, trace).",
+    ("method", "stage")
+)
+
+
+# Label method dibatasi supaya jumlah seri tidak tumbuh dari input bebas
+METRIC_METHODS = ("default", "simplify", "kmap", "qm", "espresso", "multi")
+
+
+def observe_optimize(method, num_vars, duration, outcome="ok", timings=None):
+    # duration dalam detik; timings dalam milidetik (format field response)
+    method = method if method in METRIC_METHODS else "other"
+    optimize_requests.inc(method, str(num_vars), outcome)
+    optimize_latency.observe(duration, method, str(num_vars))
+    for stage, ms in (timings or {}).items():
+        stage_latency.observe(ms / 1000.0, method, stage)
+    registry.flush()
+
+
+def cache_metric_lines(stats):
+    # Cache hidup di memori tiap worker: seri diberi label worker (PID),
+    # bukan dijumlahkan seperti registry
+    worker = _format_labels(("worker",), (os.getpid(),))
+    lines = []
+    for field, kind in (("hits", "counter"), ("misses", "counter"), ("evictions", "counter"),
+                        ("expirations", "counter"), ("size", "gauge"), ("maxsize", "gauge")):
+        if field not in stats:
+            continue
+        name = f"symbool_cache_{field}" + ("_total" if kind == "counter" else "")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.append(f"{name}{worker} {stats[field]}")
+    return lines
+
+
+def startup_metric_lines(startup):
+    # Gauge waktu bangun (detik) per fase: import, warmup, total; per worker
+    name = "symbool_startup_seconds"
+    lines = [f"# TYPE {name} gauge"]
+    for phase in ("import", "warmup", "total"):
+        if phase in startup:
+            labels = _format_labels(("phase", "worker"), (phase, os.getpid()))
+            lines.append(f"{name}{labels} {_format_value(float(startup[phase]))}")
+    return lines
@@ -1,177 +1,593 @@
-from sympy import symbols, simplify_logic, true, false
-from sympy.parsing.sympy_parser import (
-    parse_expr,
-    standard_transformations,
-    implicit_multiplication_application
+from boolexpr import (
+    NodeTable, parse_boolean, expression_variables, topological_nodes, to_sympy,
+    compile_columns, evaluate_columns
 )
-from sympy.logic.boolalg import truth_table
-from concurrent.futures import ThreadPoolExecutor
-from sympy.logic.boolalg import SOPform
-from sympy import Symbol
+from bdd import BDD, BDDNodeLimit, order_variables, compare_expressions, TRUE as BDD_TRUE, FALSE as BDD_FALSE
+from sop_table import get_sop_table, SOP_TABLE_MAX_VARS
+from espresso import espresso, expression_cover, minterm_cover, cover_cost, complement
+from factor import cover_to_cubes, factor_cubes, node_literals, render_node, render_pos, FACTOR_MAX_CUBES
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
+import heapq
+import json
+import multiprocessing
+import os
 import re
+import threading
+import time
 
 # ===============================
-# SIMBOL BOOLEAN A-Z
+# SIMBOL BOOLEAN A-Z (SYMPY LAZY)
 # ===============================
-var_symbols = symbols('A:Z')
-locals_dict = {str(s): s for s in var_symbols}
-transformations = standard_transformations + (implicit_multiplication_application,)
+# Import sympy (~0.5 s) ditunda sampai metode yang butuh (simplify,
+# SOPform) dipanggil pertama kali; jalur parse, K-Map, Q-M, Espresso
+# dan ROBDD tidak pernah menyentuhnya.
+@lru_cache(maxsize=None)
+def sympy_symbols():
+    from sympy import symbols
+    return {str(s): s for s in symbols('A:Z')}
+
+
+# Metode yang tidak pernah butuh sympy
+SYMPY_FREE_METHODS = ("kmap", "qm", "espresso")
+# Metode yang diterima dari request ("default" = simplify dari UI)
+OPTIMIZE_METHODS = ("default", "simplify") + SYMPY_FREE_METHODS
+
+
+def check_method(method):
+    if method not in OPTIMIZE_METHODS:
+        raise ValueError(f"Metode tidak dikenal: {method!r}. Pilih salah satu dari {', '.join(OPTIMIZE_METHODS)}.")
+    return method
 
 # ===============================
-# MAPPING SIMBOL UI → PYTHON
+# BATAS METODE
 # ===============================
-symbol_map = {
-    "¬": "~",
-    "∧": "&",
-    "∨": "|",
-    "⊕": "^",
-    "→": ">>",
-    "↔": "<<>>",
-    "↑": "↑",
-    "↓": "↓",
-    "⊤": "True",
-    "⊥": "False"
-}
+KMAP_MAX_VARS = 6
+QM_MAX_VARS = 16
+# Tabel langkah Q-M (chart per minterm) hanya dirender sampai batas ini
+QM_STEPS_MAX_VARS = 8
+ESPRESSO_MAX_VARS = 26
+# Di atas batas ini metode Espresso tidak membangun tabel kebenaran
+ESPRESSO_TABLE_MAX_VARS = 12
+# Bentuk POS: off-set diminimalkan eksak (Q-M) sampai POS_EXACT_MAX_VARS,
+# di atasnya lewat komplemen cover + Espresso (mahal untuk fungsi lebar,
+# jadi dibatasi POS_MAX_VARS). Cover SOP maupun off-set di atas
+# FACTOR_MAX_CUBES cube dilewati (mis. parity: 2^(n-1) cube).
+POS_MAX_VARS = 12
+POS_EXACT_MAX_VARS = 8
 
 # ===============================
 # VALIDASI INPUT
 # ===============================
+_allowed_re = re.compile(r"^[A-Z¬~!'∧&*·∨|+⊕^→↔↑↓⊤⊥()\s]*$")
+
+
 def validate_expression(expr_str):
     expr_str = expr_str.upper()
-    allowed_pattern = r'^[A-Z¬∧∨⊕→↔↑↓⊤⊥()\s]*$'
-    return re.match(allowed_pattern, expr_str) is not None
+    return _allowed_re.match(expr_str) is not None
 
 # ===============================
-# GANTI SIMBOL KE PYTHONIC
+# FORMAT SIMBOL PYTHON → UI
 # ===============================
-def replace_symbols(expr_str):
-    expr_str = expr_str.upper()
-    for sym, rep in symbol_map.items():
-        expr_str = expr_str.replace(sym, rep)
-    expr_str = re.sub(r'([A-Z])\s*<<>>\s*([A-Z])', r'((\1 & \2) | (~\1 & ~\2))', expr_str)
-    expr_str = re.sub(r'([A-Z])\s*\^\s*([A-Z])', r'((\1 & ~\2) | (~\1 & \2))', expr_str)
-    expr_str = re.sub(r'([A-Z])\s*↑\s*([A-Z])', r'~(\1 & \2)', expr_str)
-    expr_str = re.sub(r'([A-Z])\s*↓\s*([A-Z])', r'~(\1 | \2)', expr_str)
-    return expr_str
+def format_ui_symbols(s):
+    return s.replace("&", "∧").replace("|", "∨").replace("~", "¬").replace("^", "⊕").replace("True", "⊤").replace("False", "⊥")
+
 
 # ===============================
-# FORMAT SIMBOL PYTHON → UI
+# TIMER PER TAHAP
 # ===============================
-def format_ui_symbols(s):
-    return s.replace("&", "∧").replace("|", "∨").replace("~", "¬").replace("True", "⊤").replace("False", "⊥")
+# Mengumpulkan durasi tiap tahap (milidetik) untuk field "timings"
+# dan histogram /metrics. Listener opsional (dipakai job async) menerima
+# listener(tahap, info) saat tahap mulai/selesai dan dari report() di
+# dalam loop panjang (iterasi Q-M, pencarian cover).
+class StageTimer:
+    def __init__(self, listener=None):
+        self.stages = {}
+        self.listener = listener
+
+    def report(self, name, **info):
+        if self.listener is not None:
+            self.listener(name, info)
+
+    @contextmanager
+    def stage(self, name):
+        self.report(name, state="start")
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.stages[name] = round(self.stages.get(name, 0.0) + elapsed, 3)
+            self.report(name, state="done", ms=round(elapsed, 3))
+
+
+# ===============================
+# EKSPRESI TER-PARSE (SEKALI PER REQUEST)
+# ===============================
+# Satu objek dibagi ke simplify, tabel kebenaran, K-Map, Q-M dan trace,
+# supaya string yang sama tidak di-parse dan dievaluasi berulang kali.
+# Parsing memakai boolexpr (AST ringan); objek SymPy baru dibuat saat
+# jalur simplify memintanya lewat .expr.
+class ParsedExpression:
+    def __init__(self, expr_str, session=None):
+        self.source = expr_str
+        # Dengan sesi live, parse memakai NodeTable sesi dan kolom tabel
+        # kebenaran diambil dari cache per node milik sesi
+        self.session = session
+        self.tree = parse_boolean(expr_str, None if session is None else session.table)
+        self.variables = expression_variables(self.tree)
+        self._expr = None
+        self._bdd = None
+        self._truth_table = None
+
+    @property
+    def expr(self):
+        if self._expr is None:
+            self._expr = to_sympy(self.tree, sympy_symbols())
+        return self._expr
+
+    @property
+    def bdd(self):
+        # (manager, root) ROBDD; untuk tautologi/kontradiksi dan hitung
+        # minterm tanpa enumerasi 2^n baris
+        if self._bdd is None:
+            manager = BDD(order_variables(self.tree))
+            self._bdd = (manager, manager.build(self.tree))
+        return self._bdd
+
+    @property
+    def minterm_count(self):
+        if self._truth_table is not None:
+            return self._truth_table.count()
+        manager, root = self.bdd
+        return manager.sat_count(root)
+
+    @property
+    def truth_table(self):
+        if self._truth_table is None:
+            if self.session is not None:
+                output = self.session.truth_column(self.tree, self.variables)
+            else:
+                output = evaluate_truth_column(self.tree, self.variables)
+            self._truth_table = TruthTable(self.variables, output)
+        return self._truth_table
+
+    @property
+    def minterms(self):
+        return self.truth_table.minterms()
+
+
+def parse_expression(expr):
+    if isinstance(expr, ParsedExpression):
+        return expr
+    return ParsedExpression(expr)
 
 
 # ===============================
 # PENYEDERHANAAN BOOLEAN
 # ===============================
 def simplify_boolean(expr_str, method="dnf"):
-    if not validate_expression(expr_str):
+    source = expr_str.source if isinstance(expr_str, ParsedExpression) else expr_str
+    if not validate_expression(source):
         return "–", "Input mengandung karakter tidak valid."
 
-    expr_clean = replace_symbols(expr_str)
-    expr = parse_expr(expr_clean, transformations=transformations, local_dict=locals_dict, evaluate=True)
-    num_vars = len(expr.free_symbols)
+    parsed = parse_expression(expr_str)
+    num_vars = len(parsed.variables)
 
-    if method == "kmap" and num_vars > 4:
-        return "–", "Metode Karnaugh Map hanya mendukung maksimal 4 variabel."
-    if method == "qm" and num_vars > 8:
-        return "–", "Metode Quine-McCluskey hanya praktis sampai 8 variabel."
+    if method == "kmap" and num_vars > KMAP_MAX_VARS:
+        return "–", f"Metode Karnaugh Map hanya mendukung maksimal {KMAP_MAX_VARS} variabel."
+    if method == "qm" and num_vars > QM_MAX_VARS:
+        return "–", f"Metode Quine-McCluskey hanya praktis sampai {QM_MAX_VARS} variabel."
 
     if method == "qm":
         # ⏩ Abaikan simpifier default kalau Q-M,
         # biar hitung Q-M manual di optimize_logic.
         return "–", "Menggunakan metode Quine-McCluskey manual."
-
+    if method == "espresso":
+        if num_vars > ESPRESSO_MAX_VARS:
+            return "–", f"Metode Espresso hanya mendukung maksimal {ESPRESSO_MAX_VARS} variabel."
+        return "–", "Menggunakan metode heuristik Espresso."
+    if method == "kmap":
+        # K-Map cukup tabel kebenaran: bentuk minimal diambil dari Q-M
+        # (eksak untuk ≤ 4 variabel) tanpa membangun objek SymPy, tetap
+        # dicetak dalam format simplify_logic: string tabel SOP untuk
+        # ≤ 4 variabel, selebihnya cover K-Map dengan urutan SymPy.
+        table = parsed.truth_table
+        if table.output == 0:
+            return "⊥", "Ekspresi selalu salah (kontradiksi)."
+        if table.count() == table.size:
+            return "⊤", "Ekspresi selalu benar (tautologi)."
+        if num_vars <= SOP_TABLE_MAX_VARS:
+            sop = lookup_minimal_sop(parsed.variables, table.output)
+            if sop is not None:
+                return render_dnf_terms(sop["terms"], parsed.variables), "Ekspresi dapat bernilai True pada kondisi tertentu."
+        cover = kmap_cover(num_vars, table.output)
+        return render_sympy_cover(cover, parsed.variables), "Ekspresi dapat bernilai True pada kondisi tertentu."
+
+    # Tautologi/kontradiksi diputuskan ROBDD lebih dulu (root terminal),
+    # sehingga simplify_logic hanya dipanggil untuk fungsi yang tidak konstan.
+    _, root = parsed.bdd
+    if root == BDD_TRUE:
+        return "⊤", "Ekspresi selalu benar (tautologi)."
+    if root == BDD_FALSE:
+        return "⊥", "Ekspresi selalu salah (kontradiksi)."
+    if len(parsed.variables) <= SOP_TABLE_MAX_VARS:
+        # Hasil simplify_logic untuk fungsi kecil sudah ada di tabel
+        sop = lookup_minimal_sop(parsed.variables, parsed.truth_table.output)
+        if sop is not None:
+            return render_dnf_terms(sop["terms"], parsed.variables), "Ekspresi dapat bernilai True pada kondisi tertentu."
+
+    from sympy import simplify_logic
+    expr = parsed.expr
     try:
         simplified = simplify_logic(expr, form="dnf")
     except Exception:
         simplified = simplify_logic(expr, form="dnf")
+    return format_ui_symbols(str(simplified)), "Ekspresi dapat bernilai True pada kondisi tertentu."
 
-    if simplified != true and simplified != false:
-        tt = list(truth_table(expr, expr.free_symbols))
-        only_false = all([not v for _, v in tt])
-        only_true = all([v for _, v in tt])
-        if only_false:
-            simplified = false
-        elif only_true:
-            simplified = true
-
-    if simplified == true:
-        explanation = "Ekspresi selalu benar (tautologi)."
-    elif simplified == false:
-        explanation = "Ekspresi selalu salah (kontradiksi)."
-    else:
-        explanation = "Ekspresi dapat bernilai True pada kondisi tertentu."
 
-    return format_ui_symbols(str(simplified)), explanation
+# ===============================
+# EKUIVALENSI (ROBDD)
+# ===============================
+def check_equivalence(left, right, max_nodes=None):
+    # Untuk penilaian: apakah dua ekspresi sama tanpa enumerasi 2^n baris.
+    # ValueError (termasuk ExpressionError) berisi pesan untuk pengguna;
+    # BDDNodeLimit bila ROBDD melewati max_nodes.
+    left = parse_expression(left)
+    right = parse_expression(right)
+    result = compare_expressions(left.tree, right.tree, max_nodes)
+    if result["counterexample"] is not None:
+        result["counterexample"] = {
+            v: int(result["counterexample"][v]) for v in result["variables"]
+        }
+    return result
 
 
 # ===============================
-# TABEL KEBENARAN
+# MESIN TABEL KEBENARAN BIT-PARALEL
 # ===============================
-def generate_truth_table(expr_str):
-    expr_clean = replace_symbols(expr_str)
-    expr = parse_expr(expr_clean, transformations=transformations, local_dict=locals_dict, evaluate=True)
-    vars_used = sorted(expr.free_symbols, key=lambda x: x.name)
-    vars_used = [str(v) for v in vars_used]  # ⏩ PASTIKAN str
+# Satu kolom tabel kebenaran disimpan sebagai satu integer Python:
+# bit ke-r = nilai pada baris ke-r (urutan baris sama dengan truth_table
+# SymPy, variabel pertama = bit paling signifikan). Operasi &, |, ^, ~
+# pada integer ini mengevaluasi semua baris sekaligus.
+def variable_columns(num_vars):
+    size = 1 << num_vars
+    full = (1 << size) - 1
+    columns = []
+    for i in range(num_vars):
+        half = 1 << (num_vars - 1 - i)
+        period = half << 1
+        block = ((1 << half) - 1) << half
+        columns.append(block * (full // ((1 << period) - 1)))
+    return columns, full
+
+
+class TruthTable:
+    # Kolom output ter-pack + view baris (inputs_dict, bool) yang dibangun lazy
+    # untuk pemanggil lama yang masih butuh format per-baris.
+    def __init__(self, variables, output):
+        self.variables = [str(v) for v in variables]
+        self.output = output
+        self.size = 1 << len(self.variables)
+        self._bits = None
+        self._minterms = None
+        self._rows = None
+
+    def __len__(self):
+        return self.size
+
+    def __bool__(self):
+        return self.size > 0
+
+    def bits(self):
+        # String '0'/'1' per baris (baris 0 di depan)
+        if self._bits is None:
+            self._bits = format(self.output, f"0{self.size}b")[::-1]
+        return self._bits
+
+    def value(self, idx):
+        return (self.output >> idx) & 1 == 1
+
+    def minterms(self):
+        if self._minterms is None:
+            bits = self.bits()
+            result = []
+            idx = bits.find("1")
+            while idx != -1:
+                result.append(idx)
+                idx = bits.find("1", idx + 1)
+            self._minterms = result
+        return self._minterms
+
+    def count(self):
+        return self.bits().count("1")
+
+    def row(self, idx):
+        num_vars = len(self.variables)
+        inputs = {
+            v: (idx >> (num_vars - 1 - i)) & 1 == 1
+            for i, v in enumerate(self.variables)
+        }
+        return inputs, self.value(idx)
 
-    def eval_row(row_input):
-        input_dict = dict(zip(vars_used, row_input))
-        result = expr.subs(input_dict)
-        return {str(k): bool(v) for k, v in input_dict.items()}, bool(result)
+    @property
+    def rows(self):
+        if self._rows is None:
+            self._rows = [self.row(i) for i in range(self.size)]
+        return self._rows
 
-    table = []
-    with ThreadPoolExecutor() as executor:
-        futures = [executor.submit(eval_row, row_input) for row_input, _ in truth_table(expr, vars_used)]
-        for f in futures:
-            table.append(f.result())
+    def __iter__(self):
+        if self._rows is not None:
+            return iter(self._rows)
+        return (self.row(i) for i in range(self.size))
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self.row(i) for i in range(*idx.indices(self.size))]
+        if idx < 0:
+            idx += self.size
+        if not 0 <= idx < self.size:
+            raise IndexError("baris di luar tabel")
+        return self.row(idx)
+
+
+def evaluate_truth_column(tree, variables):
+    columns, full = variable_columns(len(variables))
+    return compile_columns(tree, variables)(columns, full)
+
+
+# ===============================
+# TABEL KEBENARAN RINGKAS
+# ===============================
+# Field "table" lama (list ({var: bool}, bool)) hanya diisi sampai
+# TABLE_ROWS_MAX_VARS. Selebihnya klien memakai "truth_table": header
+# variabel + bitstring output (karakter ke-r = baris r), dan untuk tabel
+# besar bitstring diambil per halaman lewat /truth-table.
+TABLE_ROWS_MAX_VARS = 8
+TABLE_INLINE_MAX_VARS = 12
+TRUTH_TABLE_MAX_VARS = 20
+TRUTH_TABLE_PAGE_MAX = 4096
+
+
+def legacy_table_rows(table):
+    if isinstance(table, TruthTable):
+        return table.rows if len(table.variables) <= TABLE_ROWS_MAX_VARS else []
+    return table
+
+
+def compact_truth_table(table):
+    if not isinstance(table, TruthTable) or not table:
+        return None
+    return {
+        "variables": table.variables,
+        "rows": table.size,
+        "minterm_count": table.count(),
+        "output": table.bits() if len(table.variables) <= TABLE_INLINE_MAX_VARS else None
+    }
 
-    return vars_used, table  # ⏩ PASTI str
+
+def truth_table_page(table, offset=0, limit=256):
+    try:
+        offset, limit = int(offset), int(limit)
+    except (TypeError, ValueError):
+        raise ValueError("offset dan limit harus berupa bilangan bulat.")
+    offset = min(max(0, offset), table.size)
+    limit = min(max(1, limit), TRUTH_TABLE_PAGE_MAX)
+    count = min(limit, table.size - offset)
+    chunk = (table.output >> offset) & ((1 << count) - 1)
+    return {
+        "variables": table.variables,
+        "rows": table.size,
+        "offset": offset,
+        "limit": count,
+        "output": format(chunk, f"0{count}b")[::-1] if count else ""
+    }
+
+
+def truth_table_for(expression=None, minterms=None, num_vars=None):
+    # Tabel untuk /truth-table: dari ekspresi atau daftar minterm.
+    # ValueError berisi pesan untuk pengguna.
+    if minterms is not None:
+        on, _, num_vars = normalize_minterm_input(minterms, (), num_vars, "truth_table")
+        variables = [chr(ord("A") + i) for i in range(num_vars)]
+        return truth_table_from_minterms(variables, on)
+
+    return _expression_truth_table(str(expression or "").strip())
+
+
+def parse_for_table(expression):
+    expression = str(expression or "").strip()
+    if not expression:
+        raise ValueError("Ekspresi kosong.")
+    if not validate_expression(expression):
+        raise ValueError("Input mengandung karakter tidak valid.")
+    # ExpressionError (turunan ValueError) membawa posisi kesalahan
+    parsed = ParsedExpression(expression)
+    if len(parsed.variables) > TRUTH_TABLE_MAX_VARS:
+        raise ValueError(f"Tabel kebenaran hanya tersedia sampai {TRUTH_TABLE_MAX_VARS} variabel.")
+    return parsed
+
+
+@lru_cache(maxsize=32)
+def _expression_truth_table(expression):
+    # Halaman berikutnya dari ekspresi yang sama tidak perlu parse ulang
+    return parse_for_table(expression).truth_table
+
+
+# ===============================
+# EKSPOR TABEL KEBENARAN (STREAMING)
+# ===============================
+# Tabel dievaluasi per blok 2^EXPORT_CHUNK_VARS baris: variabel bawah
+# memakai kolom blok, variabel atas bernilai konstan per blok. Memori
+# tetap sebesar satu blok berapa pun jumlah barisnya.
+EXPORT_CHUNK_VARS = 12
+
+
+def iter_truth_chunks(source):
+    # source: ParsedExpression atau TruthTable.
+    # Yield (offset, jumlah baris, kolom output blok).
+    if isinstance(source, TruthTable):
+        step = 1 << EXPORT_CHUNK_VARS
+        for offset in range(0, source.size, step):
+            count = min(step, source.size - offset)
+            yield offset, count, (source.output >> offset) & ((1 << count) - 1)
+        return
+
+    num_vars = len(source.variables)
+    low = min(num_vars, EXPORT_CHUNK_VARS)
+    high = num_vars - low
+    evaluate = compile_columns(source.tree, source.variables)
+
+    low_columns, full = variable_columns(low)
+    for block in range(1 << high):
+        columns = [
+            full if (block >> (high - 1 - i)) & 1 else 0
+            for i in range(high)
+        ] + low_columns
+        yield block << low, 1 << low, evaluate(columns, full)
+
+
+def stream_truth_table(source, fmt="csv"):
+    variables = source.variables
+    num_vars = len(variables)
+    low = min(num_vars, EXPORT_CHUNK_VARS)
+    high = num_vars - low
+
+    if fmt == "ndjson":
+        low_parts = [
+            "".join(f'"{v}": {b}, ' for v, b in zip(variables[high:], format(j, f"0{low}b") if low else ""))
+            for j in range(1 << low)
+        ]
+    else:
+        yield ",".join(variables + ["Hasil"]) + "\n"
+        low_parts = [",".join(format(j, f"0{low}b")) + "," if low else "" for j in range(1 << low)]
+
+    for offset, count, column in iter_truth_chunks(source):
+        block = offset >> low
+        high_bits = format(block, f"0{high}b") if high else ""
+        bits = format(column, f"0{count}b")[::-1]
+        if fmt == "ndjson":
+            prefix = "{" + "".join(f'"{v}": {b}, ' for v, b in zip(variables, high_bits))
+            yield "".join(
+                f'{prefix}{low_parts[j]}"output": {bits[j]}}}\n' for j in range(count)
+            )
+        else:
+            prefix = "".join(b + "," for b in high_bits)
+            yield "".join(f"{prefix}{low_parts[j]}{bits[j]}\n" for j in range(count))
+
+
+# ===============================
+# TABEL KEBENARAN
+# ===============================
+def generate_truth_table(expr_str):
+    parsed = parse_expression(expr_str)
+    return parsed.variables, parsed.truth_table  # ⏩ PASTI str
 
 
 # ===============================
 # K-MAP GENERATOR
 # ===============================
-def generate_kmap(variables, truth_table_data):
-    # ⏩ Pastikan semua str
+def gray_code(n):
+    return n ^ (n >> 1)
+
+
+def inverse_gray_code(g):
+    # Posisi kolom/baris K-Map yang berlabel Gray g
+    n = 0
+    while g:
+        n ^= g
+        g >>= 1
+    return n
+
+
+def generate_kmap(variables, truth_table_data, dont_cares=(), cover=None):
+    # Label sumbu = kode Gray posisi; isi grid diambil lewat permutasi
+    # indeks dari bitstring output (tanpa membangun string per baris).
+    # 5–6 variabel memakai layout mirror: sumbu 3 bit dipantulkan di
+    # tengah (mirror_rows/mirror_cols), sel simetris terhadap garis itu
+    # juga bertetangga. cover = list (value, mask) → groups berisi sel
+    # [baris, kolom] tiap implicant, termasuk yang melingkar di tepi.
     variables = [str(v) for v in variables]
     num_vars = len(variables)
-    if num_vars < 2 or num_vars > 4:
+    if num_vars < 2 or num_vars > KMAP_MAX_VARS:
         return None
 
-    def gray_code(n):
-        return n ^ (n >> 1)
-
     row_bits = num_vars // 2
     col_bits = num_vars - row_bits
+    col_mask = (1 << col_bits) - 1
 
     row_vars = variables[:row_bits]
     col_vars = variables[row_bits:]
 
-    row_labels = [format(gray_code(i), f'0{row_bits}b') for i in range(2 ** row_bits)]
-    col_labels = [format(gray_code(i), f'0{col_bits}b') for i in range(2 ** col_bits)]
+    row_codes = [gray_code(i) for i in range(1 << row_bits)]
+    col_codes = [gray_code(i) for i in range(1 << col_bits)]
+    row_labels = [format(g, f'0{row_bits}b') for g in row_codes]
+    col_labels = [format(g, f'0{col_bits}b') for g in col_codes]
 
-    grid = [[0 for _ in col_labels] for _ in row_labels]
+    bits = truth_table_data.bits()
+    grid = [[int(bits[(r << col_bits) | c]) for c in col_codes] for r in row_codes]
 
-    for row in truth_table_data:
-        inputs, output = row
-        bits = ''.join(['1' if inputs[v] else '0' for v in variables])
-        row_idx = int(bits[:row_bits], 2)
-        col_idx = int(bits[row_bits:], 2)
-        grid[gray_code(row_idx)][gray_code(col_idx)] = int(output)
+    def cell(m):
+        return [inverse_gray_code(m >> col_bits), inverse_gray_code(m & col_mask)]
+
+    for m in dont_cares:
+        row_idx, col_idx = cell(int(m))
+        grid[row_idx][col_idx] = "X"
+
+    groups = []
+    for value, mask in cover or ():
+        binary = implicant_binary(value, mask, num_vars)
+        groups.append({
+            "term": "∧".join(implicant_expression(binary, variables)) or "⊤",
+            "implicant": binary,
+            "cells": sorted(cell(m) for m in implicant_minterms(value, mask))
+        })
 
     return {
         "rows": row_labels,
         "cols": col_labels,
         "grid": grid,
         "corner_label_row": ''.join(row_vars),
-        "corner_label_col": ''.join(col_vars)
+        "corner_label_col": ''.join(col_vars),
+        "mirror_rows": [1 << (row_bits - 1)] if row_bits > 2 else [],
+        "mirror_cols": [1 << (col_bits - 1)] if col_bits > 2 else [],
+        "groups": groups
     }
 
+
+@lru_cache(maxsize=256)
+def kmap_cover(num_vars, output):
+    # Cover minimal (value, mask) untuk K-Map, urutan sama dengan
+    # final_expression Q-M: dari tabel SOP (≤ 4 variabel) atau Q-M.
+    # Di-cache karena dipakai simplify_boolean dan optimize_logic.
+    size = 1 << num_vars
+    if output == 0:
+        return ()
+    if output == (1 << size) - 1:
+        return ((0, size - 1),)
+    variables = [chr(ord("A") + i) for i in range(num_vars)]
+    sop = lookup_minimal_sop(variables, output)
+    if sop is not None:
+        return tuple(sop["cover"])
+    qm_data = quine_mccluskey_process(
+        variables, TruthTable(variables, output).minterms(), include_steps=False
+    )
+    return tuple(
+        parse_implicant_binary(b)
+        for b in qm_data["essential_prime_implicants"] + qm_data["selected_prime_implicants"]
+    )
+
+
 # ===============================
 # HITUNG MINTERM
 # ===============================
 def extract_minterms(variables, truth_table_data):
+    if isinstance(truth_table_data, TruthTable):
+        num_vars = len(variables)
+        indices = truth_table_data.minterms()
+        return [str(m) for m in indices], [format(m, f"0{num_vars}b") for m in indices]
+
     minterms = []
     minterm_values = []
     for row in truth_table_data:
@@ -185,211 +601,895 @@ def extract_minterms(variables, truth_table_data):
 
 
 # ===============================
-# QUINE–MCCLUSKEY FINAL SESUAI SPESIFIKASI
+# QUINE–MCCLUSKEY: REPRESENTASI BITMASK
 # ===============================
-def quine_mccluskey_process(variables, minterms):
-    num_vars = len(variables)
-    minterm_ints = sorted(map(int, minterms))
+# Implicant disimpan sebagai pasangan integer (value, mask): bit di mask
+# adalah posisi "-", value bernilai 0 pada posisi tersebut. Variabel
+# pertama = bit paling signifikan, sama dengan urutan tabel kebenaran.
+def popcount(x):
+    if _has_bit_count:
+        return x.bit_count()
+    return bin(x).count("1")
+
+
+_has_bit_count = hasattr(int, "bit_count")
+
+
+def implicant_binary(value, mask, num_vars):
+    chars = []
+    for i in range(num_vars - 1, -1, -1):
+        if (mask >> i) & 1:
+            chars.append("-")
+        else:
+            chars.append("1" if (value >> i) & 1 else "0")
+    return "".join(chars)
+
+
+def parse_implicant_binary(binary):
+    # "1-0" → (value, mask); kebalikan implicant_binary
+    value = mask = 0
+    for char in binary:
+        value = (value << 1) | (char == "1")
+        mask = (mask << 1) | (char == "-")
+    return value, mask
 
-    # ============ STORAGE SEMUA LANGKAH ============
-    history_steps = []
 
-    # ============ 1️⃣ Prime Implicant Table 1 ============
+def implicant_minterms(value, mask):
+    # Semua minterm yang dicakup cube (enumerasi subset dari mask)
+    result = []
+    sub = mask
+    while True:
+        result.append(value | sub)
+        if sub == 0:
+            break
+        sub = (sub - 1) & mask
+    result.sort()
+    return result
+
+
+def implicant_expression(binary, variables):
+    terms = []
+    for b, v in zip(binary, variables):
+        if b == "1":
+            terms.append(v)
+        elif b == "0":
+            terms.append(f"¬{v}")
+    return terms
+
+
+def combine_implicants(minterm_ints, num_vars, timer=None):
+    # Fase penggabungan Q-M. Pasangan dicari lewat hash: untuk tiap
+    # implicant di grup k, kandidat pasangannya di grup k+1 hanya
+    # (value | bit, mask) untuk bit 0 yang bukan "-", jadi tidak ada
+    # perbandingan semua-pasangan. Urutan temuan dijaga sama dengan
+    # iterasi g1 × g2 versi string supaya tabel langkah tidak berubah.
+    all_bits = (1 << num_vars) - 1
     groups = {}
     for m in minterm_ints:
-        ones = bin(m).count("1")
-        binary = format(m, f"0{num_vars}b")
-        groups.setdefault(ones, []).append({
-            "decimal": [m],
-            "binary": binary,
-            "checked": False
-        })
-
-    table1 = []
-    for ones, group in sorted(groups.items()):
-        for g in group:
-            table1.append({
-                "group": ones,
-                "decimal": g["decimal"],
-                "binary": g["binary"],
-                "cost": g["binary"].count("1")
-            })
-    history_steps.append({
-        "stage": "Prime Implicant Table 1",
-        "data": table1
-    })
+        groups.setdefault(popcount(m), []).append((m, 0))
 
-    # ============ 2️⃣ Prime Implicant Table 2 (Iterasi) ============
+    first_groups = groups
+    iterations = []
     prime_implicants = []
-    iter_tables = []
-    step_num = 2
+    prime_seen = set()
 
     while True:
         next_groups = {}
-        combined = False
-        step_table = []
+        discovered = []
+        seen = set()
+        checked = set()
 
         keys = sorted(groups.keys())
         for k in keys:
-            group1 = groups[k]
-            group2 = groups.get(k + 1, [])
-
-            for g1 in group1:
-                for g2 in group2:
-                    # Cek perbedaan 1-bit
-                    diff = [i for i in range(num_vars) if g1["binary"][i] != g2["binary"][i]]
-                    if len(diff) == 1:
-                        idx = diff[0]
-                        new_bin = list(g1["binary"])
-                        new_bin[idx] = "-"
-                        new_bin = "".join(new_bin)
-                        new_decimal = sorted(set(g1["decimal"] + g2["decimal"]))
-                        ones_new = new_bin.count("1")
-
-                        new_item = {
-                            "decimal": new_decimal,
-                            "binary": new_bin,
-                            "checked": False
-                        }
-
-                        if new_item not in next_groups.get(ones_new, []):
-                            next_groups.setdefault(ones_new, []).append(new_item)
-                            step_table.append({
-                                "group": ones_new,
-                                "decimal": new_decimal,
-                                "binary": new_bin,
-                                "cost": new_bin.count("1")
-                            })
-                            combined = True
-
-                        g1["checked"] = True
-                        g2["checked"] = True
-
-        # Simpan tabel iterasi
-        if step_table:
-            iter_tables.append({
-                "stage": f"Prime Implicant Table {step_num}",
-                "data": step_table
-            })
-            step_num += 1
-
-        # Tandai yang tidak digabung jadi prime implicant
+            upper = groups.get(k + 1)
+            if not upper:
+                continue
+            position = {item: i for i, item in enumerate(upper)}
+
+            for item in groups[k]:
+                value, mask = item
+                partners = []
+                free = all_bits & ~(value | mask)
+                while free:
+                    bit = free & -free
+                    free ^= bit
+                    idx = position.get((value | bit, mask))
+                    if idx is not None:
+                        partners.append((idx, bit))
+                if not partners:
+                    continue
+
+                checked.add(item)
+                partners.sort()
+                for idx, bit in partners:
+                    checked.add(upper[idx])
+                    new_item = (value, mask | bit)
+                    if new_item not in seen:
+                        seen.add(new_item)
+                        next_groups.setdefault(k, []).append(new_item)
+                        discovered.append((k, new_item))
+
+        if discovered:
+            iterations.append(discovered)
+
+        # Yang tidak tergabung menjadi prime implicant
         for k in keys:
-            for g in groups[k]:
-                if not g["checked"]:
-                    prime_implicants.append(g)
-
-        if not combined:
+            for item in groups[k]:
+                if item not in checked and item not in prime_seen:
+                    prime_seen.add(item)
+                    prime_implicants.append(item)
+
+        if timer is not None:
+            timer.report(
+                "qm_combine", iteration=len(iterations),
+                implicants=len(discovered), primes=len(prime_implicants)
+            )
+        if not discovered:
             break
 
         groups = next_groups
 
+    return first_groups, iterations, prime_implicants
+
+
+def _implicant_row(group, value, mask, num_vars):
+    binary = implicant_binary(value, mask, num_vars)
+    return {
+        "group": group,
+        "decimal": implicant_minterms(value, mask),
+        "binary": binary,
+        "cost": binary.count("1")
+    }
+
+
+# ===============================
+# LOOKUP SOP MINIMAL (≤ 4 VARIABEL)
+# ===============================
+# Fungsi kecil (mayoritas trafik) dijawab dari sop_table.bin hasil
+# build_sop_table.py: satu baca indeks menggantikan Q-M / simplify_logic.
+# Tanpa file tabel, None dan pemanggil kembali ke jalur hitung biasa.
+def lookup_minimal_sop(variables, output):
+    if not 1 <= len(variables) <= SOP_TABLE_MAX_VARS:
+        return None
+    table = get_sop_table()
+    if table is None:
+        return None
+    primes, cover, terms = table.record(len(variables), output)
+    if not primes:
+        return None
+    return {"primes": primes, "cover": [primes[i] for i in cover], "terms": terms}
+
+
+def render_qm_cover(cover, variables):
+    # Format final_expression Q-M: A∧¬B ∨ C
+    num_vars = len(variables)
+    parts = []
+    for value, mask in cover:
+        literals = implicant_expression(implicant_binary(value, mask, num_vars), variables)
+        parts.append("∧".join(literals) if literals else "⊤")
+    return " ∨ ".join(parts) if parts else "-"
+
+
+def render_dnf_terms(terms, variables):
+    # Format simplify_logic (setelah format_ui_symbols): (A ∧ ¬B) ∨ C
+    rendered = []
+    for term in terms:
+        literals = [("¬" if lit & 4 else "") + variables[lit & 3] for lit in term]
+        text = " ∧ ".join(literals)
+        rendered.append(f"({text})" if len(literals) > 1 and len(terms) > 1 else text)
+    return " ∨ ".join(rendered)
+
+
+def _sympy_literal_key(var, negated):
+    # Urutan ordered() SymPy untuk And/Or: jumlah node lebih dulu (A = 1,
+    # ¬A = 2, A ∧ ¬B = 1 + 1 + 2), lalu sort_key (Symbol < And < Not)
+    symbol = ((2, 0, "Symbol"), (1, (var,)))
+    if negated:
+        return 2, ((5, 0, "Not"), (1, (symbol,)))
+    return 1, symbol
+
+
+def render_sympy_cover(cover, variables):
+    # Cover (value, mask) dalam format str() simplify_logic tanpa membangun
+    # objek SymPy: (A ∧ ¬B) ∨ C, urutan term/literal sama dengan SymPy
+    num_vars = len(variables)
+    terms = []
+    for value, mask in cover:
+        literals = [
+            (var, not value & (1 << (num_vars - 1 - i)))
+            for i, var in enumerate(variables) if not mask & (1 << (num_vars - 1 - i))
+        ]
+        keys = sorted(_sympy_literal_key(*lit) for lit in literals)
+        literals.sort(key=lambda lit: _sympy_literal_key(*lit))
+        if len(literals) == 1:
+            key = keys[0]
+        else:
+            key = (1 + sum(k[0] for k in keys), ((5, 0, "And"), (len(keys), tuple(k[1] for k in keys))))
+        terms.append((key, literals))
+    terms.sort(key=lambda term: term[0])
+    rendered = []
+    for _, literals in terms:
+        text = " ∧ ".join(("¬" if negated else "") + var for var, negated in literals)
+        rendered.append(f"({text})" if len(literals) > 1 and len(terms) > 1 else text)
+    return " ∨ ".join(rendered)
+
+
+# ===============================
+# QUINE–MCCLUSKEY: PEMILIHAN COVER MINIMUM
+# ===============================
+# Setelah essential PI diambil, sisa minterm dicover dengan:
+# secondary essential, dominasi baris/kolom, lalu branch-and-bound
+# (biaya = jumlah term, lalu jumlah literal) dengan batas waktu. Jika
+# waktu habis, dipakai cover terbaik yang sudah ditemukan.
+QM_COVER_TIME_BUDGET = 2.0
+
+
+def _iter_bits(x):
+    # Posisi bit 1 dari kecil ke besar; lewat string supaya tetap linear
+    # untuk bitset ribuan bit.
+    bits = bin(x)[:1:-1]
+    idx = bits.find("1")
+    while idx != -1:
+        yield idx
+        idx = bits.find("1", idx + 1)
+
+
+def select_minimum_cover(primes, minterm_ints, num_vars, essential_idx=(),
+                         time_budget=QM_COVER_TIME_BUDGET, log=None, timer=None, rows=None):
+    # Reduksi bekerja di atas set sparse (cube kecil, banyak minterm),
+    # branch-and-bound di atas bitset kolom yang tersisa saja. rows
+    # (set kolom per prime) bisa diberikan langsung bila kolom bukan
+    # minterm tunggal, mis. pasangan (output, minterm) multi-output.
+    wanted = set(minterm_ints)
+    if rows is None:
+        rows = [
+            {m for m in implicant_minterms(value, mask) if m in wanted}
+            for value, mask in primes
+        ]
+    costs = [(1, num_vars - popcount(mask)) for _, mask in primes]
+
+    def note(step, idx=None, text=""):
+        if log is None:
+            return
+        entry = {"step": step, "PI": "", "expression": "", "note": text}
+        if idx is not None:
+            entry["PI"] = implicant_binary(*primes[idx], num_vars)
+        log.append(entry)
+
+    chosen = []
+    required = set(wanted)
+    active = set(range(len(primes)))
+
+    def take(idx, step):
+        chosen.append(idx)
+        active.discard(idx)
+        required.difference_update(rows[idx])
+        note(step, idx)
+
+    for idx in essential_idx:
+        take(idx, "Essential")
+
+    # ============ Reduksi tabel ============
+    changed = True
+    while changed and required:
+        changed = False
+        active = {i for i in active if not rows[i].isdisjoint(required)}
+
+        col_rows = {}
+        for i in active:
+            for m in rows[i] & required:
+                col_rows.setdefault(m, set()).add(i)
+
+        # Secondary essential: kolom yang hanya dicover satu baris
+        for m in sorted(col_rows):
+            if m in required and len(col_rows[m]) == 1:
+                take(next(iter(col_rows[m])), "Secondary Essential")
+                changed = True
+        if changed:
+            continue
+
+        # Dominasi kolom: jika setiap baris yang mencover a juga mencover b,
+        # kolom b otomatis tercover dan bisa dibuang.
+        for m in sorted(col_rows):
+            if m not in required:
+                continue
+            common = None
+            for i in col_rows[m]:
+                common = rows[i] & required if common is None else common & rows[i]
+            common.discard(m)
+            for k in sorted(common):
+                note("Column Dominance", text=f"m{k} dihapus, didominasi m{m}")
+            required.difference_update(common)
+            changed = changed or bool(common)
+        if changed:
+            continue
+
+        # Dominasi baris: baris r dibuang jika ada baris s yang mencover
+        # semua kolom r dengan biaya tidak lebih besar.
+        for i in sorted(active, key=lambda x: (-len(rows[x] & required), costs[x], x)):
+            candidates = None
+            for m in rows[i] & required:
+                candidates = set(col_rows[m]) if candidates is None else candidates & col_rows[m]
+            candidates.discard(i)
+            for k in sorted(candidates):
+                if k in active and costs[k] <= costs[i]:
+                    active.discard(i)
+                    note("Row Dominance", i, f"didominasi {implicant_binary(*primes[k], num_vars)}")
+                    changed = True
+                    break
+
+    if not required:
+        return chosen, True
+    if timer is not None:
+        timer.report("qm_cover", phase="reduction", chosen=len(chosen),
+                     columns_left=len(required), rows_left=len(active))
+
+    # ============ Branch-and-bound ============
+    columns = sorted(required)
+    column_bit = {m: 1 << j for j, m in enumerate(columns)}
+    remaining = sorted(active)
+    row_bits = {}
+    col_rows = [[] for _ in columns]
+    for i in remaining:
+        bits = 0
+        for m in rows[i] & required:
+            bits |= column_bit[m]
+            col_rows[column_bit[m].bit_length() - 1].append(i)
+        row_bits[i] = bits
+    for candidates in col_rows:
+        candidates.sort(key=lambda i: (costs[i], -popcount(row_bits[i])))
+
+    def add_cost(a, b):
+        return (a[0] + b[0], a[1] + b[1])
+
+    deadline = time.monotonic() + time_budget
+    left = (1 << len(columns)) - 1
+
+    # Solusi awal greedy (lazy: gain hanya bisa turun) sebagai batas atas
+    greedy, greedy_cost = [], (0, 0)
+    heap = [(-popcount(row_bits[i]), costs[i][1], i) for i in remaining]
+    heapq.heapify(heap)
+    while left:
+        _, lits, i = heapq.heappop(heap)
+        gain = popcount(row_bits[i] & left)
+        if heap and (-gain, lits) > heap[0][:2]:
+            heapq.heappush(heap, (-gain, lits, i))
+            continue
+        greedy.append(i)
+        greedy_cost = add_cost(greedy_cost, costs[i])
+        left &= ~row_bits[i]
+
+    best = {"rows": greedy, "cost": greedy_cost}
+    state = {"timeout": False, "nodes": 0}
+    if timer is not None:
+        timer.report("qm_cover", phase="greedy", terms=greedy_cost[0], literals=greedy_cost[1])
+
+    def lower_bound(open_cols):
+        # Kolom-kolom yang barisnya saling lepas masing-masing butuh term sendiri
+        used = set()
+        count = 0
+        for j in sorted(open_cols, key=lambda j: len(col_rows[j])):
+            if used.isdisjoint(col_rows[j]):
+                used.update(col_rows[j])
+                count += 1
+        return count
+
+    def search(left, picked, cost):
+        if time.monotonic() > deadline:
+            state["timeout"] = True
+        if state["timeout"]:
+            return
+        state["nodes"] += 1
+        if timer is not None and not state["nodes"] & 0x3FF:
+            timer.report("qm_cover", phase="branch_and_bound", nodes=state["nodes"],
+                         terms=best["cost"][0], literals=best["cost"][1])
+        if not left:
+            if cost < best["cost"]:
+                best["rows"], best["cost"] = list(picked), cost
+            return
+        open_cols = list(_iter_bits(left))
+        if (cost[0] + lower_bound(open_cols), cost[1]) >= best["cost"]:
+            return
+        j = min(open_cols, key=lambda j: len(col_rows[j]))
+        for i in col_rows[j]:
+            picked.append(i)
+            search(left & ~row_bits[i], picked, add_cost(cost, costs[i]))
+            picked.pop()
+
+    try:
+        search((1 << len(columns)) - 1, [], (0, 0))
+    except RecursionError:
+        # Cover sangat dalam: berhenti dan pakai solusi terbaik sejauh ini
+        state["timeout"] = True
+    optimal = not state["timeout"]
+
+    for idx in sorted(best["rows"]):
+        take(idx, "Branch and Bound")
+    note("Result", text=(
+        f"{best['cost'][0]} term, {best['cost'][1]} literal tambahan, "
+        + ("optimal" if optimal else "batas waktu tercapai, cover terbaik sementara")
+    ))
+    return chosen, optimal
+
+
+# ===============================
+# QUINE–MCCLUSKEY FINAL SESUAI SPESIFIKASI
+# ===============================
+def quine_mccluskey_process(variables, minterms, include_steps=True, dont_cares=(), timer=None):
+    timer = timer or StageTimer()
+    num_vars = len(variables)
+    minterm_ints = sorted(set(map(int, minterms)))
+    minterm_set = set(minterm_ints)
+    dont_care_ints = sorted(set(map(int, dont_cares)) - minterm_set)
+
+    # Don't care ikut digabung, tapi tidak perlu dicover: PI yang hanya
+    # berisi don't care dibuang dari chart.
+    with timer.stage("qm_combine"):
+        first_groups, iterations, primes = combine_implicants(
+            sorted(minterm_ints + dont_care_ints), num_vars, timer=timer
+        )
+        if dont_care_ints:
+            primes = [
+                (v, m) for v, m in primes
+                if any(x in minterm_set for x in implicant_minterms(v, m))
+            ]
+        prime_binaries = [implicant_binary(v, m, num_vars) for v, m in primes]
+        prime_cover = [
+            [x for x in implicant_minterms(v, m) if x in minterm_set]
+            for v, m in primes
+        ]
+
+    # ============ Essential Prime Implicants ============
+    with timer.stage("qm_essential"):
+        coverage = {m: [] for m in minterm_ints}
+        for binary, covered in zip(prime_binaries, prime_cover):
+            for m in covered:
+                coverage[m].append(binary)
+
+        essential = []
+        essential_set = set()
+        for m, pis in coverage.items():
+            if len(pis) == 1 and pis[0] not in essential_set:
+                essential_set.add(pis[0])
+                essential.append(pis[0])
+
+    # ============ Cover Selection ============
+    with timer.stage("qm_cover"):
+        index_of = {b: i for i, b in enumerate(prime_binaries)}
+        cover_log = [] if include_steps else None
+        chosen, cover_optimal = select_minimum_cover(
+            primes, minterm_ints, num_vars,
+            essential_idx=[index_of[b] for b in essential],
+            log=cover_log, timer=timer
+        )
+        selected = [prime_binaries[i] for i in chosen if prime_binaries[i] not in essential_set]
+        for entry in cover_log or []:
+            if entry["PI"]:
+                entry["expression"] = "∧".join(implicant_expression(entry["PI"], variables))
+
+    # ============ Final Answer ============
+    def bin_to_expr(bin_str):
+        terms = implicant_expression(bin_str, variables)
+        return "∧".join(terms) if terms else "⊤"
+
+    cover = essential + selected
+    final_expr = " ∨ ".join([bin_to_expr(pi) for pi in cover]) if cover else "-"
+
+    result = {
+        "prime_implicant_table_1": [],
+        "prime_implicant_table_2": [],
+        "prime_implicant_expression": [],
+        "prime_implicant_chart": [],
+        "finding_unique": [],
+        "essential_prime_implicants": essential,
+        "selected_prime_implicants": selected,
+        "cover_selection": cover_log or [],
+        "cover_optimal": cover_optimal,
+        "final_expression": final_expr,
+        "history_steps": []
+    }
+    if not include_steps:
+        return result
+
+    # ============ Tabel langkah (dirender dari bentuk bitmask) ============
+    with timer.stage("qm_steps"):
+        result.update(_qm_history_steps(
+            variables, first_groups, iterations, prime_binaries, prime_cover,
+            minterm_ints, essential_set, cover_log
+        ))
+    return result
+
+
+def _qm_history_steps(variables, first_groups, iterations, prime_binaries, prime_cover,
+                      minterm_ints, essential_set, cover_log):
+    num_vars = len(variables)
+    history_steps = []
+
+    # 1️⃣ Prime Implicant Table 1
+    table1 = []
+    for ones, group in sorted(first_groups.items()):
+        for value, mask in group:
+            table1.append(_implicant_row(ones, value, mask, num_vars))
+    history_steps.append({
+        "stage": "Prime Implicant Table 1",
+        "data": table1
+    })
+
+    # 2️⃣ Prime Implicant Table 2.. (Iterasi)
+    iter_tables = []
+    for step_num, discovered in enumerate(iterations, start=2):
+        iter_tables.append({
+            "stage": f"Prime Implicant Table {step_num}",
+            "data": [_implicant_row(k, v, m, num_vars) for k, (v, m) in discovered]
+        })
     history_steps.extend(iter_tables)
 
-    # ============ 3️⃣ Bersihkan Duplikat Prime Implicants ============
-    seen = set()
-    clean_pi = []
-    for pi in prime_implicants:
-        key = (tuple(pi["decimal"]), pi["binary"])
-        if key not in seen:
-            seen.add(key)
-            clean_pi.append(pi)
-    prime_implicants = clean_pi
-
-    # ============ 4️⃣ Prime Implicant Expression ============
+    # 4️⃣ Prime Implicant Expression
     pi_expressions = []
-    for pi in prime_implicants:
-        expr = []
-        for b, v in zip(pi["binary"], variables):
-            if b == "1":
-                expr.append(v)
-            elif b == "0":
-                expr.append(f"¬{v}")
+    expression_of = {}
+    for binary in prime_binaries:
+        expression = "∧".join(implicant_expression(binary, variables))
+        expression_of.setdefault(binary, expression)
         pi_expressions.append({
-            "binary": pi["binary"],
-            "expression": "∧".join(expr)
+            "binary": binary,
+            "expression": expression
         })
     history_steps.append({
         "stage": "Prime Implicant Expression",
         "data": pi_expressions
     })
 
-    # ============ 5️⃣ Prime Implicant Chart ============
+    # 5️⃣ Prime Implicant Chart
     chart = []
-    for pi in prime_implicants:
+    for binary, covered in zip(prime_binaries, prime_cover):
+        covered_set = set(covered)
         row = {
-            "PI": pi["binary"],
-            "expression": next(x["expression"] for x in pi_expressions if x["binary"] == pi["binary"]),
-            "covered": pi["decimal"],
-            "cost": len(pi["decimal"])
+            "PI": binary,
+            "expression": expression_of[binary],
+            "covered": covered,
+            "cost": len(covered)
         }
         for m in minterm_ints:
-            row[str(m)] = "X" if m in pi["decimal"] else ""
+            row[str(m)] = "X" if m in covered_set else ""
         chart.append(row)
     history_steps.append({
         "stage": "Prime Implicant Chart",
         "data": chart
     })
 
-    # ============ 6️⃣ Finding Unique Minterm ============
-    coverage = {m: [] for m in minterm_ints}
-    for pi in prime_implicants:
-        for m in pi["decimal"]:
-            coverage[m].append(pi["binary"])
-
-    essential = []
-    for m, pis in coverage.items():
-        if len(pis) == 1:
-            if pis[0] not in essential:
-                essential.append(pis[0])
-
+    # 6️⃣ Finding Unique Minterm
     unique_chart = []
     for row in chart:
         row_copy = dict(row)
-        row_copy["essential"] = "Yes" if row["PI"] in essential else ""
+        row_copy["essential"] = "Yes" if row["PI"] in essential_set else ""
         unique_chart.append(row_copy)
     history_steps.append({
         "stage": "Finding Unique Minterm",
         "data": unique_chart
     })
 
-    # ============ 7️⃣ Final Answer ============
-    def bin_to_expr(bin_str):
-        terms = []
-        for b, v in zip(bin_str, variables):
-            if b == "1":
-                terms.append(v)
-            elif b == "0":
-                terms.append(f"¬{v}")
-        return "∧".join(terms) if terms else "-"
-
-    final_expr = " ∨ ".join([bin_to_expr(pi) for pi in essential]) if essential else "-"
+    # 7️⃣ Cover Selection
+    history_steps.append({
+        "stage": "Cover Selection",
+        "data": cover_log
+    })
 
     return {
         "prime_implicant_table_1": table1,
-        "prime_implicant_table_2": [
-        step["data"] for step in history_steps
-        if step["stage"].startswith("Prime Implicant Table ") and step["stage"] != "Prime Implicant Table 1"
-    ],
+        "prime_implicant_table_2": [step["data"] for step in iter_tables],
         "prime_implicant_expression": pi_expressions,
         "prime_implicant_chart": chart,
         "finding_unique": unique_chart,
-        "essential_prime_implicants": essential,
-        "final_expression": final_expr,
         "history_steps": history_steps
     }
 
 
-def optimize_logic(expr_str, method="default"):
+# ===============================
+# TRACE LANGKAH DNF
+# ===============================
+# Batas term untuk /optimize/trace (string hasil dikirim klien)
+TRACE_MAX_TERMS = 256
+
+
+def _dnf_literal(node):
+    # (var, negasi) atau None kalau node bukan literal
+    if node.op == "var":
+        return node.name, False
+    if node.op == "not" and node.args[0].op == "var":
+        return node.args[0].name, True
+    return None
+
+
+def dnf_terms(simplified, variables, max_terms=None):
+    # String DNF → term terstruktur lewat parser (bukan split teks):
+    # literal (var, negasi) dan cube (value, mask) atas urutan variabel
+    # tabel. value None kalau term tidak pernah True (literal bertentangan
+    # atau variabel positif di luar tabel); variabel negasi di luar tabel
+    # selalu bernilai True. Bentuk selain OR dari AND literal (mis. ⊕, →)
+    # ditolak dengan ValueError.
+    tree = parse_boolean(simplified)
+    disjuncts = tree.args if tree.op == "or" else (tree,)
+    if max_terms is not None and len(disjuncts) > max_terms:
+        raise ValueError(f"Ekspresi hasil memiliki {len(disjuncts)} term (maksimal {max_terms}).")
+    # Nama term mengikuti format hasil: "(A ∧ ¬B)" (simplify_logic) atau "A∧¬B" (Q-M)
+    joiner = " ∧ " if " ∧ " in simplified else "∧"
+    index = {v: i for i, v in enumerate(variables)}
+    num_vars = len(variables)
+    terms = []
+    for node in disjuncts:
+        literals = [_dnf_literal(arg) for arg in (node.args if node.op == "and" else (node,))]
+        if None in literals:
+            raise ValueError("Ekspresi hasil bukan bentuk DNF (OR dari AND literal).")
+        value, fixed = 0, 0
+        for var, negated in literals:
+            if value is None:
+                continue
+            if var not in index:
+                if not negated:
+                    value = None
+                continue
+            bit = 1 << (num_vars - 1 - index[var])
+            want = 0 if negated else bit
+            if fixed & bit and value & bit != want:
+                value = None
+                continue
+            fixed |= bit
+            value |= want
+        name = joiner.join(("¬" if negated else "") + var for var, negated in literals)
+        if len(literals) > 1 and joiner == " ∧ " and len(disjuncts) > 1:
+            name = f"({name})"
+        terms.append({
+            "name": name,
+            "literals": literals,
+            "value": value,
+            "mask": ((1 << num_vars) - 1) & ~fixed
+        })
+    return terms
+
+
+def cube_column(value, mask, columns):
+    # Bitset baris yang dicakup cube (value, mask): irisan kolom variabel
+    variable_cols, full = columns
+    num_vars = len(variable_cols)
+    cube = full
+    for i, column in enumerate(variable_cols):
+        bit = 1 << (num_vars - 1 - i)
+        if not mask & bit:
+            cube &= column if value & bit else ~column
+    return cube
+
+
+def cube_first_minterm(term, output, columns):
+    # Cube yang tidak seluruhnya minterm (mis. sebagian don't care): iris
+    # kolom cube dengan bitset minterm, ambil baris (bit) terendah.
+    hit = cube_column(term["value"], term["mask"], columns) & output
+    return (hit & -hit).bit_length() - 1 if hit else None
+
+
+def build_dnf_trace(simplified, table, terms=None):
+    # Baris contoh per term dihitung dari cube-nya dan dicek ke bitset
+    # minterm (table.output), tanpa memindai tabel baris demi baris.
+    # terms: hasil dnf_terms yang sudah ada (dan sudah dibatasi)
+    threads = []
+    groupings = []
+    variables = table.variables
+    num_vars = len(variables)
+    index = {v: i for i, v in enumerate(variables)}
+    if terms is None:
+        terms = dnf_terms(simplified, variables)
+    dnf_parts = [term["name"] for term in terms]
+    columns = None
+
+    for i, term in enumerate(terms):
+        literals = [("¬" if negated else "") + var for var, negated in term["literals"]]
+        steps = [f"▶ Mulai term ke-{i+1}: {term['name']}"]
+
+        # Implicant: baris pertama cube (variabel bebas = 0) sudah minterm
+        row = term["value"]
+        if row is not None and not (table.output >> row) & 1:
+            if columns is None:
+                columns = variable_columns(num_vars)
+            row = cube_first_minterm(term, table.output, columns)
+        if row is not None:
+            if len(literals) > 1:
+                steps.append(f"Pecah term: {', '.join(literals)}")
+            for var, negated in term["literals"]:
+                raw = var in index and (row >> (num_vars - 1 - index[var])) & 1 == 1
+                if negated:
+                    steps.append(f"Evaluasi ¬{var} = ¬{raw} = {not raw}")
+                else:
+                    steps.append(f"Evaluasi {var} = {raw}")
+            if len(literals) > 1:
+                steps.append(f"Gabungkan: {' ∧ '.join(literals)} = True")
+            else:
+                steps.append(f"Literal {literals[0]} valid → True")
+        else:
+            steps.append("Tidak ada baris tabel cocok untuk term ini.")
+
+        threads.append({
+            "name": term["name"],
+            "steps": steps
+        })
+
+    # Grouping DNF
+    g_count = 1
+    grouped_results = []
+    i = 0
+    while i < len(dnf_parts):
+        t1 = dnf_parts[i]
+        if i + 1 < len(dnf_parts):
+            t2 = dnf_parts[i + 1]
+            steps = [
+                f"Ambil Thread {i+1}: {t1}",
+                f"Ambil Thread {i+2}: {t2}",
+                f"Gabungkan: ({t1}) ∨ ({t2})"
+            ]
+            result = f"({t1}) ∨ ({t2})"
+            groupings.append({
+                "group": f"Group {g_count}",
+                "threads": {
+                    f"Thread {i+1}": t1,
+                    f"Thread {i+2}": t2
+                },
+                "steps": steps,
+                "result": result
+            })
+            grouped_results.append(result)
+            i += 2
+        else:
+            steps = [
+                f"Ambil Thread {i+1}: {t1}",
+                f"Gabungkan: ({t1})"
+            ]
+            result = f"({t1})"
+            groupings.append({
+                "group": f"Group {g_count}",
+                "threads": {f"Thread {i+1}": t1},
+                "steps": steps,
+                "result": result
+            })
+            grouped_results.append(result)
+            i += 1
+
+        g_count += 1
+
+    main_join = f"Gabungkan semua group: {' ∨ '.join(grouped_results)} = {simplified}"
+    return threads, groupings, main_join
+
+
+# ===============================
+# BENTUK LAIN: POS MINIMAL & FAKTOR MULTI-LEVEL
+# ===============================
+def output_forms(variables, simplified, dont_cares=()):
+    # Dihitung dari cover SOP hasil metode (tanpa simplify_logic kedua):
+    # POS minimal dari off-set (De Morgan atas cover minimal ¬F) dan
+    # bentuk faktor dari divisi aljabar atas cube cover. Off-set = baris
+    # di luar cover dan don't care, jadi tabel kebenaran tidak dibutuhkan.
+    # None kalau hasil konstan atau tidak valid; bentuk yang melewati
+    # batas berisi {"skipped": alasan}.
+    num_vars = len(variables)
+    if simplified in ("⊤", "⊥", "–", "-") or not num_vars:
+        return None
+    try:
+        terms = dnf_terms(simplified, variables)
+    except ValueError:
+        return None
+    if any(term["value"] is None for term in terms):
+        return None
+    full = (1 << num_vars) - 1
+    on_cover = [(term["value"], term["mask"]) for term in terms]
+
+    forms = {
+        "sop": {
+            "expression": simplified,
+            "terms": len(on_cover),
+            "literals": cover_cost(on_cover, full)[1]
+        }
+    }
+    if len(on_cover) > FACTOR_MAX_CUBES:
+        skipped = {"skipped": f"Cover SOP {len(on_cover)} term (maksimal {FACTOR_MAX_CUBES})."}
+        forms["factored"] = skipped
+        forms["pos"] = skipped
+        return forms
+
+    factored = factor_cubes(cover_to_cubes(on_cover, num_vars))
+    forms["factored"] = {
+        "expression": render_node(factored, variables),
+        "literals": node_literals(factored)
+    }
+    if num_vars > POS_MAX_VARS:
+        forms["pos"] = {"skipped": f"POS hanya sampai {POS_MAX_VARS} variabel."}
+        return forms
+
+    # Komplemen cover (unate recursive) menentukan ukuran off-set
+    # sebelum minimisasi yang mahal dijalankan
+    dc_cubes = minterm_cover(dont_cares, num_vars)
+    off_set = complement(on_cover + dc_cubes, full)
+    if len(off_set) > FACTOR_MAX_CUBES:
+        forms["pos"] = {"skipped": f"Off-set {len(off_set)} cube (maksimal {FACTOR_MAX_CUBES})."}
+        return forms
+
+    if num_vars <= POS_EXACT_MAX_VARS:
+        columns = variable_columns(num_vars)
+        off_output = 0
+        for value, mask in off_set:
+            off_output |= cube_column(value, mask, columns)
+        if dont_cares and off_output:
+            qm_data = quine_mccluskey_process(
+                variables, TruthTable(variables, off_output).minterms(),
+                include_steps=False, dont_cares=dont_cares
+            )
+            off_cover = [
+                parse_implicant_binary(b)
+                for b in qm_data["essential_prime_implicants"] + qm_data["selected_prime_implicants"]
+            ]
+        else:
+            off_cover = list(kmap_cover(num_vars, off_output))
+    else:
+        off_cover = espresso(off_set, num_vars, dc_set=dc_cubes)
+
+    forms["pos"] = {
+        "expression": render_pos(off_cover, variables) if off_cover else "⊤",
+        "clauses": len(off_cover),
+        "literals": cover_cost(off_cover, full)[1]
+    }
+    return forms
+
+
+# ===============================
+# ESPRESSO (HEURISTIK, VARIABEL BANYAK)
+# ===============================
+def espresso_process(variables, parsed=None, minterms=None, dont_cares=()):
+    num_vars = len(variables)
+    if minterms is not None:
+        on_set = minterm_cover(minterms, num_vars)
+    else:
+        try:
+            # Cover awal langsung dari ekspresi, tanpa enumerasi 2^n baris
+            on_set = expression_cover(parsed.tree, variables)
+        except (NotImplementedError, KeyError):
+            on_set = minterm_cover(parsed.minterms, num_vars)
+
+    cubes = espresso(on_set, num_vars, dc_set=minterm_cover(dont_cares, num_vars))
+    implicants = [implicant_binary(v, m, num_vars) for v, m in cubes]
+    terms, literals = cover_cost(cubes, (1 << num_vars) - 1)
+
+    if not cubes:
+        final_expr = "⊥"
+    elif any("∧".join(implicant_expression(b, variables)) == "" for b in implicants):
+        final_expr = "⊤"
+    else:
+        final_expr = " ∨ ".join("∧".join(implicant_expression(b, variables)) for b in implicants)
+
+    return {
+        "implicants": implicants,
+        "final_expression": final_expr,
+        "term_count": terms,
+        "literal_count": literals
+    }
+
+
+def optimize_logic(expr_str, method="default", progress=None, trace=True, forms=False):
+    timer = StageTimer(progress)
+
     # ========================================
     # VALIDASI & PRE-PROSES EKSPRESI
     # ========================================
-    simplified, explanation = simplify_boolean(expr_str, method)
-    expr_clean = replace_symbols(expr_str)
-    expr = parse_expr(expr_clean, transformations=transformations, local_dict=locals_dict, evaluate=True)
+    with timer.stage("parse"):
+        parsed = parse_expression(expr_str)
+
+    # Dapatkan variabel & tabel kebenaran (dibangun lebih dulu supaya
+    # cek tautologi di simplify_boolean memakai kolom yang sama)
+    variables = parsed.variables
+    with timer.stage("truth_table"):
+        if method == "espresso" and len(variables) > ESPRESSO_TABLE_MAX_VARS:
+            table = []
+        else:
+            variables, table = generate_truth_table(parsed)
+            timer.report("truth_table", rows_done=table.size, rows_total=table.size)
 
-    # Dapatkan variabel & tabel kebenaran
-    variables, table = generate_truth_table(expr_str)
+    with timer.stage("simplify"):
+        simplified, explanation = simplify_boolean(parsed, method)
 
     # Init output
     kmap = None
@@ -406,29 +1506,49 @@ def optimize_logic(expr_str, method="default"):
     prime_implicant_chart = []
     finding_unique = []
     essential_implicants = []
+    selected_implicants = []
+    cover_selection = []
     final_expression = "-"
     history_steps = []
 
     # ========================================
     # CEK BATAS & METODE
     # ========================================
-    if method == "kmap" and len(variables) > 4:
+    if method == "kmap" and len(variables) > KMAP_MAX_VARS:
         simplified = "–"
-        explanation = "Metode Karnaugh Map hanya mendukung maksimal 4 variabel."
-    elif method == "qm" and len(variables) > 8:
+        explanation = f"Metode Karnaugh Map hanya mendukung maksimal {KMAP_MAX_VARS} variabel."
+    elif method == "qm" and len(variables) > QM_MAX_VARS:
         simplified = "–"
-        explanation = "Metode Quine–McCluskey hanya mendukung maksimal 8 variabel."
+        explanation = f"Metode Quine–McCluskey hanya mendukung maksimal {QM_MAX_VARS} variabel."
+    elif method == "espresso" and len(variables) > ESPRESSO_MAX_VARS:
+        simplified = "–"
+        explanation = f"Metode Espresso hanya mendukung maksimal {ESPRESSO_MAX_VARS} variabel."
+    elif method == "espresso":
+        if table:
+            minterms, minterm_values = extract_minterms(variables, table)
+        with timer.stage("espresso"):
+            espresso_data = espresso_process(variables, parsed=parsed)
+        simplified = espresso_data["final_expression"]
+        explanation = (
+            "Ekspresi disederhanakan dengan metode heuristik Espresso "
+            f"({espresso_data['term_count']} term, {espresso_data['literal_count']} literal)."
+        )
     else:
         if table:
             # Hitung Minterms
             minterms, minterm_values = extract_minterms(variables, table)
 
             if method == "kmap":
-                kmap = generate_kmap(variables, table)
+                with timer.stage("kmap"):
+                    kmap = generate_kmap(variables, table, cover=kmap_cover(len(variables), table.output))
 
             elif method == "qm":
                 if minterms:
-                    qm_data = quine_mccluskey_process(variables, minterms)
+                    qm_data = quine_mccluskey_process(
+                        variables, minterms,
+                        include_steps=len(variables) <= QM_STEPS_MAX_VARS,
+                        timer=timer
+                    )
 
                     prime_implicant_table_1 = qm_data["prime_implicant_table_1"]
                     prime_implicant_table_2 = qm_data["prime_implicant_table_2"]
@@ -436,11 +1556,16 @@ def optimize_logic(expr_str, method="default"):
                     prime_implicant_chart = qm_data["prime_implicant_chart"]
                     finding_unique = qm_data["finding_unique"]
                     essential_implicants = qm_data["essential_prime_implicants"]
+                    selected_implicants = qm_data["selected_prime_implicants"]
+                    cover_selection = qm_data["cover_selection"]
                     final_expression = qm_data["final_expression"]
                     history_steps = qm_data["history_steps"]
 
                     simplified = final_expression
-                    main_join = f"Essential PI: {essential_implicants} => {simplified}"
+                    if selected_implicants:
+                        main_join = f"Essential PI: {essential_implicants} + Cover PI: {selected_implicants} => {simplified}"
+                    else:
+                        main_join = f"Essential PI: {essential_implicants} => {simplified}"
                     explanation = "Ekspresi disederhanakan dengan metode Quine–McCluskey."
                 else:
                     simplified = "⊥"
@@ -452,111 +1577,25 @@ def optimize_logic(expr_str, method="default"):
     # ========================================
     # TRACE LANGKAH DNF (jika non-QM)
     # ========================================
+    # trace=False: klien tidak menampilkan trace, ambil nanti lewat
+    # /optimize/trace bila dibutuhkan
+    trace_deferred = False
     if simplified not in ["⊤", "⊥", "–"] and table and method != "qm":
-        dnf_parts = [p.strip() for p in simplified.split("∨")]
-
-        def clean(term):
-            return term.replace("(", "").replace(")", "").strip()
-
-        for i, term in enumerate(dnf_parts):
-            literals = [clean(lit) for lit in term.split("∧")]
-            steps = [f"▶ Mulai term ke-{i+1}: {term}"]
-
-            example_row = None
-            for row in table:
-                inputs, output = row
-                valid = True
-                for lit in literals:
-                    if lit.startswith("¬"):
-                        var = lit[1:]
-                        val = not inputs.get(var, False)
-                    else:
-                        var = lit
-                        val = inputs.get(var, False)
-                    if not val:
-                        valid = False
-                        break
-                if valid and output:
-                    example_row = inputs
-                    break
-
-            if example_row:
-                if len(literals) > 1:
-                    steps.append(f"Pecah term: {', '.join(literals)}")
-                for lit in literals:
-                    if lit.startswith("¬"):
-                        var = lit[1:]
-                        raw = example_row.get(var, False)
-                        val = not raw
-                        steps.append(f"Evaluasi ¬{var} = ¬{raw} = {val}")
-                    else:
-                        var = lit
-                        val = example_row.get(var, False)
-                        steps.append(f"Evaluasi {var} = {val}")
-                if len(literals) > 1:
-                    steps.append(f"Gabungkan: {' ∧ '.join(literals)} = True")
-                else:
-                    steps.append(f"Literal {literals[0]} valid → True")
-            else:
-                steps.append("Tidak ada baris tabel cocok untuk term ini.")
-
-            threads.append({
-                "name": term,
-                "steps": steps
-            })
-
-        # Grouping DNF
-        g_count = 1
-        grouped_results = []
-        i = 0
-        while i < len(dnf_parts):
-            t1 = dnf_parts[i]
-            if i + 1 < len(dnf_parts):
-                t2 = dnf_parts[i + 1]
-                steps = [
-                    f"Ambil Thread {i+1}: {t1}",
-                    f"Ambil Thread {i+2}: {t2}",
-                    f"Gabungkan: ({t1}) ∨ ({t2})"
-                ]
-                result = f"({t1}) ∨ ({t2})"
-                groupings.append({
-                    "group": f"Group {g_count}",
-                    "threads": {
-                        f"Thread {i+1}": t1,
-                        f"Thread {i+2}": t2
-                    },
-                    "steps": steps,
-                    "result": result
-                })
-                grouped_results.append(result)
-                i += 2
-            else:
-                steps = [
-                    f"Ambil Thread {i+1}: {t1}",
-                    f"Gabungkan: ({t1})"
-                ]
-                result = f"({t1})"
-                groupings.append({
-                    "group": f"Group {g_count}",
-                    "threads": {f"Thread {i+1}": t1},
-                    "steps": steps,
-                    "result": result
-                })
-                grouped_results.append(result)
-                i += 1
-
-            g_count += 1
-
-        main_join = f"Gabungkan semua group: {' ∨ '.join(grouped_results)} = {simplified}"
+        if trace:
+            with timer.stage("trace"):
+                threads, groupings, main_join = build_dnf_trace(simplified, table)
+        else:
+            trace_deferred = True
 
     # ========================================
     # RETURN FINAL
     # ========================================
-    return {
+    result = {
         "simplified": simplified,
         "explanation": explanation,
         "variables": variables,
-        "table": table,
+        "table": legacy_table_rows(table),
+        "truth_table": compact_truth_table(table),
         "kmap": kmap,
         "minterm": f"m({','.join(minterms)})" if minterms else "",
         "minterm_values": ', '.join(minterm_values) if minterm_values else "",
@@ -566,8 +1605,1058 @@ def optimize_logic(expr_str, method="default"):
         "prime_implicant_chart": prime_implicant_chart,
         "finding_unique": finding_unique,
         "essential_implicants": essential_implicants,
+        "selected_implicants": selected_implicants,
+        "cover_selection": cover_selection,
         "threads": threads,
         "groupings": groupings,
         "mainJoin": main_join,
-        "history_steps": history_steps
-    }
\ No newline at end of file
+        "history_steps": history_steps,
+        "trace_deferred": trace_deferred,
+        "timings": timer.stages
+    }
+    if forms:
+        # Bentuk POS/faktor (opsional): ikut budget/deadline dan cache hasil
+        with timer.stage("forms"):
+            result["forms"] = output_forms(variables, simplified)
+    return result
+
+# ===============================
+# INPUT LANGSUNG: MINTERM + DON'T CARE
+# ===============================
+def empty_optimize_result(explanation="–"):
+    return {
+        "simplified": "–",
+        "explanation": explanation,
+        "variables": [],
+        "table": [],
+        "truth_table": None,
+        "kmap": None,
+        "minterm": "",
+        "minterm_values": "",
+        "dont_care": "",
+        "prime_implicant_table_1": [],
+        "prime_implicant_table_2": [],
+        "prime_implicant_expression": [],
+        "prime_implicant_chart": [],
+        "finding_unique": [],
+        "essential_implicants": [],
+        "selected_implicants": [],
+        "cover_selection": [],
+        "threads": [],
+        "groupings": [],
+        "mainJoin": "",
+        "history_steps": [],
+        "trace_deferred": False
+    }
+
+
+def normalize_minterm_input(minterms, dont_cares, num_vars, method="qm"):
+    # Validasi input {"minterms", "dont_cares", "variables"}; ValueError
+    # berisi pesan yang bisa langsung ditampilkan ke pengguna.
+    # "truth_table" hanya dipakai internal (batas /truth-table)
+    if method != "truth_table":
+        check_method(method)
+    try:
+        num_vars = int(num_vars)
+        on = sorted(set(int(m) for m in minterms))
+        dc = sorted(set(int(m) for m in (dont_cares or ())))
+    except (TypeError, ValueError):
+        raise ValueError("Minterm, don't care dan jumlah variabel harus berupa bilangan bulat.")
+
+    limits = {
+        "kmap": KMAP_MAX_VARS,
+        "qm": QM_MAX_VARS,
+        "espresso": ESPRESSO_MAX_VARS,
+        "truth_table": TRUTH_TABLE_MAX_VARS
+    }
+    max_vars = limits.get(method, QM_MAX_VARS)
+    min_vars = 2 if method == "kmap" else 1
+    if not min_vars <= num_vars <= max_vars:
+        raise ValueError(f"Jumlah variabel untuk metode ini harus {min_vars}–{max_vars}.")
+
+    size = 1 << num_vars
+    if any(m < 0 or m >= size for m in on + dc):
+        raise ValueError(f"Indeks minterm harus di antara 0 dan {size - 1}.")
+    overlap = set(on) & set(dc)
+    if overlap:
+        raise ValueError(f"Minterm {sorted(overlap)} juga tercantum sebagai don't care.")
+    return on, dc, num_vars
+
+
+def truth_table_from_minterms(variables, minterms):
+    size = 1 << len(variables)
+    bits = bytearray(b"0" * size)
+    for m in minterms:
+        bits[m] = ord("1")
+    return TruthTable(variables, int(bits[::-1].decode(), 2))
+
+
+def optimize_minterms(minterms, dont_cares=(), num_vars=None, method="qm", progress=None, trace=True,
+                      forms=False):
+    # Jalur tanpa parsing: langsung dari daftar minterm (+ don't care).
+    on, dc, num_vars = normalize_minterm_input(minterms, dont_cares, num_vars, method)
+    timer = StageTimer(progress)
+    variables = [chr(ord("A") + i) for i in range(num_vars)]
+
+    result = empty_optimize_result()
+    result["variables"] = variables
+    if on:
+        result["minterm"] = f"m({','.join(map(str, on))})"
+        result["minterm_values"] = ', '.join(format(m, f"0{num_vars}b") for m in on)
+    if dc:
+        result["dont_care"] = f"d({','.join(map(str, dc))})"
+
+    table = []
+    if not (method == "espresso" and num_vars > ESPRESSO_TABLE_MAX_VARS):
+        with timer.stage("truth_table"):
+            table = truth_table_from_minterms(variables, on)
+
+    # Tanpa don't care, fungsi ≤ 4 variabel diambil dari tabel SOP
+    sop = lookup_minimal_sop(variables, table.output) if table and not dc else None
+
+    if not on:
+        simplified = "⊥"
+        explanation = "Tidak ada minterm True, hasil False."
+        if method == "kmap":
+            # Grid semua-nol (plus don't care), sama dengan jalur ekspresi
+            result["kmap"] = generate_kmap(variables, table, dont_cares=dc, cover=[])
+    elif method == "espresso":
+        with timer.stage("espresso"):
+            espresso_data = espresso_process(variables, minterms=on, dont_cares=dc)
+        simplified = espresso_data["final_expression"]
+        explanation = (
+            "Ekspresi disederhanakan dengan metode heuristik Espresso "
+            f"({espresso_data['term_count']} term, {espresso_data['literal_count']} literal)."
+        )
+    elif sop is not None and method == "kmap":
+        result["kmap"] = generate_kmap(variables, table, cover=sop["cover"])
+        simplified = render_qm_cover(sop["cover"], variables)
+        explanation = "Ekspresi disederhanakan dari Karnaugh Map (dengan don't care)."
+    elif method in ("qm", "kmap"):
+        qm_data = quine_mccluskey_process(
+            variables, on,
+            include_steps=method == "qm" and num_vars <= QM_STEPS_MAX_VARS,
+            dont_cares=dc, timer=timer
+        )
+        simplified = qm_data["final_expression"]
+        if method == "kmap":
+            cover = [
+                parse_implicant_binary(b)
+                for b in qm_data["essential_prime_implicants"] + qm_data["selected_prime_implicants"]
+            ]
+            result["kmap"] = generate_kmap(variables, table, dont_cares=dc, cover=cover)
+            explanation = "Ekspresi disederhanakan dari Karnaugh Map (dengan don't care)."
+        else:
+            for key in (
+                "prime_implicant_table_1", "prime_implicant_table_2",
+                "prime_implicant_expression", "prime_implicant_chart",
+                "finding_unique", "cover_selection", "history_steps"
+            ):
+                result[key] = qm_data[key]
+            essential = qm_data["essential_prime_implicants"]
+            selected = qm_data["selected_prime_implicants"]
+            result["essential_implicants"] = essential
+            result["selected_implicants"] = selected
+            if selected:
+                result["mainJoin"] = f"Essential PI: {essential} + Cover PI: {selected} => {simplified}"
+            else:
+                result["mainJoin"] = f"Essential PI: {essential} => {simplified}"
+            explanation = "Ekspresi disederhanakan dengan metode Quine–McCluskey."
+    elif sop is not None:
+        simplified = render_dnf_terms(sop["terms"], variables)
+        explanation = "Ekspresi disederhanakan dari daftar minterm."
+    else:
+        from sympy.logic.boolalg import SOPform
+        symbols_used = [sympy_symbols()[v] for v in variables]
+        simplified = format_ui_symbols(str(SOPform(symbols_used, on, dc)))
+        explanation = "Ekspresi disederhanakan dari daftar minterm."
+
+    result["simplified"] = simplified
+    result["explanation"] = explanation
+    result["table"] = legacy_table_rows(table)
+    result["truth_table"] = compact_truth_table(table)
+
+    if simplified not in ["⊤", "⊥", "–"] and table and method != "qm":
+        if trace:
+            result["threads"], result["groupings"], result["mainJoin"] = build_dnf_trace(simplified, table)
+        else:
+            result["trace_deferred"] = True
+    if forms:
+        with timer.stage("forms"):
+            result["forms"] = output_forms(variables, simplified, dc)
+    return result
+
+
+# ===============================
+# BUDGET PER METODE (VARIABEL, BARIS, DEADLINE)
+# ===============================
+# Batas per permintaan; bisa ditimpa lewat env SYMBOOL_BUDGETS berisi JSON,
+# mis. '{"simplify": {"deadline": 5}}'. Metode "default" memakai budget simplify.
+METHOD_BUDGETS = {
+    "simplify": {"max_vars": 16, "max_rows": 1 << 16, "deadline": 10.0},
+    "kmap": {"max_vars": KMAP_MAX_VARS, "max_rows": 1 << KMAP_MAX_VARS, "deadline": 5.0},
+    "qm": {"max_vars": QM_MAX_VARS, "max_rows": 1 << QM_MAX_VARS, "deadline": 20.0},
+    "espresso": {"max_vars": ESPRESSO_MAX_VARS, "max_rows": 1 << ESPRESSO_TABLE_MAX_VARS, "deadline": 20.0},
+    # /equivalent: tanpa tabel kebenaran; ukuran ROBDD dibatasi max_nodes
+    "equivalence": {"max_vars": 26, "max_rows": 1 << 26, "deadline": 5.0, "max_nodes": 200000},
+}
+for _method, _limits in json.loads(os.environ.get("SYMBOOL_BUDGETS", "{}")).items():
+    METHOD_BUDGETS.setdefault(_method, dict(METHOD_BUDGETS["simplify"])).update(_limits)
+
+# Sampai batas ini pekerjaan cukup cepat untuk dijalankan langsung,
+# tanpa biaya fork worker.
+BUDGET_INLINE_MAX_VARS = 6
+
+
+def get_budget(method, **overrides):
+    budget = dict(METHOD_BUDGETS.get(method, METHOD_BUDGETS["simplify"]))
+    budget.update({k: v for k, v in overrides.items() if v is not None})
+    return budget
+
+
+def budget_exceeded_result(reason, limit, variables=(), minterm_count=None):
+    if reason == "variables":
+        explanation = f"Budget terlampaui: {len(variables)} variabel (maksimal {limit} untuk metode ini)."
+    elif reason == "rows":
+        explanation = f"Budget terlampaui: tabel kebenaran {1 << len(variables)} baris (maksimal {limit})."
+    elif reason == "nodes":
+        explanation = f"Budget terlampaui: ROBDD melebihi {limit} node."
+    else:
+        explanation = f"Budget terlampaui: proses melewati batas waktu {limit} detik."
+    result = empty_optimize_result(explanation)
+    result["variables"] = list(variables)
+    result["budget_exceeded"] = {
+        "reason": reason,
+        "limit": limit,
+        "variables": len(variables),
+        "minterm_count": minterm_count
+    }
+    return result
+
+
+def _deadline_worker(conn, func, args, early=None):
+    try:
+        if early is not None:
+            early_func, early_args = early
+            conn.send(("early", early_func(*early_args)))
+        conn.send(("ok", func(*args)))
+    except ValueError as e:
+        # Input tidak valid (termasuk ExpressionError) dikirim apa adanya
+        # supaya induk membalas 400, bukan 500
+        conn.send(("invalid", e))
+    except Exception as e:
+        conn.send(("error", f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+
+def run_with_deadline(func, args, deadline, early=None):
+    # Jalankan func(*args) di proses terpisah yang bisa dibunuh.
+    # Return (selesai, hasil); selesai=False berarti deadline lewat.
+    # early=(fungsi, args) dihitung dulu di proses yang sama (ikut
+    # deadline); hasilnya dikembalikan sebagai hasil parsial kalau
+    # deadline lewat sebelum func selesai.
+    ctx = multiprocessing.get_context(
+        "fork" if "fork" in multiprocessing.get_all_start_methods() else None
+    )
+    receiver, sender = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_deadline_worker, args=(sender, func, args, early), daemon=True)
+    proc.start()
+    sender.close()
+    end = time.monotonic() + deadline
+    partial = None
+    try:
+        while True:
+            if not receiver.poll(max(0.0, end - time.monotonic())):
+                proc.terminate()
+                return False, partial
+            try:
+                status, payload = receiver.recv()
+            except EOFError:
+                raise RuntimeError("Worker berhenti tanpa hasil.")
+            if status != "early":
+                break
+            partial = payload
+    finally:
+        receiver.close()
+        proc.join()
+    if status == "invalid":
+        raise payload
+    if status == "error":
+        raise RuntimeError(payload)
+    return True, payload
+
+
+def parsed_minterm_count(parsed):
+    return parsed.minterm_count
+
+
+# Jumlah minterm untuk penolakan variabel/baris: ROBDD berbatas node,
+# di worker dengan deadline pendek; None kalau melewati salah satunya
+BUDGET_COUNT_DEADLINE = 0.5
+BUDGET_COUNT_MAX_NODES = 100000
+
+
+def limited_minterm_count(parsed):
+    manager = BDD(order_variables(parsed.tree), max_nodes=BUDGET_COUNT_MAX_NODES)
+    try:
+        return manager.sat_count(manager.build(parsed.tree))
+    except BDDNodeLimit:
+        return None
+
+
+def rejected_minterm_count(parsed, isolate=True):
+    if not isolate:
+        # Job async sudah berjalan di proses yang diawasi JobRunner
+        return limited_minterm_count(parsed)
+    finished, count = run_with_deadline(limited_minterm_count, (parsed,), BUDGET_COUNT_DEADLINE)
+    return count if finished else None
+
+
+def optimize_logic_budgeted(expr_str, method="default", budget=None, isolate=True, progress=None, trace=True,
+                            forms=False):
+    budget = budget or get_budget(method)
+    timer = StageTimer(progress)
+    with timer.stage("parse"):
+        parsed = parse_expression(expr_str)
+    variables = parsed.variables
+    num_vars = len(variables)
+
+    if num_vars > budget["max_vars"]:
+        return budget_exceeded_result(
+            "variables", budget["max_vars"], variables, rejected_minterm_count(parsed, isolate)
+        )
+    builds_table = not (method == "espresso" and num_vars > ESPRESSO_TABLE_MAX_VARS)
+    if builds_table and (1 << num_vars) > budget["max_rows"]:
+        return budget_exceeded_result(
+            "rows", budget["max_rows"], variables, rejected_minterm_count(parsed, isolate)
+        )
+
+    if not isolate or num_vars <= BUDGET_INLINE_MAX_VARS:
+        result = optimize_logic(parsed, method=method, progress=progress, trace=trace, forms=forms)
+    else:
+        if method not in SYMPY_FREE_METHODS:
+            # Import sympy sekali di proses induk; worker hasil fork mewarisinya
+            sympy_symbols()
+        # Hasil parsial kalau deadline lewat: jumlah minterm dari ROBDD,
+        # dihitung lebih dulu di worker supaya ikut deadline
+        finished, result = run_with_deadline(
+            optimize_logic, (parsed, method, progress, trace, forms), budget["deadline"],
+            early=(parsed_minterm_count, (parsed,))
+        )
+        if not finished:
+            return budget_exceeded_result("deadline", budget["deadline"], variables, result)
+    # Parse dan tabel sudah dikerjakan di sini, bukan di optimize_logic
+    for stage, ms in timer.stages.items():
+        result["timings"][stage] = round(result["timings"].get(stage, 0.0) + ms, 3)
+    return result
+
+
+def optimize_minterms_budgeted(minterms, dont_cares=(), num_vars=None, method="qm", budget=None, isolate=True,
+                               progress=None, trace=True, forms=False):
+    on, dc, num_vars = normalize_minterm_input(minterms, dont_cares, num_vars, method)
+    budget = budget or get_budget(method)
+    variables = [chr(ord("A") + i) for i in range(num_vars)]
+
+    if num_vars > budget["max_vars"]:
+        return budget_exceeded_result("variables", budget["max_vars"], variables, len(on))
+    builds_table = not (method == "espresso" and num_vars > ESPRESSO_TABLE_MAX_VARS)
+    if builds_table and (1 << num_vars) > budget["max_rows"]:
+        return budget_exceeded_result("rows", budget["max_rows"], variables, len(on))
+    if not isolate or num_vars <= BUDGET_INLINE_MAX_VARS:
+        return optimize_minterms(on, dc, num_vars, method=method, progress=progress, trace=trace, forms=forms)
+    if method not in SYMPY_FREE_METHODS:
+        sympy_symbols()
+    finished, result = run_with_deadline(
+        optimize_minterms, (on, dc, num_vars, method, progress, trace, forms), budget["deadline"]
+    )
+    if not finished:
+        return budget_exceeded_result("deadline", budget["deadline"], variables, len(on))
+    return result
+
+
+def equivalence_budget_exceeded_result(reason, limit, variables):
+    exceeded = budget_exceeded_result(reason, limit, variables)
+    return {
+        "equivalent": None,
+        "variables": list(variables),
+        "counterexample": None,
+        "explanation": exceeded["explanation"],
+        "budget_exceeded": exceeded["budget_exceeded"]
+    }
+
+
+def _check_equivalence_limited(left, right, max_nodes):
+    # Di worker: batas node dilaporkan sebagai None (exception kustom
+    # tidak dikirim lewat pipe)
+    try:
+        return check_equivalence(left, right, max_nodes)
+    except BDDNodeLimit:
+        return None
+
+
+def check_equivalence_budgeted(left, right, budget=None):
+    # Sama dengan check_equivalence, dengan budget "equivalence": batas
+    # variabel, batas node ROBDD, dan worker yang dibunuh saat deadline.
+    budget = budget or get_budget("equivalence")
+    left = parse_expression(left)
+    right = parse_expression(right)
+    variables = sorted(set(left.variables) | set(right.variables))
+    if len(variables) > budget["max_vars"]:
+        return equivalence_budget_exceeded_result("variables", budget["max_vars"], variables)
+    try:
+        if len(variables) <= BUDGET_INLINE_MAX_VARS:
+            return check_equivalence(left, right, budget["max_nodes"])
+        finished, result = run_with_deadline(
+            _check_equivalence_limited, (left, right, budget["max_nodes"]), budget["deadline"]
+        )
+    except BDDNodeLimit:
+        return equivalence_budget_exceeded_result("nodes", budget["max_nodes"], variables)
+    if not finished:
+        return equivalence_budget_exceeded_result("deadline", budget["deadline"], variables)
+    if result is None:
+        return equivalence_budget_exceeded_result("nodes", budget["max_nodes"], variables)
+    return result
+
+
+def trace_budget_exceeded_result(reason, limit, variables, minterm_count=None):
+    exceeded = budget_exceeded_result(reason, limit, variables, minterm_count)
+    return {
+        "threads": [],
+        "groupings": [],
+        "mainJoin": "",
+        "explanation": exceeded["explanation"],
+        "budget_exceeded": exceeded["budget_exceeded"]
+    }
+
+
+def _dnf_trace(simplified, source, terms):
+    # source: ParsedExpression atau (variables, minterm); tabel dibangun
+    # di sini supaya ikut deadline worker
+    if isinstance(source, ParsedExpression):
+        table = source.truth_table
+    else:
+        table = truth_table_from_minterms(*source)
+    return build_dnf_trace(simplified, table, terms)
+
+
+def dnf_trace_budgeted(simplified, expression=None, minterms=None, num_vars=None, method="simplify", budget=None):
+    # /optimize/trace: string hasil dari klien di-parse ke cube (maksimal
+    # TRACE_MAX_TERMS term, harus DNF) sebelum tabel dibangun, lalu
+    # budget metode yang sama dengan /optimize (variabel, baris, deadline).
+    check_method(method)
+    budget = budget or get_budget(method)
+    if minterms is not None:
+        on, _, num_vars = normalize_minterm_input(minterms, (), num_vars, "truth_table")
+        variables = [chr(ord("A") + i) for i in range(num_vars)]
+        source = (variables, on)
+    else:
+        source = parse_for_table(expression)
+        variables = source.variables
+    terms = dnf_terms(simplified, variables, TRACE_MAX_TERMS)
+
+    if len(variables) > budget["max_vars"] or (1 << len(variables)) > budget["max_rows"]:
+        if isinstance(source, ParsedExpression):
+            count = rejected_minterm_count(source)
+        else:
+            count = len(source[1])
+        if len(variables) > budget["max_vars"]:
+            return trace_budget_exceeded_result("variables", budget["max_vars"], variables, count)
+        return trace_budget_exceeded_result("rows", budget["max_rows"], variables, count)
+    if len(variables) <= BUDGET_INLINE_MAX_VARS:
+        trace = _dnf_trace(simplified, source, terms)
+    else:
+        finished, trace = run_with_deadline(_dnf_trace, (simplified, source, terms), budget["deadline"])
+        if not finished:
+            return trace_budget_exceeded_result("deadline", budget["deadline"], variables)
+    threads, groupings, main_join = trace
+    return {"threads": threads, "groupings": groupings, "mainJoin": main_join}
+
+
+# ===============================
+# MULTI-OUTPUT: TERM BERSAMA
+# ===============================
+# Beberapa fungsi atas variabel yang sama (adder, decoder, 7-segment).
+# Tabel kebenaran semua output dibangun dalam satu evaluasi (DAG bersama),
+# lalu Q-M bekerja atas implicant bertag: tag = bitmask output yang
+# on-set-nya memuat seluruh cube. Cover memilih product term yang bisa
+# dipakai bersama lintas output, sehingga satu gate AND melayani banyak OR.
+MULTI_MAX_VARS = 12
+MULTI_MAX_OUTPUTS = 16
+
+
+def multi_output_tables(expressions):
+    # Semua ekspresi di-parse ke satu NodeTable (subekspresi bersama jadi
+    # satu node) dan dievaluasi oleh satu fungsi terkompilasi.
+    table = NodeTable()
+    trees = [parse_boolean(expr, table) for expr in expressions]
+    variables = sorted({v for tree in trees for v in expression_variables(tree)})
+    if len(variables) > MULTI_MAX_VARS:
+        raise ValueError(f"Mode multi-output hanya mendukung maksimal {MULTI_MAX_VARS} variabel.")
+    columns, full = variable_columns(len(variables))
+    outputs = compile_columns(trees, variables)(columns, full)
+    return variables, [TruthTable(variables, output) for output in outputs]
+
+
+def combine_tagged_implicants(tags, num_vars, timer=None):
+    # tags: {minterm: tag}. Dua cube bertetangga bergabung jika tag-nya
+    # beririsan (tag baru = irisan). Cube tidak prima jika tag-nya utuh
+    # terbawa ke cube yang lebih besar. Return [(value, mask, tag)].
+    all_bits = (1 << num_vars) - 1
+    current = {(m, 0): tag for m, tag in sorted(tags.items()) if tag}
+    primes = []
+    iteration = 0
+    while current:
+        merged = {}
+        covered = set()
+        for (value, mask), tag in current.items():
+            free = all_bits & ~(value | mask)
+            while free:
+                bit = free & -free
+                free ^= bit
+                partner = (value | bit, mask)
+                partner_tag = current.get(partner)
+                if partner_tag is None:
+                    continue
+                new_tag = tag & partner_tag
+                if not new_tag:
+                    continue
+                merged[(value, mask | bit)] = new_tag
+                if new_tag == tag:
+                    covered.add((value, mask))
+                if new_tag == partner_tag:
+                    covered.add(partner)
+        primes.extend((v, m, tag) for (v, m), tag in current.items() if (v, m) not in covered)
+        iteration += 1
+        if timer is not None:
+            timer.report("qm_combine", iteration=iteration, implicants=len(merged), primes=len(primes))
+        current = merged
+    return primes
+
+
+def _multi_cost(terms_per_output):
+    # Biaya rangkaian dua level: AND dihitung sekali per product term unik
+    # (term bersama), OR per output dengan lebih dari satu term.
+    unique = {}
+    for terms in terms_per_output:
+        for value, mask, literals in terms:
+            unique[(value, mask)] = literals
+    or_inputs = sum(len(terms) for terms in terms_per_output)
+    return {
+        "terms": len(unique),
+        "literals": sum(unique.values()),
+        "or_inputs": or_inputs,
+        "gate_inputs": (
+            sum(n for n in unique.values() if n > 1)
+            + sum(len(terms) for terms in terms_per_output if len(terms) > 1)
+        )
+    }
+
+
+def quine_mccluskey_multi(variables, output_minterms, timer=None):
+    # output_minterms: list minterm per output (urutan output = bit tag)
+    timer = timer or StageTimer()
+    num_vars = len(variables)
+    size = 1 << num_vars
+    on_sets = [set(map(int, minterms)) for minterms in output_minterms]
+
+    with timer.stage("qm_combine"):
+        tags = {}
+        for index, on in enumerate(on_sets):
+            for m in on:
+                tags[m] = tags.get(m, 0) | (1 << index)
+        tagged = combine_tagged_implicants(tags, num_vars, timer=timer)
+
+    # Kolom = pasangan (output, minterm) dikodekan output * size + minterm;
+    # baris = cube bertag, mencover minterm-nya di setiap output pada tag.
+    with timer.stage("qm_cover"):
+        columns = [index * size + m for index, on in enumerate(on_sets) for m in sorted(on)]
+        rows = []
+        for value, mask, tag in tagged:
+            cells = implicant_minterms(value, mask)
+            rows.append({
+                index * size + m
+                for index in range(len(on_sets)) if (tag >> index) & 1
+                for m in cells
+            })
+        chosen, optimal = select_minimum_cover(
+            [(v, m) for v, m, _ in tagged], columns, num_vars, timer=timer, rows=rows
+        )
+
+    # Tiap output memakai term terpilih yang tag-nya memuat output itu,
+    # lalu term yang redundan untuk output tersebut dibuang (literal
+    # terbanyak dicoba dibuang lebih dulu).
+    outputs = []
+    for index, on in enumerate(on_sets):
+        usable = [i for i in chosen if (tagged[i][2] >> index) & 1]
+        usable.sort(key=lambda i: -(num_vars - popcount(tagged[i][1])))
+        kept = list(usable)
+        for i in usable:
+            rest = [j for j in kept if j != i]
+            if rest and on <= {
+                m for j in rest for m in implicant_minterms(tagged[j][0], tagged[j][1])
+            }:
+                kept = rest
+        kept.sort(key=chosen.index)
+        outputs.append([
+            (tagged[i][0], tagged[i][1], num_vars - popcount(tagged[i][1])) for i in kept
+        ])
+
+    return {
+        "prime_implicants": tagged,
+        "outputs": outputs,
+        "cost": _multi_cost(outputs),
+        "cover_optimal": optimal
+    }
+
+
+def check_multi_outputs(expressions, names=None):
+    if not expressions:
+        raise ValueError("Minimal satu ekspresi output.")
+    if len(expressions) > MULTI_MAX_OUTPUTS:
+        raise ValueError(f"Maksimal {MULTI_MAX_OUTPUTS} output.")
+    return list(names or [f"F{i + 1}" for i in range(len(expressions))])
+
+
+def optimize_multi(expressions, names=None, progress=None):
+    timer = StageTimer(progress)
+    names = check_multi_outputs(expressions, names)
+
+    with timer.stage("truth_table"):
+        variables, tables = multi_output_tables(expressions)
+    num_vars = len(variables)
+
+    output_minterms = [table.minterms() for table in tables]
+    shared = quine_mccluskey_multi(variables, output_minterms, timer=timer)
+
+    # Pembanding: tiap output diminimalkan sendiri-sendiri (tanpa berbagi)
+    with timer.stage("qm_separate"):
+        separate = []
+        for minterms in output_minterms:
+            if not minterms:
+                separate.append([])
+                continue
+            qm_data = quine_mccluskey_process(variables, minterms, include_steps=False)
+            cover = qm_data["essential_prime_implicants"] + qm_data["selected_prime_implicants"]
+            separate.append([parse_implicant_binary(pi) + (len(pi) - pi.count("-"),) for pi in cover])
+    # Tanpa berbagi: biaya tiap output dijumlahkan apa adanya
+    separate_cost = {}
+    for terms in separate:
+        for key, value in _multi_cost([terms]).items():
+            separate_cost[key] = separate_cost.get(key, 0) + value
+
+    def term_info(value, mask):
+        binary = implicant_binary(value, mask, num_vars)
+        literals = implicant_expression(binary, variables)
+        return binary, "∧".join(literals) if literals else "⊤"
+
+    outputs = []
+    users = {}
+    for name, expr, table, terms in zip(names, expressions, tables, shared["outputs"]):
+        count = table.count()
+        if count == 0:
+            simplified = "⊥"
+        elif count == table.size:
+            simplified = "⊤"
+        else:
+            simplified = render_qm_cover([(v, m) for v, m, _ in terms], variables)
+        for value, mask, _ in terms:
+            users.setdefault((value, mask), []).append(name)
+        outputs.append({
+            "name": name,
+            "expression": expr,
+            "simplified": simplified,
+            "terms": [term_info(v, m)[0] for v, m, _ in terms],
+            "minterm": f"m({','.join(map(str, table.minterms()))})" if count else "",
+            "truth_table": compact_truth_table(table)
+        })
+
+    shared_terms = []
+    for (value, mask), used_by in users.items():
+        binary, expression = term_info(value, mask)
+        shared_terms.append({"binary": binary, "expression": expression, "outputs": used_by})
+
+    cost = shared["cost"]
+    return {
+        "variables": variables,
+        "outputs": outputs,
+        "shared_terms": shared_terms,
+        "prime_implicants": [
+            {
+                "binary": term_info(v, m)[0],
+                "expression": term_info(v, m)[1],
+                "outputs": [n for i, n in enumerate(names) if (tag >> i) & 1]
+            }
+            for v, m, tag in shared["prime_implicants"]
+        ],
+        "cost": cost,
+        "separate_cost": separate_cost,
+        "cover_optimal": shared["cover_optimal"],
+        "explanation": (
+            f"{len(expressions)} output diminimalkan bersama: {cost['terms']} product term unik "
+            f"({cost['literals']} literal), dibanding {separate_cost['terms']} term "
+            f"({separate_cost['literals']} literal) jika diminimalkan terpisah."
+        ),
+        "timings": timer.stages
+    }
+
+
+def multi_budget_exceeded_result(reason, limit, variables, expressions, names):
+    # Bentuk sama dengan hasil optimize_multi (field "outputs"), tanpa cover
+    exceeded = budget_exceeded_result(reason, limit, variables)
+    return {
+        "variables": list(variables),
+        "outputs": [
+            {
+                "name": name,
+                "expression": expr,
+                "simplified": "–",
+                "terms": [],
+                "minterm": "",
+                "truth_table": None
+            }
+            for name, expr in zip(names, expressions)
+        ],
+        "shared_terms": [],
+        "prime_implicants": [],
+        "cost": None,
+        "separate_cost": None,
+        "cover_optimal": False,
+        "explanation": exceeded["explanation"],
+        "budget_exceeded": exceeded["budget_exceeded"],
+        "timings": {}
+    }
+
+
+def optimize_multi_budgeted(expressions, names=None, budget=None):
+    # Budget Q-M: jumlah output dan batas variabel dicek setelah parse,
+    # proses besar di worker yang dibunuh bila melewati deadline.
+    budget = budget or get_budget("qm")
+    names = check_multi_outputs(expressions, names)
+    table = NodeTable()
+    variables = sorted({v for e in expressions for v in expression_variables(parse_boolean(e, table))})
+    limit = min(budget["max_vars"], MULTI_MAX_VARS)
+    if len(variables) > limit:
+        return multi_budget_exceeded_result("variables", limit, variables, expressions, names)
+    if len(variables) <= BUDGET_INLINE_MAX_VARS:
+        return optimize_multi(expressions, names)
+    finished, result = run_with_deadline(optimize_multi, (expressions, names), budget["deadline"])
+    if not finished:
+        return multi_budget_exceeded_result("deadline", budget["deadline"], variables, expressions, names)
+    return result
+
+
+# ===============================
+# CACHE HASIL OPTIMASI (LRU + TTL)
+# ===============================
+class ResultCache:
+    def __init__(self, maxsize=1024, ttl=3600, max_rows=4096):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # Hasil dengan tabel lebih besar dari ini tidak disimpan,
+        # supaya memori proses tetap datar.
+        self.max_rows = max_rows
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            stored_at, value = item
+            if self.ttl is not None and now - stored_at > self.ttl:
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        if (value.get("truth_table") or {}).get("rows", len(value.get("table", ()))) > self.max_rows:
+            return
+        if "timings" in value:
+            # Timing tahap hanya berlaku untuk perhitungan aslinya;
+            # cache hit tidak membawa timings.
+            value = {k: v for k, v in value.items() if k != "timings"}
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
+
+
+result_cache = ResultCache()
+
+_single_var_re = re.compile(r'(?<![A-Za-z])[A-Z](?![A-Za-z])')
+_whitespace_re = re.compile(r'\s+')
+_letter_re = re.compile(r'[A-Z]')
+
+
+def canonicalize_expression(expr_str):
+    # Normalisasi: huruf besar, tanpa spasi, lalu variabel diganti nama
+    # secara urut (rank-preserving) ke A, B, C, ... sehingga "X∧Y" dan
+    # "A∧B" berbagi satu entri cache. Mengembalikan (ekspresi kanonik,
+    # kunci cache, peta nama kanonik → nama asli).
+    compact = _whitespace_re.sub('', expr_str.upper())
+    if not validate_expression(compact):
+        return compact, compact, {}
+
+    letters = sorted(set(_letter_re.findall(compact)))
+    rename = {v: chr(ord("A") + i) for i, v in enumerate(letters)}
+    canonical = ''.join(rename.get(c, c) for c in compact)
+    inverse = {new: old for old, new in rename.items() if new != old}
+    return canonical, canonical, inverse
+
+
+def _rename_result(value, inverse):
+    if isinstance(value, str):
+        return _single_var_re.sub(lambda m: inverse.get(m.group(0), m.group(0)), value)
+    if isinstance(value, dict):
+        return {_rename_result(k, inverse): _rename_result(v, inverse) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_rename_result(v, inverse) for v in value)
+    return value
+
+
+def restore_variable_names(result, inverse):
+    if not inverse:
+        return dict(result)
+    restored = _rename_result(result, inverse)
+    kmap = result.get("kmap")
+    if kmap:
+        # Label pojok K-Map berupa gabungan huruf ("AB"), ganti per karakter
+        restored["kmap"] = dict(restored["kmap"])
+        for label in ("corner_label_row", "corner_label_col"):
+            restored["kmap"][label] = ''.join(inverse.get(c, c) for c in kmap[label])
+    return restored
+
+
+def result_key_options(trace=True, forms=False):
+    # Hasil tanpa trace / dengan bentuk POS-faktor disimpan terpisah; kunci
+    # opsi default tetap sama dengan kunci batch/job (prepare_batch_job)
+    return (() if trace else ("no-trace",)) + (("forms",) if forms else ())
+
+
+def optimize_logic_cached(expr_str, method="default", cache=None, runner=optimize_logic, trace=True, forms=False):
+    cache = result_cache if cache is None else cache
+    check_method(method)
+    canonical, key_expr, inverse = canonicalize_expression(expr_str)
+    key = (key_expr, method) + result_key_options(trace, forms)
+
+    result = cache.get(key)
+    if result is None:
+        result = runner(canonical, method=method, trace=trace, forms=forms)
+        # Hasil budget terlampaui bergantung beban server, jangan disimpan
+        if not result.get("budget_exceeded"):
+            cache.put(key, result)
+    # Salinan dangkal: pemanggil boleh menambah field top-level (mis. duration)
+    return restore_variable_names(result, inverse)
+
+
+def optimize_minterms_cached(minterms, dont_cares=(), num_vars=None, method="qm", cache=None,
+                             runner=optimize_minterms, trace=True, forms=False):
+    cache = result_cache if cache is None else cache
+    on, dc, num_vars = normalize_minterm_input(minterms, dont_cares, num_vars, method)
+    key = ("minterms", tuple(on), tuple(dc), num_vars, method) + result_key_options(trace, forms)
+
+    result = cache.get(key)
+    if result is None:
+        result = runner(on, dc, num_vars, method=method, trace=trace, forms=forms)
+        if not result.get("budget_exceeded"):
+            cache.put(key, result)
+    return dict(result)
+
+
+# ===============================
+# SESI INKREMENTAL (LIVE SAAT MENGETIK)
+# ===============================
+# Tiap sesi menyimpan NodeTable sendiri dan cache kolom per node. Karena
+# IR hash-consed, product term yang tidak berubah antar ketikan menjadi
+# objek Node yang sama, sehingga kolomnya diambil dari cache dan hanya
+# term yang diedit (plus OR di atasnya) yang dievaluasi ulang. Sesi
+# disimpan per proses: request yang jatuh ke worker gunicorn lain cukup
+# menghitung dari nol, hasilnya tetap sama.
+LIVE_SESSION_MAX = 256
+LIVE_SESSION_TTL = 1800
+# NodeTable sesi dibuang (mulai baru) jika node-nya melewati batas ini
+LIVE_NODE_MAX = 4096
+# Di atas batas ini tabel tidak dibangun di proses induk
+LIVE_MAX_VARS = 16
+
+
+class LiveSession:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.last_used = time.monotonic()
+        self.reset()
+
+    def reset(self):
+        self.table = NodeTable()
+        self.variables = None
+        self.columns = {}
+
+    def truth_column(self, tree, variables):
+        variables = tuple(variables)
+        if variables != self.variables:
+            # Tata letak bit bergantung daftar variabel: kolom lama tidak berlaku
+            self.variables = variables
+            self.columns = {}
+        columns, full = variable_columns(len(variables))
+        output, computed = evaluate_columns(tree, variables, columns, full, self.columns)
+        # Simpan kolom node pohon terakhir saja; edit berikutnya hampir
+        # selalu bertolak dari ekspresi ini, dan memori sesi tetap terbatas
+        nodes = topological_nodes(tree)
+        self.columns = {id(n): self.columns[id(n)] for n in nodes}
+        self.last_stats = {"nodes": len(nodes), "computed": computed}
+        return output
+
+
+class LiveSessionStore:
+    def __init__(self, maxsize=LIVE_SESSION_MAX, ttl=LIVE_SESSION_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id):
+        now = time.monotonic()
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or now - session.last_used > self.ttl:
+                session = self._sessions[session_id] = LiveSession()
+            self._sessions.move_to_end(session_id)
+            session.last_used = now
+            while len(self._sessions) > self.maxsize:
+                self._sessions.popitem(last=False)
+            return session
+
+    def __len__(self):
+        return len(self._sessions)
+
+
+live_sessions = LiveSessionStore()
+
+
+def optimize_logic_live(expr_str, method="default", session_id="", store=None, trace=True, forms=False):
+    store = live_sessions if store is None else store
+    session = store.get(session_id)
+    stats = {"nodes": 0, "computed": 0, "cached_result": True}
+
+    def runner(canonical, method, trace, forms):
+        with session.lock:
+            if len(session.table) > LIVE_NODE_MAX:
+                session.reset()
+            parsed = ParsedExpression(canonical, session=session)
+            num_vars = len(parsed.variables)
+            builds_table = not (method == "espresso" and num_vars > ESPRESSO_TABLE_MAX_VARS)
+            if builds_table and num_vars <= LIVE_MAX_VARS and (1 << num_vars) <= get_budget(method)["max_rows"]:
+                # Tabel dibangun di sini (bukan di worker hasil fork) agar
+                # cache kolom sesi ikut terisi
+                parsed.truth_table
+                stats.update(session.last_stats, cached_result=False)
+        return optimize_logic_budgeted(parsed, method, trace=trace, forms=forms)
+
+    result = optimize_logic_cached(expr_str, method=method, runner=runner, trace=trace, forms=forms)
+    result["incremental"] = stats
+    return result
+
+
+# ===============================
+# EKSEKUSI BATCH
+# ===============================
+def prepare_batch_job(job):
+    # Ubah satu job batch menjadi (kunci cache, task untuk worker, peta
+    # nama variabel). Job identik (termasuk yang hanya beda nama variabel)
+    # menghasilkan kunci yang sama sehingga cukup dihitung sekali.
+    if not isinstance(job, dict):
+        raise ValueError("Job harus berupa objek JSON.")
+
+    if job.get("minterms") is not None:
+        method = job.get("method", "qm")
+        on, dc, num_vars = normalize_minterm_input(
+            job.get("minterms"), job.get("dont_cares", []), job.get("variables"), method
+        )
+        key = ("minterms", tuple(on), tuple(dc), num_vars, method)
+        return key, ("minterms", on, dc, num_vars, method), {}
+
+    expression = str(job.get("expression", "")).strip()
+    method = check_method(job.get("method", "simplify"))
+    if not expression:
+        raise ValueError("Ekspresi kosong.")
+    canonical, key_expr, inverse = canonicalize_expression(expression)
+    return (key_expr, method), ("expression", canonical, method), inverse
+
+
+def run_optimize_task(task, progress=None, isolate=False):
+    # Dijalankan di worker process; error ditangkap per job supaya satu
+    # ekspresi buruk tidak menggagalkan seluruh batch. isolate=True (batch)
+    # menjalankan tiap job di proses anak dengan deadline metodenya; job
+    # async (/jobs) sudah diawasi JobRunner dengan deadline sendiri.
+    start = time.perf_counter()
+    try:
+        if task[0] == "minterms":
+            _, on, dc, num_vars, method = task
+            result = optimize_minterms_budgeted(on, dc, num_vars, method=method, isolate=isolate, progress=progress)
+        else:
+            _, expression, method = task
+            result = optimize_logic_budgeted(expression, method=method, isolate=isolate, progress=progress)
+        # Durasi per tahap hanya untuk metrik /optimize; hasil batch/job
+        # (dan cache yang diisinya) berbentuk sama dengan response biasa
+        result.pop("timings", None)
+        error = None
+    except Exception as e:
+        result, error = None, f"{type(e).__name__}: {e}"
+    duration = round((time.perf_counter() - start) * 1000, 2)
+    return result, error, duration
+
+
+# ===============================
+# WARM-UP SAAT START
+# ===============================
+# Dipanggil sekali oleh app sebelum melayani request: mengisi cache
+# lru/bytecode jalur parse, K-Map dan Q-M sehingga request pertama tidak
+# membayar biaya inisialisasi. Import sympy hanya bila diminta ("full"),
+# karena itu yang mendominasi waktu bangun.
+WARMUP_EXPRESSION = "(A ∧ B) ∨ ¬C ∨ (C → D)"
+
+
+def warm_up(include_sympy=False):
+    timer = StageTimer()
+    with timer.stage("parse"):
+        parsed = parse_expression(WARMUP_EXPRESSION)
+        parsed.truth_table
+    with timer.stage("kmap"):
+        optimize_logic(WARMUP_EXPRESSION, "kmap")
+    with timer.stage("qm"):
+        optimize_logic(WARMUP_EXPRESSION, "qm")
+    if include_sympy:
+        with timer.stage("sympy"):
+            sympy_symbols()
+            from sympy import simplify_logic
+            simplify_logic(parsed.expr, form="dnf")
+    return timer.stages
@@ -0,0 +1,130 @@
+import mmap
+import os
+import struct
+
+# ===============================
+# TABEL SOP MINIMAL (≤ 4 VARIABEL)
+# ===============================
+# Semua fungsi 1–4 variabel (4 + 16 + 256 + 65.536 tabel kebenaran)
+# dihitung sekali oleh build_sop_table.py (saat build/deploy, file tidak
+# di-commit). Runtime cukup
+# membuka file lewat mmap dan membaca satu record per request; file tidak
+# pernah dimuat penuh ke memori dan dibagi antar worker lewat page cache.
+#
+# Format (little-endian):
+#   MAGIC (8 byte) | versi (uint32) | jumlah entri (uint32)
+#   indeks: offset record (uint32) per entri, entri = BASE[n] + output
+#   record: P, P byte prime (value | mask << 4)
+#           C, C byte indeks prime untuk cover Q-M (urutan essential lalu cover)
+#           T, T × (L, L byte literal) = bentuk DNF simplify_logic, urut cetak
+#   literal: indeks variabel (bit 0–1) | 4 jika negasi
+# "output" sama dengan TruthTable.output: bit r = nilai baris r, variabel
+# pertama = bit paling signifikan indeks baris (urutan extract_minterms).
+SOP_TABLE_MAX_VARS = 4
+SOP_TABLE_MAGIC = b"SYMSOP02"
+# Naikkan bila isi record berubah (encoding, pemilihan cover Q-M, urutan
+# cetak DNF), supaya file lama ditolak dan tidak menyajikan cover basi.
+SOP_TABLE_VERSION = 1
+SOP_TABLE_PATH = os.environ.get("SYMBOOL_SOP_TABLE") or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "sop_table.bin"
+)
+
+SOP_TABLE_BASE = {}
+_entries = 0
+for _n in range(1, SOP_TABLE_MAX_VARS + 1):
+    SOP_TABLE_BASE[_n] = _entries
+    _entries += 1 << (1 << _n)
+SOP_TABLE_ENTRIES = _entries
+
+_HEADER = struct.Struct("<8sII")
+_OFFSET = struct.Struct("<I")
+
+
+class SopTable:
+    def __init__(self, path=SOP_TABLE_PATH):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count = _HEADER.unpack_from(self._map, 0)
+        if magic != SOP_TABLE_MAGIC or count != SOP_TABLE_ENTRIES:
+            self._map.close()
+            raise ValueError(f"File tabel SOP tidak valid: {path}")
+        if version != SOP_TABLE_VERSION:
+            self._map.close()
+            raise ValueError(
+                f"Tabel SOP versi {version}, dibutuhkan versi {SOP_TABLE_VERSION}: "
+                f"bangkitkan ulang dengan build_sop_table.py ({path})"
+            )
+        self._index = _HEADER.size
+        self._data = _HEADER.size + _OFFSET.size * count
+
+    def record(self, num_vars, output):
+        # (primes [(value, mask)], cover [indeks prime], terms [[literal]])
+        entry = SOP_TABLE_BASE[num_vars] + output
+        pos = self._data + _OFFSET.unpack_from(self._map, self._index + _OFFSET.size * entry)[0]
+        data = self._map
+
+        count = data[pos]
+        primes = [(b & 0xF, b >> 4) for b in data[pos + 1:pos + 1 + count]]
+        pos += 1 + count
+        count = data[pos]
+        cover = list(data[pos + 1:pos + 1 + count])
+        pos += 1 + count
+        terms = []
+        for _ in range(data[pos]):
+            pos += 1
+            length = data[pos]
+            terms.append(list(data[pos + 1:pos + 1 + length]))
+            pos += length
+        return primes, cover, terms
+
+
+def encode_record(primes, cover, terms):
+    out = bytearray([len(primes)])
+    out.extend(value | mask << 4 for value, mask in primes)
+    out.append(len(cover))
+    out.extend(cover)
+    out.append(len(terms))
+    for term in terms:
+        out.append(len(term))
+        out.extend(term)
+    return bytes(out)
+
+
+def write_table(path, records):
+    # records: bytes per entri, urut indeks entri
+    if len(records) != SOP_TABLE_ENTRIES:
+        raise ValueError(f"Jumlah record harus {SOP_TABLE_ENTRIES}.")
+    offsets = []
+    blob = bytearray()
+    seen = {}
+    for record in records:
+        # Record identik (mis. fungsi konstan) cukup disimpan sekali
+        if record not in seen:
+            seen[record] = len(blob)
+            blob.extend(record)
+        offsets.append(seen[record])
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(SOP_TABLE_MAGIC, SOP_TABLE_VERSION, len(records)))
+        f.write(struct.pack(f"<{len(offsets)}I", *offsets))
+        f.write(blob)
+    os.replace(tmp_path, path)
+
+
+_table = None
+_table_missing = False
+
+
+def get_sop_table():
+    # Dibuka sekali per proses; None jika file belum dibangkitkan atau
+    # formatnya tidak cocok (optimizer lalu memakai jalur hitung biasa).
+    global _table, _table_missing
+    if _table is None and not _table_missing:
+        try:
+            _table = SopTable()
+        except OSError:
+            _table_missing = True
+        except ValueError as e:
+            print(f"Tabel SOP diabaikan: {e}")
+            _table_missing = True
+    return _table
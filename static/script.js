@@ -304,7 +304,25 @@ if (backBtn) {
 // ================================
 // OPTIMIZE BOOLEAN (REVISI FINAL)
 // ================================
-async function optimize() {
+// Satu id sesi per tab: server menyimpan parse tree dan kolom tabel
+// kebenaran per subekspresi, jadi edit kecil hanya menghitung ulang
+// term yang berubah.
+const LIVE_SESSION_ID = window.crypto?.randomUUID?.() ||
+  `${Date.now().toString(16)}${Math.random().toString(16).slice(2)}`;
+const LIVE_DEBOUNCE_MS = 300;
+let optimizeRequestId = 0;
+let liveTimer = null;
+
+function scheduleLiveOptimize() {
+  if (!document.getElementById("liveMode")?.checked) return;
+  clearTimeout(liveTimer);
+  liveTimer = setTimeout(() => optimize({ live: true }), LIVE_DEBOUNCE_MS);
+}
+
+async function optimize(options = {}) {
+  // Mode live: ekspresi setengah jadi tidak memunculkan error,
+  // hasil terakhir yang valid tetap ditampilkan
+  const live = options.live === true;
   const input = document.getElementById("expression");
   const method = document.getElementById("method")?.value || "simplify";
   const resultEl = document.getElementById("result");
@@ -322,6 +340,7 @@ async function optimize() {
   const primeImplicantsContainer = document.getElementById("primeImplicantsResult");
 
   const expression = input?.value.trim();
+  if (live && !expression) return;
   if (!expression) {
     errorMsg.textContent = "Masukkan ekspresi Boolean terlebih dahulu.";
     errorMsg.classList.remove("hidden");
@@ -334,8 +353,8 @@ async function optimize() {
   const matches = expression.match(/[A-Za-z]/g);
   const uniqueVars = matches ? [...new Set(matches.map(v => v.toUpperCase()))] : [];
 
-  // ✅ VALIDASI KMAP: max 4 variabel
-  if (method === "kmap" && uniqueVars.length > 4) {
+  // ✅ VALIDASI KMAP: max 6 variabel
+  if (method === "kmap" && uniqueVars.length > 6) {
     resultEl.textContent = "";
     explanationEl.textContent = "";
     durationEl.textContent = "";
@@ -348,14 +367,14 @@ async function optimize() {
     primeImplicantsContainer.innerHTML = "";
     primeImplicantsContainer.classList.add("hidden");
 
-    errorMsg.textContent = "K-Map hanya mendukung maksimal 4 variabel.";
+    errorMsg.textContent = "K-Map hanya mendukung maksimal 6 variabel.";
     errorMsg.classList.remove("hidden");
     errorMsg.scrollIntoView({ behavior: "smooth" });
     return;
   }
 
-  // ✅ VALIDASI Q-M: max 8 variabel
-  if (method === "qm" && uniqueVars.length > 8) {
+  // ✅ VALIDASI Q-M: max 16 variabel
+  if (method === "qm" && uniqueVars.length > 16) {
     resultEl.textContent = "";
     explanationEl.textContent = "";
     durationEl.textContent = "";
@@ -368,24 +387,45 @@ async function optimize() {
     primeImplicantsContainer.innerHTML = "";
     primeImplicantsContainer.classList.add("hidden");
 
-    errorMsg.textContent = "Metode Quine–McCluskey hanya mendukung maksimal 8 variabel.";
+    errorMsg.textContent = "Metode Quine–McCluskey hanya mendukung maksimal 16 variabel.";
     errorMsg.classList.remove("hidden");
     errorMsg.scrollIntoView({ behavior: "smooth" });
     return;
   }
 
+  // Job panjang hanya dijalankan lewat tombol, bukan saat mengetik
+  if (live && uniqueVars.length >= JOB_MIN_VARS) return;
+  const requestId = ++optimizeRequestId;
+
   try {
-    const response = await fetch("/optimize", {
-      method: "POST",
-      headers: { "Content-Type": "application/json" },
-      body: JSON.stringify({ expression, method }),
-    });
+    let data;
+    if (uniqueVars.length >= JOB_MIN_VARS) {
+      // Banyak variabel: jalankan sebagai job agar progres terlihat
+      const startedAt = performance.now();
+      resultEl.textContent = "…";
+      durationEl.textContent = "–";
+      data = await runOptimizeJob({ expression, method }, job => {
+        explanationEl.textContent = describeJobProgress(job);
+      });
+      data.duration = data.duration ?? Math.round(performance.now() - startedAt);
+    } else {
+      const response = await fetch("/optimize", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        // Trace thread/grouping baru diambil saat detail dibuka
+        // Bentuk POS/faktor hanya saat tombol Optimalkan, bukan saat mengetik
+        body: JSON.stringify({ expression, method, session: LIVE_SESSION_ID, trace: false, forms: !live }),
+      });
 
-    if (!response.ok) {
-      throw new Error(`Server error: ${response.status} ${response.statusText}`);
-    }
+      if (!response.ok) {
+        if (live) return;
+        throw new Error(`Server error: ${response.status} ${response.statusText}`);
+      }
 
-    const data = await response.json();
+      data = await response.json();
+    }
+    // Respons lama (ketikan sebelumnya) diabaikan
+    if (requestId !== optimizeRequestId) return;
     console.log("=== DATA FETCHED ===");
     console.log(data);
 
@@ -394,12 +434,13 @@ async function optimize() {
 
     const isValid =
       Array.isArray(data.variables) && data.variables.length > 0 &&
-      Array.isArray(data.table) && data.table.length > 0;
+      data.truth_table && data.truth_table.rows > 0;
 
     durationEl.textContent = isValid && data.duration !== undefined ? `${data.duration} ms` : "–";
+    renderForms(isValid ? data.forms : null);
 
     if (isValid) {
-      renderTruthTable(data.variables, data.table);
+      renderTruthTable(data.truth_table, { expression });
       exportContainer?.classList.remove("hidden");
     } else {
       tableResult.innerHTML = "<p class='no-table-msg'>Tabel tidak dapat ditampilkan.</p>";
@@ -429,8 +470,8 @@ async function optimize() {
       mintermContainer.classList.add("hidden");
     }
 
-    if (isValid && data.threads && data.mainJoin) {
-      renderThreadDetail(data, toggleDetailBtn, detailContainer);
+    if (isValid && (data.trace_deferred || (data.threads && data.mainJoin))) {
+      renderThreadDetail(data, toggleDetailBtn, detailContainer, { expression, method });
     } else {
       toggleDetailBtn.classList.add("hidden");
       detailContainer.classList.add("hidden");
@@ -443,6 +484,7 @@ async function optimize() {
     const piChart = Array.isArray(data.prime_implicant_chart) ? data.prime_implicant_chart : [];
     const findingUnique = Array.isArray(data.finding_unique) ? data.finding_unique : [];
     const essentialImplicants = Array.isArray(data.essential_implicants) ? data.essential_implicants : [];
+    const coverSelection = Array.isArray(data.cover_selection) ? data.cover_selection : [];
 
     if (
       isValid &&
@@ -591,6 +633,22 @@ async function optimize() {
         html += `<p><i>None</i></p>`;
       }
 
+      if (coverSelection.length > 0) {
+        html += `<h4>Cover Selection:</h4>
+          <table class="qm-table">
+          <thead><tr><th>Step</th><th>PI</th><th>Expression</th><th>Note</th></tr></thead>
+          <tbody>`;
+        coverSelection.forEach(row => {
+          html += `<tr>
+            <td>${row.step ?? "-"}</td>
+            <td>${row.PI || "-"}</td>
+            <td>${row.expression || "-"}</td>
+            <td>${row.note || ""}</td>
+          </tr>`;
+        });
+        html += `</tbody></table>`;
+      }
+
       html += `<h2>Hasil Akhir:</h2><p>${data.simplified || "–"}</p>`;
 
       primeImplicantsContainer.innerHTML = html;
@@ -603,18 +661,129 @@ async function optimize() {
 
   } catch (err) {
     console.error("Terjadi error:", err);
+    if (live) return;
     errorMsg.textContent = "Gagal memproses ekspresi.";
     errorMsg.classList.remove("hidden");
   }
 }
 
 
+// ================================
+// JOB ASYNC (PROGRES LIVE)
+// ================================
+// Ekspresi dengan banyak variabel dikirim ke /jobs; progres tiap tahap
+// diikuti dengan polling GET /jobs/<id> (tidak menahan thread server
+// seperti stream SSE).
+const JOB_MIN_VARS = 10;
+const JOB_POLL_INTERVAL = 500;
+
+const JOB_STAGE_LABELS = {
+  parse: "Membaca ekspresi",
+  truth_table: "Membangun tabel kebenaran",
+  simplify: "Menyederhanakan",
+  kmap: "Menyusun K-Map",
+  qm_combine: "Q-M: menggabungkan implicant",
+  qm_essential: "Q-M: mencari essential PI",
+  qm_cover: "Q-M: memilih cover",
+  qm_steps: "Q-M: menyusun tabel langkah",
+  espresso: "Espresso",
+  trace: "Menyusun langkah DNF",
+};
+
+function describeJobProgress(job) {
+  if (job.status === "queued") return "Menunggu antrian…";
+  const progress = job.progress || {};
+  const detail = progress.detail || {};
+  let text = JOB_STAGE_LABELS[progress.stage] || "Memproses";
+  if (detail.rows_total) {
+    text += ` (${detail.rows_done} / ${detail.rows_total} baris)`;
+  } else if (progress.stage === "qm_combine" && detail.iteration) {
+    text += ` (iterasi ${detail.iteration}, ${detail.implicants} implicant baru)`;
+  } else if (progress.stage === "qm_cover" && detail.phase) {
+    text += detail.nodes
+      ? ` (branch-and-bound: ${detail.nodes} node, terbaik ${detail.terms} term)`
+      : ` (${detail.phase}: ${detail.terms ?? "?"} term)`;
+  }
+  return `${text}…`;
+}
+
+async function runOptimizeJob(body, onProgress) {
+  const response = await fetch("/jobs", {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify(body),
+  });
+  const job = await response.json();
+  if (!response.ok) {
+    throw new Error(job.error || `Server error: ${response.status}`);
+  }
+  if (job.status === "done") return job.result;
+
+  onProgress(job);
+  const finished = await pollJob(job.id, onProgress);
+  if (finished.status !== "done") {
+    throw new Error(finished.error || "Job gagal diproses.");
+  }
+  return finished.result;
+}
+
+async function pollJob(jobId, onProgress) {
+  while (true) {
+    const response = await fetch(`/jobs/${jobId}`);
+    const job = await response.json();
+    if (!response.ok) {
+      throw new Error(job.error || `Server error: ${response.status}`);
+    }
+    if (job.status === "done" || job.status === "failed") return job;
+    onProgress(job);
+    await new Promise(done => setTimeout(done, JOB_POLL_INTERVAL));
+  }
+}
+
+
 // ================================
 // RENDER THREAD DETAIL & TOGGLE
 // ================================
-function renderThreadDetail(data, toggleDetailBtn, detailContainer) {
+function renderThreadDetail(data, toggleDetailBtn, detailContainer, traceSource = null) {
   if (!toggleDetailBtn || !detailContainer) return;
 
+  if (data.trace_deferred && traceSource) {
+    // Trace tidak dikirim bersama hasil: ambil dari /optimize/trace
+    // saat tombol detail pertama kali diklik
+    detailContainer.innerHTML = "";
+    detailContainer.classList.add("hidden");
+    toggleDetailBtn.classList.remove("hidden");
+    toggleDetailBtn.textContent = "Lihat Selengkapnya";
+
+    toggleDetailBtn.onclick = async () => {
+      toggleDetailBtn.onclick = null;
+      toggleDetailBtn.textContent = "Memuat…";
+      try {
+        const response = await fetch("/optimize/trace", {
+          method: "POST",
+          headers: { "Content-Type": "application/json" },
+          body: JSON.stringify({ ...traceSource, simplified: data.simplified }),
+        });
+        if (!response.ok) throw new Error(`Server error: ${response.status}`);
+        const trace = await response.json();
+        if (trace.budget_exceeded) {
+          // Trace melewati budget metode: tampilkan alasannya saja
+          detailContainer.innerHTML = `<p class="no-table-msg">${trace.explanation}</p>`;
+          detailContainer.classList.remove("hidden");
+          toggleDetailBtn.classList.add("hidden");
+          return;
+        }
+        renderThreadDetail({ ...data, ...trace, trace_deferred: false }, toggleDetailBtn, detailContainer);
+        detailContainer.classList.remove("hidden");
+        toggleDetailBtn.textContent = "Sembunyikan Detail";
+      } catch (err) {
+        console.error("Gagal memuat trace:", err);
+        renderThreadDetail(data, toggleDetailBtn, detailContainer, traceSource);
+      }
+    };
+    return;
+  }
+
   if (Array.isArray(data.threads) && data.mainJoin) {
     let html = `
       <div class="output-step">
@@ -699,6 +868,39 @@ function renderThreadDetail(data, toggleDetailBtn, detailContainer) {
 }
 
 
+// ================================
+// BENTUK LAIN (SOP / POS / FAKTOR)
+// ================================
+const FORM_LABELS = { sop: "SOP", pos: "POS", factored: "Faktor" };
+
+function renderForms(forms) {
+  const container = document.getElementById("formsResult");
+  if (!container) return;
+
+  const entries = forms ? Object.entries(FORM_LABELS).filter(([key]) => forms[key]) : [];
+  if (!entries.length) {
+    container.innerHTML = "";
+    container.classList.add("hidden");
+    return;
+  }
+
+  // Bentuk dengan literal paling sedikit ditandai; bentuk yang dilewati
+  // (melewati batas ukuran) hanya menampilkan alasannya
+  const fewest = Math.min(...entries.filter(([key]) => !forms[key].skipped).map(([key]) => forms[key].literals));
+  container.innerHTML = entries.map(([key, label]) => {
+    const form = forms[key];
+    if (form.skipped) {
+      return `<p class="form-row skipped"><strong>${label}:</strong> <span>dilewati</span>
+      <span class="form-literals">${form.skipped}</span></p>`;
+    }
+    const best = form.literals === fewest ? " best" : "";
+    return `<p class="form-row${best}"><strong>${label}:</strong> <span>${form.expression}</span>
+      <span class="form-literals">${form.literals} literal</span></p>`;
+  }).join("");
+  container.classList.remove("hidden");
+}
+
+
 // ================================
 // K-MAP RENDERER
 // ================================
@@ -729,26 +931,51 @@ function renderKmap(kmap) {
   `;
   headRow.appendChild(corner);
 
-  kmap.cols.forEach(col => {
+  // 5–6 variabel: garis cermin di tengah sumbu 3 bit
+  const mirrorRows = new Set(kmap.mirror_rows || []);
+  const mirrorCols = new Set(kmap.mirror_cols || []);
+
+  kmap.cols.forEach((col, j) => {
     const th = document.createElement("th");
     th.textContent = col;
+    if (mirrorCols.has(j)) th.classList.add("kmap-mirror-col");
     headRow.appendChild(th);
   });
 
   thead.appendChild(headRow);
   table.appendChild(thead);
 
+  // Sel → indeks grup yang mencakupnya (grup bisa melingkar di tepi)
+  const groups = Array.isArray(kmap.groups) ? kmap.groups : [];
+  const cellGroups = {};
+  groups.forEach((group, g) => {
+    (group.cells || []).forEach(([r, c]) => {
+      (cellGroups[`${r},${c}`] ||= []).push(g);
+    });
+  });
+
   const tbody = document.createElement("tbody");
+  const cells = [];
   kmap.rows.forEach((rowLabel, i) => {
     const tr = document.createElement("tr");
+    if (mirrorRows.has(i)) tr.classList.add("kmap-mirror-row");
 
     const th = document.createElement("th");
     th.textContent = rowLabel;
     tr.appendChild(th);
 
-    kmap.grid[i].forEach(val => {
+    kmap.grid[i].forEach((val, j) => {
       const td = document.createElement("td");
       td.textContent = val;
+      if (mirrorCols.has(j)) td.classList.add("kmap-mirror-col");
+      const inGroups = cellGroups[`${i},${j}`] || [];
+      if (inGroups.length) {
+        // Satu cincin warna per grup, bertumpuk dari luar ke dalam
+        td.style.boxShadow = inGroups
+          .map((g, k) => `inset 0 0 0 ${3 * (k + 1)}px ${kmapGroupColor(g)}`)
+          .join(", ");
+      }
+      cells.push({ td, groups: inGroups });
       tr.appendChild(td);
     });
 
@@ -757,13 +984,44 @@ function renderKmap(kmap) {
 
   table.appendChild(tbody);
   wrapper.appendChild(table);
+
+  if (groups.length) {
+    const legend = document.createElement("ul");
+    legend.className = "kmap-groups";
+    groups.forEach((group, g) => {
+      const item = document.createElement("li");
+      item.innerHTML = `<span class="kmap-group-swatch" style="background:${kmapGroupColor(g)}"></span>${group.term}`;
+      // Hover: sorot sel milik grup ini saja
+      item.addEventListener("mouseenter", () => {
+        cells.forEach(({ td, groups: gs }) => td.classList.toggle("kmap-cell-dim", !gs.includes(g)));
+      });
+      item.addEventListener("mouseleave", () => {
+        cells.forEach(({ td }) => td.classList.remove("kmap-cell-dim"));
+      });
+      legend.appendChild(item);
+    });
+    wrapper.appendChild(legend);
+  }
+
   container.appendChild(wrapper);
 }
 
+const KMAP_GROUP_COLORS = ["#e6194b", "#3cb44b", "#4363d8", "#f58231", "#911eb4", "#42d4f4", "#f032e6", "#9a6324"];
+
+function kmapGroupColor(index) {
+  return KMAP_GROUP_COLORS[index % KMAP_GROUP_COLORS.length];
+}
+
 // ================================
 // TRUTH TABLE RENDERER
 // ================================
-function renderTruthTable(variables, tableData) {
+// Response hanya membawa header variabel + bitstring output; baris dirender
+// per halaman. Kalau bitstring tidak disertakan (tabel besar), halaman
+// berikutnya diambil dari /truth-table.
+const TRUTH_TABLE_PAGE_SIZE = 256;
+let truthTableState = null;
+
+function renderTruthTable(truthTable, source) {
   const container = document.getElementById("tableResult");
   if (!container) return;
 
@@ -778,7 +1036,7 @@ function renderTruthTable(variables, tableData) {
   const thead = document.createElement("thead");
   const headRow = document.createElement("tr");
 
-  variables.forEach(v => {
+  truthTable.variables.forEach(v => {
     const th = document.createElement("th");
     th.textContent = v;
     headRow.appendChild(th);
@@ -790,40 +1048,102 @@ function renderTruthTable(variables, tableData) {
   table.appendChild(thead);
 
   const tbody = document.createElement("tbody");
-  tableData.forEach(([inputs, output]) => {
+  table.appendChild(tbody);
+  wrapper.appendChild(table);
+
+  const info = document.createElement("p");
+  info.className = "truth-table-info";
+  wrapper.appendChild(info);
+
+  const moreBtn = document.createElement("button");
+  moreBtn.className = "primary-btn hidden";
+  moreBtn.textContent = "Tampilkan baris berikutnya";
+  moreBtn.addEventListener("click", appendTruthTableRows);
+  wrapper.appendChild(moreBtn);
+
+  container.innerHTML = "";
+  container.appendChild(wrapper);
+
+  truthTableState = {
+    variables: truthTable.variables,
+    rows: truthTable.rows,
+    output: truthTable.output,
+    source,
+    loaded: 0,
+    tbody,
+    info,
+    moreBtn
+  };
+  appendTruthTableRows();
+}
+
+async function fetchTruthTableBits(state, offset, limit) {
+  if (state.output) return state.output.slice(offset, offset + limit);
+
+  const response = await fetch("/truth-table", {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ ...state.source, offset, limit }),
+  });
+  if (!response.ok) {
+    throw new Error(`Server error: ${response.status} ${response.statusText}`);
+  }
+  return (await response.json()).output || "";
+}
+
+async function appendTruthTableRows() {
+  const state = truthTableState;
+  if (!state || state.loaded >= state.rows) return;
+
+  state.moreBtn.disabled = true;
+  let bits;
+  try {
+    bits = await fetchTruthTableBits(state, state.loaded, TRUTH_TABLE_PAGE_SIZE);
+  } catch (err) {
+    console.error("Gagal memuat tabel kebenaran:", err);
+    state.info.textContent = "Gagal memuat baris tabel kebenaran.";
+    state.moreBtn.disabled = false;
+    return;
+  }
+  // Tabel sudah diganti hasil optimasi lain selama menunggu
+  if (state !== truthTableState) return;
+
+  const numVars = state.variables.length;
+  const fragment = document.createDocumentFragment();
+  for (let i = 0; i < bits.length; i++) {
+    const index = state.loaded + i;
     const row = document.createElement("tr");
-    variables.forEach(v => {
+    for (let bit = numVars - 1; bit >= 0; bit--) {
       const td = document.createElement("td");
-      td.textContent = inputs[v] ? "1" : "0";
+      td.textContent = Math.floor(index / 2 ** bit) % 2 ? "1" : "0";
       row.appendChild(td);
-    });
+    }
     const tdOutput = document.createElement("td");
-    tdOutput.textContent = output ? "1" : "0";
+    tdOutput.textContent = bits[i];
     row.appendChild(tdOutput);
-    tbody.appendChild(row);
-  });
-  table.appendChild(tbody);
-
-  wrapper.appendChild(table);
-  container.innerHTML = "";
-  container.appendChild(wrapper);
+    fragment.appendChild(row);
+  }
+  state.tbody.appendChild(fragment);
+  state.loaded += bits.length;
+
+  state.info.textContent = state.loaded < state.rows
+    ? `Menampilkan ${state.loaded} dari ${state.rows} baris.`
+    : "";
+  state.moreBtn.disabled = false;
+  state.moreBtn.classList.toggle("hidden", state.loaded >= state.rows || bits.length === 0);
 }
 
 // ================================
 // EXPORT CSV
 // ================================
 function exportToCSV() {
-  const table = document.getElementById("truthTable");
-  if (!table) return;
-
-  const csv = Array.from(table.rows).map(row =>
-    Array.from(row.cells).map(cell => `"${cell.innerText}"`).join(",")
-  );
-  const csvContent = "data:text/csv;charset=utf-8," + csv.join("\n");
-  const encodedUri = encodeURI(csvContent);
+  // Tabel dialirkan langsung dari server, termasuk baris yang belum dirender
+  const source = truthTableState?.source;
+  if (!source?.expression) return;
 
+  const params = new URLSearchParams({ expression: source.expression, format: "csv" });
   const link = document.createElement("a");
-  link.setAttribute("href", encodedUri);
+  link.setAttribute("href", `/truth-table/export?${params}`);
   link.setAttribute("download", "tabel_kebenaran.csv");
   document.body.appendChild(link);
   link.click();
@@ -874,6 +1194,7 @@ function clearInput() {
   // Bersihkan container visual
   document.getElementById("kmapContainer").innerHTML = "";
   document.getElementById("tableResult").innerHTML = "";
+  renderForms(null);
 
   // Bersihkan error
   document.getElementById("inputError").classList.add("hidden");
@@ -1254,7 +1575,9 @@ document.addEventListener("DOMContentLoaded", () => {
   const input = document.getElementById("expression");
   input?.addEventListener("input", () => {
     document.getElementById("inputError")?.classList.add("hidden");
+    scheduleLiveOptimize();
   });
+  document.getElementById("method")?.addEventListener("change", scheduleLiveOptimize);
 
   document.getElementById("backButton")?.addEventListener("click", () => window.history.back());
 
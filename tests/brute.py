@@ -0,0 +1,174 @@
+from itertools import combinations, product
+
+# ===============================
+# PEMBANDING BRUTE FORCE
+# ===============================
+# Semua tes membandingkan hasil optimizer dengan enumerasi tabel
+# kebenaran penuh. Baris r: variabel pertama = bit paling signifikan
+# (sama dengan TruthTable), cube = (value, mask) seperti implicant Q-M.
+VARIABLES = "ABCDEFGH"
+
+
+def row_values(row, num_vars):
+    return [(row >> (num_vars - 1 - i)) & 1 == 1 for i in range(num_vars)]
+
+
+def evaluate_node(node, env):
+    # Evaluasi rekursif IR boolexpr, independen dari compile_columns
+    op = node.op
+    if op == "var":
+        return env[node.name]
+    if op == "true":
+        return True
+    if op == "false":
+        return False
+    values = [evaluate_node(arg, env) for arg in node.args]
+    if op == "not":
+        return not values[0]
+    if op == "and":
+        return all(values)
+    if op == "or":
+        return any(values)
+    if op == "xor":
+        return sum(values) % 2 == 1
+    if op == "nand":
+        return not all(values)
+    if op == "nor":
+        return not any(values)
+    if op == "implies":
+        return (not values[0]) or values[1]
+    if op == "iff":
+        return values[0] == values[1]
+    raise AssertionError(f"operator tidak dikenal: {op}")
+
+
+def node_rows(node, variables):
+    # Himpunan baris True dari IR atas urutan variables
+    num_vars = len(variables)
+    return {
+        row for row in range(1 << num_vars)
+        if evaluate_node(node, dict(zip(variables, row_values(row, num_vars))))
+    }
+
+
+def cube_rows(cube, num_vars):
+    value, mask = cube
+    return {row for row in range(1 << num_vars) if (row & ~mask) == value}
+
+
+def cover_rows(cover, num_vars):
+    rows = set()
+    for cube in cover:
+        rows |= cube_rows(cube, num_vars)
+    return rows
+
+
+def literal_count(cube, num_vars):
+    return num_vars - bin(cube[1]).count("1")
+
+
+def cover_cost(cover, num_vars):
+    return len(cover), sum(literal_count(c, num_vars) for c in cover)
+
+
+def all_cubes(num_vars):
+    for digits in product("01-", repeat=num_vars):
+        value = mask = 0
+        for digit in digits:
+            value = (value << 1) | (digit == "1")
+            mask = (mask << 1) | (digit == "-")
+        yield value, mask
+
+
+def is_prime(cube, care, num_vars):
+    # Implicant (seluruh baris di care) yang tidak bisa diperbesar lagi
+    if not cube_rows(cube, num_vars) <= care:
+        return False
+    value, mask = cube
+    for i in range(num_vars):
+        bit = 1 << i
+        if not mask & bit and cube_rows((value & ~bit, mask | bit), num_vars) <= care:
+            return False
+    return True
+
+
+def prime_implicants(on, dc, num_vars):
+    care = set(on) | set(dc)
+    return [
+        cube for cube in all_cubes(num_vars)
+        if cube_rows(cube, num_vars) & set(on) and is_prime(cube, care, num_vars)
+    ]
+
+
+def minimum_cover_cost(on, dc, num_vars):
+    # Biaya (term, literal) minimum atas semua subset prime implicant
+    on = set(on)
+    if not on:
+        return 0, 0
+    primes = prime_implicants(on, dc, num_vars)
+    for size in range(1, len(primes) + 1):
+        costs = [
+            cover_cost(subset, num_vars)
+            for subset in combinations(primes, size)
+            if on <= cover_rows(subset, num_vars)
+        ]
+        if costs:
+            return min(costs)
+    raise AssertionError("prime implicant tidak mencakup on-set")
+
+
+def sop_expression(on, num_vars):
+    # Ekspresi kanonik (jumlah minterm) dalam simbol UI
+    if not on:
+        return "⊥"
+    return " ∨ ".join(
+        "(" + "∧".join(("" if bit else "¬") + VARIABLES[i] for i, bit in enumerate(row_values(m, num_vars))) + ")"
+        for m in sorted(on)
+    )
+
+
+def random_function(rng, num_vars, density=0.5):
+    return {row for row in range(1 << num_vars) if rng.random() < density}
+
+
+# ===============================
+# EKSPRESI ACAK
+# ===============================
+# Pohon (op, kiri, kanan) dengan semua operator UI; render memakai alias
+# acak dan kurung penuh, evaluate menghitung nilainya langsung di Python.
+OPERATORS = {
+    "and": (["∧", "&", "*", "·"], lambda a, b: a and b),
+    "or": (["∨", "|", "+"], lambda a, b: a or b),
+    "xor": (["⊕", "^"], lambda a, b: a != b),
+    "implies": (["→"], lambda a, b: (not a) or b),
+    "iff": (["↔"], lambda a, b: a == b),
+    "nand": (["↑"], lambda a, b: not (a and b)),
+    "nor": (["↓"], lambda a, b: not (a or b)),
+}
+
+
+def random_tree(rng, variables, depth):
+    if depth == 0 or rng.random() < 0.2:
+        return ("var", rng.choice(variables))
+    if rng.random() < 0.2:
+        return ("not", random_tree(rng, variables, depth - 1))
+    op = rng.choice(sorted(OPERATORS))
+    return (op, random_tree(rng, variables, depth - 1), random_tree(rng, variables, depth - 1))
+
+
+def render(rng, tree):
+    if tree[0] == "var":
+        return tree[1]
+    if tree[0] == "not":
+        inner = render(rng, tree[1])
+        return rng.choice([f"¬({inner})", f"~({inner})", f"!({inner})", f"({inner})'"])
+    symbol = rng.choice(OPERATORS[tree[0]][0])
+    return f"({render(rng, tree[1])} {symbol} {render(rng, tree[2])})"
+
+
+def evaluate(tree, env):
+    if tree[0] == "var":
+        return env[tree[1]]
+    if tree[0] == "not":
+        return not evaluate(tree[1], env)
+    return OPERATORS[tree[0]][1](evaluate(tree[1], env), evaluate(tree[2], env))
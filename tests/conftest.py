@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Modul aplikasi ada di root repo (tanpa paket), helper brute force di tests/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -0,0 +1,87 @@
+import random
+
+import pytest
+
+from bdd import BDD, BDDNodeLimit, TRUE, FALSE, order_variables, compare_expressions
+from boolexpr import parse_boolean, expression_variables
+from optimizer import check_equivalence, optimize_logic
+from brute import node_rows, random_tree, render
+
+# ===============================
+# ROBDD (user-016)
+# ===============================
+# Jumlah minterm, tautologi/kontradiksi dan contoh penyangkal dari ROBDD
+# dibandingkan dengan enumerasi tabel kebenaran.
+
+
+def random_expressions(seed, count):
+    rng = random.Random(seed)
+    for _ in range(count):
+        variables = sorted(rng.sample("ABCDEF", rng.randint(1, 5)))
+        yield render(rng, random_tree(rng, variables, 4))
+
+
+def test_sat_count_matches_truth_table():
+    for text in random_expressions(16, 300):
+        tree = parse_boolean(text)
+        variables = expression_variables(tree)
+        rows = node_rows(tree, variables)
+        manager = BDD(order_variables(tree))
+        root = manager.build(tree)
+        assert manager.sat_count(root) == len(rows), text
+        assert (root == TRUE) == (len(rows) == 1 << len(variables)), text
+        assert (root == FALSE) == (not rows), text
+
+
+def test_any_sat_is_a_satisfying_assignment():
+    for text in random_expressions(17, 200):
+        tree = parse_boolean(text)
+        variables = expression_variables(tree)
+        manager = BDD(order_variables(tree))
+        root = manager.build(tree)
+        assignment = manager.any_sat(root)
+        if root == FALSE:
+            assert assignment is None
+            continue
+        num_vars = len(variables)
+        row = sum(1 << (num_vars - 1 - i) for i, v in enumerate(variables) if assignment.get(v))
+        assert row in node_rows(tree, variables), text
+
+
+def test_equivalence_against_brute_force():
+    rng = random.Random(18)
+    texts = list(random_expressions(19, 150))
+    for left in texts:
+        right = rng.choice(texts)
+        result = compare_expressions(parse_boolean(left), parse_boolean(right))
+        variables = result["variables"]
+        left_rows = node_rows(parse_boolean(left), variables)
+        right_rows = node_rows(parse_boolean(right), variables)
+        assert result["equivalent"] == (left_rows == right_rows)
+        if not result["equivalent"]:
+            num_vars = len(variables)
+            counter = result["counterexample"]
+            row = sum(1 << (num_vars - 1 - i) for i, v in enumerate(variables) if counter.get(v))
+            assert (row in left_rows) != (row in right_rows)
+
+
+def test_simplified_results_are_equivalent():
+    for text in list(random_expressions(20, 60)):
+        for method in ("kmap", "qm", "espresso"):
+            if len(expression_variables(parse_boolean(text))) < 2 and method == "kmap":
+                continue
+            simplified = optimize_logic(text, method, trace=False)["simplified"]
+            if simplified in ("⊤", "⊥"):
+                simplified = {"⊤": "A ∨ ¬A", "⊥": "A ∧ ¬A"}[simplified]
+            assert check_equivalence(text, simplified)["equivalent"], (text, method, simplified)
+
+
+def test_node_limit():
+    text = " ∨ ".join(f"({a} ∧ {b})" for a, b in zip("ABCDEFGH", "IJKLMNOP"))
+    tree = parse_boolean(text)
+    # Urutan variabel terburuk (semua kiri lalu semua kanan): eksponensial
+    manager = BDD(list("ABCDEFGHIJKLMNOP"), max_nodes=100)
+    with pytest.raises(BDDNodeLimit):
+        manager.build(tree)
+    result = compare_expressions(tree, tree, max_nodes=10000)
+    assert result["equivalent"] and result["left_minterms"] == len(node_rows(tree, list("ABCDEFGHIJKLMNOP")))
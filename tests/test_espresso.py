@@ -0,0 +1,106 @@
+import random
+
+from espresso import espresso, minterm_cover, expression_cover, complement, tautology
+from boolexpr import parse_boolean, expression_variables
+from optimizer import optimize_minterms
+from brute import (
+    cube_rows, cover_rows, is_prime, minimum_cover_cost, cover_cost, random_function,
+    node_rows, random_tree, render
+)
+
+# ===============================
+# ESPRESSO (user-006)
+# ===============================
+# Espresso heuristik: hasilnya harus ekuivalen (dengan don't care), setiap
+# cube prime, dan cover irredundant. Minimal eksak hanya diharapkan untuk
+# fungsi kecil yang sudah dikenal (parity, fungsi unate).
+
+
+def random_on_dc(rng, num_vars):
+    rows = list(range(1 << num_vars))
+    rng.shuffle(rows)
+    on = set(rows[:rng.randint(0, len(rows))])
+    dc = {r for r in rows if r not in on and rng.random() < 0.15}
+    return on, dc
+
+
+def check_cover(cover, on, dc, num_vars):
+    care = on | dc
+    covered = cover_rows(cover, num_vars)
+    assert on <= covered <= care
+    for cube in cover:
+        assert is_prime(cube, care, num_vars), cube
+    for i in range(len(cover)):
+        rest = cover[:i] + cover[i + 1:]
+        # Irredundant: tanpa cube ini ada minterm on-set yang hilang
+        assert not on <= cover_rows(rest, num_vars), cover[i]
+
+
+def test_random_functions_are_prime_irredundant_and_equivalent():
+    rng = random.Random(6)
+    for _ in range(250):
+        num_vars = rng.randint(1, 7)
+        on, dc = random_on_dc(rng, num_vars)
+        cover = espresso(minterm_cover(sorted(on), num_vars), num_vars, dc_set=minterm_cover(sorted(dc), num_vars))
+        check_cover(cover, on, dc, num_vars)
+
+
+def test_close_to_minimum_on_small_functions():
+    rng = random.Random(7)
+    for _ in range(150):
+        num_vars = rng.randint(2, 4)
+        on = random_function(rng, num_vars)
+        cover = espresso(minterm_cover(sorted(on), num_vars), num_vars)
+        terms, _ = minimum_cover_cost(on, (), num_vars)
+        # Heuristik: paling banyak satu term di atas minimum untuk ≤ 4 variabel
+        assert cover_cost(cover, num_vars)[0] <= terms + 1
+
+
+def test_parity_is_exact():
+    for num_vars in range(2, 9):
+        on = {r for r in range(1 << num_vars) if bin(r).count("1") % 2}
+        cover = espresso(minterm_cover(sorted(on), num_vars), num_vars)
+        assert len(cover) == 1 << (num_vars - 1)
+        assert cover_rows(cover, num_vars) == on
+
+
+def test_expression_cover_matches_truth_table():
+    rng = random.Random(8)
+    for _ in range(200):
+        variables = sorted(rng.sample("ABCDEF", rng.randint(1, 5)))
+        tree = parse_boolean(render(rng, random_tree(rng, variables, 4)))
+        variables = expression_variables(tree)
+        cubes = expression_cover(tree, variables)
+        assert cover_rows(cubes, len(variables)) == node_rows(tree, variables)
+
+
+def test_complement_and_tautology():
+    rng = random.Random(9)
+    for _ in range(200):
+        num_vars = rng.randint(1, 6)
+        on = random_function(rng, num_vars)
+        full = (1 << num_vars) - 1
+        cubes = minterm_cover(sorted(on), num_vars)
+        off = complement(cubes, full)
+        assert cover_rows(off, num_vars) == set(range(1 << num_vars)) - on
+        assert tautology(cubes, full) == (len(on) == 1 << num_vars)
+
+
+def test_optimize_minterms_espresso_with_dont_cares():
+    rng = random.Random(10)
+    for _ in range(60):
+        num_vars = rng.randint(2, 6)
+        on, dc = random_on_dc(rng, num_vars)
+        dc -= on
+        result = optimize_minterms(sorted(on), sorted(dc), num_vars, method="espresso", trace=False)
+        simplified = result["simplified"]
+        if not on:
+            assert simplified == "⊥"
+            continue
+        variables = result["variables"]
+        if simplified == "⊤":
+            assert on | dc == set(range(1 << num_vars))
+            continue
+        rows = node_rows(parse_boolean(simplified), variables)
+        assert on <= rows <= on | dc, simplified
+
@@ -0,0 +1,91 @@
+import random
+
+from optimizer import optimize_minterms, optimize_logic, parse_implicant_binary
+from boolexpr import parse_boolean
+from brute import cube_rows, cover_rows, cover_cost, minimum_cover_cost, random_function, sop_expression, node_rows
+
+# ===============================
+# K-MAP 2–6 VARIABEL (user-024)
+# ===============================
+# Grid dibaca balik lewat label Gray tiap sumbu; sel setiap grup harus
+# tepat minterm implicant-nya, dan dua sel yang berbeda satu variabel
+# harus bertetangga (bersebelahan, melingkar di tepi, atau untuk sumbu
+# 3 bit: simetris terhadap garis mirror / melingkar di setengah peta).
+
+
+def cell_rows(kmap):
+    # (baris, kolom) → indeks baris tabel kebenaran dari label sumbu
+    col_bits = len(kmap["cols"][0])
+    return {
+        (r, c): (int(row_label, 2) << col_bits) | int(col_label, 2)
+        for r, row_label in enumerate(kmap["rows"])
+        for c, col_label in enumerate(kmap["cols"])
+    }
+
+
+def adjacent(a, b, length, mirrors):
+    if abs(a - b) == 1:
+        return True
+    if not mirrors:
+        return {a, b} == {0, length - 1}
+    # Layout mirror: simetris terhadap garis, atau melingkar di dalam
+    # setengah peta (tiap setengah adalah sumbu Gray 2 bit)
+    half = mirrors[0]
+    return a + b == 2 * half - 1 or (a // half == b // half and {a % half, b % half} == {0, half - 1})
+
+
+def check_kmap(kmap, on, dc, num_vars):
+    cells = cell_rows(kmap)
+    assert sorted(cells.values()) == list(range(1 << num_vars))
+    for (r, c), row in cells.items():
+        value = kmap["grid"][r][c]
+        assert value == ("X" if row in dc else int(row in on))
+    positions = {row: cell for cell, row in cells.items()}
+    grouped = set()
+    for group in kmap["groups"]:
+        rows = cube_rows(parse_implicant_binary(group["implicant"]), num_vars)
+        assert {tuple(cell) for cell in group["cells"]} == {positions[row] for row in rows}
+        assert rows <= on | dc
+        grouped |= rows
+    assert on <= grouped
+    # Tetangga: beda satu bit ⇒ sel bertetangga pada satu sumbu
+    for row in range(1 << num_vars):
+        for i in range(num_vars):
+            (r1, c1), (r2, c2) = positions[row], positions[row ^ (1 << i)]
+            if r1 == r2:
+                assert adjacent(c1, c2, len(kmap["cols"]), kmap["mirror_cols"])
+            else:
+                assert c1 == c2 and adjacent(r1, r2, len(kmap["rows"]), kmap["mirror_rows"])
+
+
+def test_groups_match_cells_for_two_to_six_variables():
+    rng = random.Random(24)
+    for _ in range(120):
+        num_vars = rng.randint(2, 6)
+        on = random_function(rng, num_vars, 0.4)
+        dc = {r for r in range(1 << num_vars) if r not in on and rng.random() < 0.1}
+        result = optimize_minterms(sorted(on), sorted(dc), num_vars, method="kmap", trace=False)
+        check_kmap(result["kmap"], on, dc, num_vars)
+
+
+def test_expression_kmap_is_minimum():
+    rng = random.Random(25)
+    for _ in range(80):
+        num_vars = rng.randint(2, 4)
+        on = random_function(rng, num_vars)
+        if not on or len(on) == 1 << num_vars:
+            continue
+        result = optimize_logic(sop_expression(on, num_vars), "kmap", trace=False)
+        kmap = result["kmap"]
+        check_kmap(kmap, on, set(), num_vars)
+        cover = [parse_implicant_binary(group["implicant"]) for group in kmap["groups"]]
+        assert cover_rows(cover, num_vars) == on
+        assert cover_cost(cover, num_vars) == minimum_cover_cost(on, (), num_vars)
+        assert node_rows(parse_boolean(result["simplified"]), result["variables"]) == on
+
+
+def test_six_variable_mirror_lines():
+    result = optimize_minterms([0, 7, 56, 63], (), 6, method="kmap", trace=False)
+    kmap = result["kmap"]
+    assert kmap["mirror_rows"] == [4] and kmap["mirror_cols"] == [4]
+    check_kmap(kmap, {0, 7, 56, 63}, set(), 6)
@@ -0,0 +1,82 @@
+import random
+from itertools import combinations
+
+import pytest
+
+from optimizer import optimize_multi, optimize_multi_budgeted, parse_implicant_binary, MULTI_MAX_OUTPUTS
+from boolexpr import parse_boolean
+from brute import VARIABLES, all_cubes, cube_rows, cover_rows, random_function, sop_expression, node_rows
+
+# ===============================
+# MULTI-OUTPUT (user-022)
+# ===============================
+# Setiap output harus sama dengan ekspresinya, term bersama hanya dipakai
+# oleh output yang on-set-nya memuat term itu, dan jumlah term unik
+# minimum (dibandingkan enumerasi untuk fungsi kecil).
+
+
+def minimum_shared_terms(functions, num_vars):
+    # Jumlah product term unik minimum sehingga tiap output = OR dari
+    # term-term (di antara himpunan itu) yang merupakan implicant-nya
+    candidates = [
+        cube for cube in all_cubes(num_vars)
+        if any(cube_rows(cube, num_vars) <= f for f in functions if f)
+    ]
+    needed = [f for f in functions if f]
+    for size in range(len(needed), len(candidates) + 1):
+        for subset in combinations(candidates, size):
+            if all(cover_rows([c for c in subset if cube_rows(c, num_vars) <= f], num_vars) == f for f in needed):
+                return size
+    return 0
+
+
+def check_outputs(result, functions, num_vars):
+    for output, on in zip(result["outputs"], functions):
+        terms = [parse_implicant_binary(b) for b in output["terms"]]
+        assert cover_rows(terms, num_vars) == on, output
+        if output["simplified"] not in ("⊤", "⊥"):
+            assert node_rows(parse_boolean(output["simplified"]), result["variables"]) == on
+
+
+def test_outputs_equivalent_and_shared_terms_valid():
+    rng = random.Random(22)
+    for _ in range(80):
+        num_vars = rng.randint(2, 4)
+        functions = [random_function(rng, num_vars) for _ in range(rng.randint(1, 4))]
+        if not any(functions):
+            # Semua "⊥": tidak ada variabel untuk dibandingkan
+            continue
+        result = optimize_multi([sop_expression(f, num_vars) for f in functions])
+        assert result["variables"] == list(VARIABLES[:num_vars])
+        check_outputs(result, functions, num_vars)
+        for term in result["shared_terms"]:
+            rows = cube_rows(parse_implicant_binary(term["binary"]), num_vars)
+            for name in term["outputs"]:
+                index = int(name[1:]) - 1
+                assert rows <= functions[index]
+        cost, separate = result["cost"], result["separate_cost"]
+        assert (cost["terms"], cost["literals"]) <= (separate["terms"], separate["literals"])
+
+
+def test_shared_term_count_is_minimum():
+    rng = random.Random(23)
+    for _ in range(40):
+        functions = [random_function(rng, 3) for _ in range(2)]
+        if not any(functions):
+            continue
+        result = optimize_multi([sop_expression(f, 3) for f in functions])
+        check_outputs(result, functions, 3)
+        assert result["cost"]["terms"] == minimum_shared_terms(functions, 3), [sorted(f) for f in functions]
+
+
+def test_full_adder():
+    # Sum = A⊕B⊕C, Carry = mayoritas
+    result = optimize_multi(["A ⊕ B ⊕ C", "(A∧B) ∨ (A∧C) ∨ (B∧C)"], ["S", "C"])
+    sum_rows = {r for r in range(8) if bin(r).count("1") % 2}
+    carry_rows = {r for r in range(8) if bin(r).count("1") >= 2}
+    check_outputs(result, [sum_rows, carry_rows], 3)
+
+
+def test_too_many_outputs_is_rejected_up_front():
+    with pytest.raises(ValueError):
+        optimize_multi_budgeted(["A"] * (MULTI_MAX_OUTPUTS + 1))
@@ -0,0 +1,84 @@
+import random
+
+import pytest
+
+from boolexpr import ExpressionError, MAX_PARSE_DEPTH, parse_boolean, expression_variables
+from optimizer import evaluate_truth_column, TruthTable
+from brute import node_rows, row_values, random_tree, render, evaluate
+
+# ===============================
+# PARSER SIMBOL UI (user-014)
+# ===============================
+# Ekspresi acak (brute.random_tree) dirender dengan alias operator acak dan
+# kurung penuh, lalu tabel kebenaran hasil parse dibandingkan dengan
+# evaluasi Python langsung.
+def expected_rows(text_tree, variables):
+    num_vars = len(variables)
+    return {
+        row for row in range(1 << num_vars)
+        if evaluate(text_tree, dict(zip(variables, row_values(row, num_vars))))
+    }
+
+
+def parsed_rows(text, variables):
+    tree = parse_boolean(text)
+    table = TruthTable(variables, evaluate_truth_column(tree, variables))
+    return set(table.minterms())
+
+
+def test_random_expressions_match_brute_force():
+    rng = random.Random(14)
+    for _ in range(300):
+        variables = sorted(rng.sample("ABCDE", rng.randint(1, 4)))
+        tree = random_tree(rng, variables, 4)
+        text = render(rng, tree)
+        parsed = parse_boolean(text)
+        used = expression_variables(parsed)
+        assert set(used) <= set(variables)
+        want = expected_rows(tree, variables)
+        # Kolom terkompilasi dan evaluasi rekursif IR harus sama dengan Python
+        assert parsed_rows(text, variables) == want, text
+        assert node_rows(parsed, variables) == want, text
+
+
+@pytest.mark.parametrize("text, reference", [
+    # ∧ mengikat lebih kuat dari ⊕, ⊕ dari ∨, ∨ dari →, → dari ↔
+    ("A ∨ B ∧ C", "A ∨ (B ∧ C)"),
+    ("A ⊕ B ∧ C", "A ⊕ (B ∧ C)"),
+    ("A ∨ B ⊕ C", "A ∨ (B ⊕ C)"),
+    ("A → B ∨ C", "A → (B ∨ C)"),
+    ("A ↔ B → C", "A ↔ (B → C)"),
+    # → asosiatif kanan
+    ("A → B → C", "A → (B → C)"),
+    # AND implisit dan prime
+    ("AB'C", "A ∧ ¬B ∧ C"),
+    ("A(B + C)", "A ∧ (B ∨ C)"),
+    ("¬A ∧ B", "(¬A) ∧ B"),
+    ("a b", "A ∧ B"),
+    ("A ∧ ⊤", "A"),
+    ("A ∨ ⊥", "A"),
+])
+def test_precedence_and_aliases(text, reference):
+    variables = ["A", "B", "C"]
+    assert parsed_rows(text, variables) == parsed_rows(reference, variables)
+
+
+@pytest.mark.parametrize("text", ["", "A ∧", "(A ∨ B", "A ∨ B)", "()", "A ∧ ∧ B", "A # B"])
+def test_invalid_input_raises_expression_error(text):
+    with pytest.raises(ExpressionError):
+        parse_boolean(text)
+
+
+def test_deep_nesting_is_an_expression_error():
+    # Kurung dan ¬ bersarang melewati batas: ExpressionError, bukan RecursionError
+    for text in ("(" * 5000 + "A" + ")" * 5000, "¬" * 5000 + "A", "A → " * 5000 + "A"):
+        with pytest.raises(ExpressionError):
+            parse_boolean(text)
+    depth = MAX_PARSE_DEPTH // 2 - 1
+    assert parse_boolean("(" * depth + "A" + ")" * depth).op == "var"
+
+
+def test_shared_subexpressions_are_one_node():
+    tree = parse_boolean("(A ∧ B) ∨ ¬(A ∧ B)")
+    left, right = tree.args
+    assert right.args[0] is left
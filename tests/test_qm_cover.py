@@ -0,0 +1,100 @@
+import random
+
+from optimizer import (
+    quine_mccluskey_process, parse_implicant_binary, optimize_minterms, optimize_logic, kmap_cover
+)
+from brute import (
+    VARIABLES, cover_rows, cover_cost, is_prime, minimum_cover_cost, prime_implicants,
+    random_function, sop_expression
+)
+
+# ===============================
+# Q-M: PRIME IMPLICANT & COVER MINIMUM (user-005)
+# ===============================
+# Cover Q-M harus eksak: biaya (term, literal) sama dengan minimum hasil
+# enumerasi semua subset prime implicant.
+
+
+def qm_cover(on, dc, num_vars):
+    data = quine_mccluskey_process(
+        list(VARIABLES[:num_vars]), sorted(on), include_steps=False, dont_cares=sorted(dc)
+    )
+    return [
+        parse_implicant_binary(b)
+        for b in data["essential_prime_implicants"] + data["selected_prime_implicants"]
+    ]
+
+
+def test_all_three_variable_functions_are_minimum():
+    for output in range(1, 1 << 8):
+        on = {r for r in range(8) if (output >> r) & 1}
+        cover = qm_cover(on, (), 3)
+        assert cover_rows(cover, 3) == on
+        assert cover_cost(cover, 3) == minimum_cover_cost(on, (), 3), sorted(on)
+
+
+def test_random_four_variable_functions_with_dont_cares():
+    rng = random.Random(5)
+    for _ in range(200):
+        on = random_function(rng, 4, 0.45)
+        if not on:
+            continue
+        dc = {r for r in range(16) if r not in on and rng.random() < 0.2}
+        cover = qm_cover(on, dc, 4)
+        assert on <= cover_rows(cover, 4) <= on | dc
+        for cube in cover:
+            assert is_prime(cube, on | dc, 4)
+        assert cover_cost(cover, 4) == minimum_cover_cost(on, dc, 4), (sorted(on), sorted(dc))
+
+
+def test_prime_implicant_table_is_complete():
+    rng = random.Random(55)
+    for _ in range(60):
+        num_vars = rng.randint(2, 5)
+        on = random_function(rng, num_vars)
+        if not on:
+            continue
+        data = quine_mccluskey_process(list(VARIABLES[:num_vars]), sorted(on), include_steps=False)
+        # Cover memakai prime implicant; semua prime dari brute force ikut dipertimbangkan
+        primes = set(prime_implicants(on, (), num_vars))
+        chosen = {
+            parse_implicant_binary(b)
+            for b in data["essential_prime_implicants"] + data["selected_prime_implicants"]
+        }
+        assert chosen <= primes
+
+
+def test_cyclic_core_needs_branching():
+    # Fungsi siklik klasik tanpa essential PI: m(0,1,2,5,6,7), minimum 3 term
+    on = {0, 1, 2, 5, 6, 7}
+    cover = qm_cover(on, (), 3)
+    assert cover_rows(cover, 3) == on
+    assert len(cover) == 3
+
+
+def test_five_variable_kmap_and_qm_are_minimum():
+    rng = random.Random(50)
+    for _ in range(25):
+        on = random_function(rng, 5, 0.3)
+        if not on or len(on) == 32:
+            continue
+        output = sum(1 << r for r in on)
+        expected = minimum_cover_cost(on, (), 5)
+        assert cover_cost(list(kmap_cover(5, output)), 5) == expected
+        result = optimize_minterms(sorted(on), (), 5, method="qm", trace=False)
+        cover = [parse_implicant_binary(b) for b in result["essential_implicants"] + result["selected_implicants"]]
+        assert cover_rows(cover, 5) == on
+        assert cover_cost(cover, 5) == expected
+
+
+def test_optimize_logic_qm_matches_minimum():
+    rng = random.Random(51)
+    for _ in range(40):
+        num_vars = rng.randint(2, 4)
+        on = random_function(rng, num_vars)
+        if not on or len(on) == 1 << num_vars:
+            continue
+        result = optimize_logic(sop_expression(on, num_vars), "qm", trace=False)
+        cover = [parse_implicant_binary(b) for b in result["essential_implicants"] + result["selected_implicants"]]
+        assert cover_rows(cover, num_vars) == on
+        assert cover_cost(cover, num_vars) == minimum_cover_cost(on, (), num_vars)